@@ -13,6 +13,8 @@ import sys
 import json
 import argparse
 import logging
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass, field, asdict
@@ -20,6 +22,24 @@ from dataclasses import dataclass, field, asdict
 # 添加项目根目录到路径
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from src.utils.editdist import encode_chars, encode_tokens, levenshtein_codes
+
+# rapidfuzz (可选): Myers 位并行编辑距离，未安装时回退到 Numba 实现
+try:
+    from rapidfuzz.distance import Levenshtein
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    Levenshtein = None
+    RAPIDFUZZ_AVAILABLE = False
+
+# orjson (可选): 更快地写出评估结果，未安装时使用标准库 json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
@@ -50,30 +70,16 @@ def calculate_cer(hypothesis: str, reference: str) -> float:
     if not reference:
         return 0.0 if not hypothesis else 1.0
 
-    import numpy as np
-
-    ref_chars = list(reference.replace(" ", ""))
-    hyp_chars = list(hypothesis.replace(" ", ""))
+    ref_chars = reference.replace(" ", "")
+    hyp_chars = hypothesis.replace(" ", "")
 
     m, n = len(ref_chars), len(hyp_chars)
     if m == 0:
         return 1.0 if n > 0 else 0.0
 
-    # DP 计算编辑距离
-    dp = np.zeros((m + 1, n + 1))
-    for i in range(m + 1):
-        dp[i][0] = i
-    for j in range(n + 1):
-        dp[0][j] = j
-
-    for i in range(1, m + 1):
-        for j in range(1, n + 1):
-            if ref_chars[i-1] == hyp_chars[j-1]:
-                dp[i][j] = dp[i-1][j-1]
-            else:
-                dp[i][j] = 1 + min(dp[i-1][j], dp[i][j-1], dp[i-1][j-1])
-
-    return dp[m][n] / m
+    if RAPIDFUZZ_AVAILABLE:
+        return Levenshtein.distance(ref_chars, hyp_chars) / m
+    return levenshtein_codes(encode_chars(ref_chars), encode_chars(hyp_chars)) / m
 
 
 def calculate_wer(hypothesis: str, reference: str) -> float:
@@ -81,8 +87,6 @@ def calculate_wer(hypothesis: str, reference: str) -> float:
     if not reference:
         return 0.0 if not hypothesis else 1.0
 
-    import numpy as np
-
     ref_words = reference.split()
     hyp_words = hypothesis.split()
 
@@ -90,20 +94,10 @@ def calculate_wer(hypothesis: str, reference: str) -> float:
     if m == 0:
         return 1.0 if n > 0 else 0.0
 
-    dp = np.zeros((m + 1, n + 1))
-    for i in range(m + 1):
-        dp[i][0] = i
-    for j in range(n + 1):
-        dp[0][j] = j
-
-    for i in range(1, m + 1):
-        for j in range(1, n + 1):
-            if ref_words[i-1] == hyp_words[j-1]:
-                dp[i][j] = dp[i-1][j-1]
-            else:
-                dp[i][j] = 1 + min(dp[i-1][j], dp[i][j-1], dp[i-1][j-1])
-
-    return dp[m][n] / m
+    if RAPIDFUZZ_AVAILABLE:
+        return Levenshtein.distance(ref_words, hyp_words) / m
+    ref_ids, hyp_ids = encode_tokens(ref_words, hyp_words)
+    return levenshtein_codes(ref_ids, hyp_ids) / m
 
 
 def load_reference(ref_path: Path) -> Dict[str, str]:
@@ -113,95 +107,192 @@ def load_reference(ref_path: Path) -> Dict[str, str]:
         # 单文件，每行格式: filename|text
         with open(ref_path, 'r', encoding='utf-8') as f:
             for line in f:
-                if '|' in line:
-                    name, text = line.strip().split('|', 1)
+                name, sep, text = line.strip().partition('|')
+                if sep:
                     references[name] = text
     elif ref_path.is_dir():
-        # 目录，每个 .txt 文件对应一个参考文本
-        for txt_file in ref_path.glob("*.txt"):
-            name = txt_file.stem
-            references[name] = txt_file.read_text(encoding='utf-8').strip()
+        # 目录，每个 .txt 文件对应一个参考文本；小文件 I/O 密集，用线程并发读取
+        txt_files = list(ref_path.glob("*.txt"))
+        if txt_files:
+            with ThreadPoolExecutor(max_workers=min(32, len(txt_files))) as executor:
+                references = dict(executor.map(_read_reference_file, txt_files))
     return references
 
 
+def _read_reference_file(txt_file: Path) -> Tuple[str, str]:
+    """读取单个参考文本文件，返回 (文件名, 文本)"""
+    return txt_file.stem, txt_file.read_text(encoding='utf-8').strip()
+
+
+# 参与评估的音频扩展名
+AUDIO_SUFFIXES = (".wav", ".mp3")
+
+
+def list_audio_files(audio_dir: Path) -> List[Path]:
+    """扫描一次音频目录，按文件名排序返回待评估音频"""
+    with os.scandir(audio_dir) as it:
+        files = [
+            Path(entry.path)
+            for entry in it
+            if entry.name.endswith(AUDIO_SUFFIXES)
+            and not entry.name.startswith(".")
+            and entry.is_file()
+        ]
+    files.sort(key=lambda p: p.name)
+    return files
+
+
+# PipelineConfig 中需要写入全局 settings 的字段
+_PIPELINE_SETTING_FIELDS = (
+    "correction_pipeline",
+    "text_correct_enable",
+    "text_correct_backend",
+    "punc_restore_enable",
+    "punc_merge_enable",
+)
+
+
+def _set_pipeline_settings(pipeline_config: PipelineConfig) -> None:
+    """将管线配置写入全局 settings"""
+    from src.config import settings
+
+    for name in _PIPELINE_SETTING_FIELDS:
+        setattr(settings, name, getattr(pipeline_config, name))
+
+
+@contextmanager
+def _apply_settings(pipeline_config: PipelineConfig):
+    """临时应用管线配置，退出时恢复原配置"""
+    from src.config import settings
+
+    original = {name: getattr(settings, name) for name in _PIPELINE_SETTING_FIELDS}
+    try:
+        _set_pipeline_settings(pipeline_config)
+        yield
+    finally:
+        for name, value in original.items():
+            setattr(settings, name, value)
+
+
+def _build_engine():
+    """按当前配置创建转写引擎并加载热词/规则等资源"""
+    from src.core.engine import TranscriptionEngine
+
+    engine = TranscriptionEngine()
+    engine.load_all()
+    return engine
+
+
+def _transcribe(engine, audio_path: Path) -> str:
+    result = engine.transcribe(str(audio_path), apply_hotword=True, apply_llm=False)
+    return result.get("text", "")
+
+
 def transcribe_with_pipeline(
     audio_path: Path,
     pipeline_config: PipelineConfig,
 ) -> str:
-    """使用指定管线配置进行转写"""
-    from src.config import settings
+    """使用指定管线配置转写单个文件 (批量评估请使用 benchmark_pipeline 复用引擎)"""
+    with _apply_settings(pipeline_config):
+        return _transcribe(_build_engine(), audio_path)
 
-    # 临时修改配置
-    original_pipeline = settings.correction_pipeline
-    original_text_correct = settings.text_correct_enable
-    original_punc_restore = settings.punc_restore_enable
-    original_punc_merge = settings.punc_merge_enable
 
-    try:
-        settings.correction_pipeline = pipeline_config.correction_pipeline
-        settings.text_correct_enable = pipeline_config.text_correct_enable
-        settings.text_correct_backend = pipeline_config.text_correct_backend
-        settings.punc_restore_enable = pipeline_config.punc_restore_enable
-        settings.punc_merge_enable = pipeline_config.punc_merge_enable
+# 工作进程内的引擎 (由 _init_worker 按管线配置加载一次)
+_worker_engine = None
 
-        # 重新创建引擎以应用新配置
-        from src.core.engine import TranscriptionEngine
-        engine = TranscriptionEngine()
-        engine.load_all()
 
-        result = engine.transcribe(str(audio_path), apply_hotword=True, apply_llm=False)
-        return result.get("text", "")
+def _init_worker(pipeline_config: PipelineConfig) -> None:
+    """进程池初始化: 在工作进程中应用管线配置并加载模型"""
+    global _worker_engine
+    # 工作进程独享配置，无需恢复
+    _set_pipeline_settings(pipeline_config)
+    _worker_engine = _build_engine()
 
-    finally:
-        # 恢复原配置
-        settings.correction_pipeline = original_pipeline
-        settings.text_correct_enable = original_text_correct
-        settings.punc_restore_enable = original_punc_restore
-        settings.punc_merge_enable = original_punc_merge
+
+def _process_one(
+    audio_file: Path,
+    ref_text: str,
+    engine=None,
+) -> Dict:
+    """转写单个音频并计算 CER/WER (engine 缺省时使用工作进程内的引擎)"""
+    hyp_text = _transcribe(engine or _worker_engine, audio_file)
+
+    return {
+        "file": audio_file.stem,
+        "reference": ref_text,
+        "hypothesis": hyp_text,
+        "cer": calculate_cer(hyp_text, ref_text),
+        "wer": calculate_wer(hyp_text, ref_text),
+    }
 
 
 def benchmark_pipeline(
-    audio_dir: Path,
+    audio_files: List[Path],
     references: Dict[str, str],
     pipeline_config: PipelineConfig,
+    workers: int = 1,
 ) -> BenchmarkResult:
-    """评估单个管线配置"""
-    logger.info(f"Benchmarking pipeline: {pipeline_config.name}")
+    """评估单个管线配置
 
-    cer_scores = []
-    wer_scores = []
-    details = []
-
-    audio_files = list(audio_dir.glob("*.wav")) + list(audio_dir.glob("*.mp3"))
+    Args:
+        audio_files: 待评估音频列表 (见 list_audio_files)
+        workers: 并行工作进程数，1 表示在当前进程内串行执行
+    """
+    logger.info(f"Benchmarking pipeline: {pipeline_config.name}")
 
+    jobs: List[Tuple[Path, str]] = []
     for audio_file in audio_files:
         name = audio_file.stem
         if name not in references:
             logger.warning(f"No reference for {name}, skipping")
             continue
-
-        ref_text = references[name]
-
-        try:
-            hyp_text = transcribe_with_pipeline(audio_file, pipeline_config)
-            cer = calculate_cer(hyp_text, ref_text)
-            wer = calculate_wer(hyp_text, ref_text)
-
-            cer_scores.append(cer)
-            wer_scores.append(wer)
-
-            details.append({
-                "file": name,
-                "reference": ref_text,
-                "hypothesis": hyp_text,
-                "cer": cer,
-                "wer": wer,
-            })
-
-            logger.info(f"  {name}: CER={cer:.4f}, WER={wer:.4f}")
-
-        except Exception as e:
-            logger.error(f"  {name}: Failed - {e}")
+        jobs.append((audio_file, references[name]))
+
+    # 按提交顺序收集结果，保证输出与串行执行一致
+    results: List[Optional[Dict]] = [None] * len(jobs)
+
+    if workers <= 1:
+        # 每个管线配置只构建一次引擎，所有文件复用
+        with _apply_settings(pipeline_config):
+            try:
+                engine = _build_engine()
+            except Exception as e:
+                logger.error(f"  Failed to build engine for {pipeline_config.name}: {e}")
+                jobs = []
+
+            for idx, (audio_file, ref_text) in enumerate(jobs):
+                try:
+                    results[idx] = _process_one(audio_file, ref_text, engine)
+                except Exception as e:
+                    logger.error(f"  {audio_file.stem}: Failed - {e}")
+                    continue
+                logger.info(f"  {audio_file.stem}: CER={results[idx]['cer']:.4f}, WER={results[idx]['wer']:.4f}")
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(pipeline_config,),
+        ) as executor:
+            futures = {
+                executor.submit(_process_one, audio_file, ref_text): idx
+                for idx, (audio_file, ref_text) in enumerate(jobs)
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                idx = futures[future]
+                name = jobs[idx][0].stem
+                try:
+                    results[idx] = future.result()
+                except Exception as e:
+                    logger.error(f"  [{done}/{len(jobs)}] {name}: Failed - {e}")
+                    continue
+                logger.info(
+                    f"  [{done}/{len(jobs)}] {name}: "
+                    f"CER={results[idx]['cer']:.4f}, WER={results[idx]['wer']:.4f}"
+                )
+
+    details = [r for r in results if r is not None]
+    cer_scores = [d["cer"] for d in details]
+    wer_scores = [d["wer"] for d in details]
 
     import numpy as np
     avg_cer = float(np.mean(cer_scores)) if cer_scores else 0.0
@@ -220,6 +311,7 @@ def run_benchmark(
     audio_dir: Path,
     ref_path: Path,
     output_path: Optional[Path] = None,
+    workers: int = 1,
 ) -> List[BenchmarkResult]:
     """运行完整评估"""
     # 定义要对比的管线配置
@@ -255,9 +347,13 @@ def run_benchmark(
     references = load_reference(ref_path)
     logger.info(f"Loaded {len(references)} reference texts")
 
+    # 所有管线共用同一份音频列表，目录只扫描一次
+    audio_files = list_audio_files(audio_dir)
+    logger.info(f"Found {len(audio_files)} audio files")
+
     results = []
     for pipeline_config in pipelines:
-        result = benchmark_pipeline(audio_dir, references, pipeline_config)
+        result = benchmark_pipeline(audio_files, references, pipeline_config, workers=workers)
         results.append(result)
 
     # 输出对比表格
@@ -284,8 +380,13 @@ def run_benchmark(
             ],
             "details": {r.pipeline_name: r.details for r in results},
         }
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, ensure_ascii=False, indent=2)
+        if ORJSON_AVAILABLE:
+            output_path.write_bytes(
+                orjson.dumps(output_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            )
+        else:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(output_data, f, ensure_ascii=False, indent=2)
         logger.info(f"Results saved to {output_path}")
 
     return results
@@ -296,6 +397,7 @@ def main():
     parser.add_argument("--audio-dir", type=Path, required=True, help="音频文件目录")
     parser.add_argument("--ref-path", type=Path, required=True, help="参考文本路径")
     parser.add_argument("--output", type=Path, help="结果输出路径 (JSON)")
+    parser.add_argument("--workers", type=int, default=1, help="并行转写进程数 (默认 1，串行)")
     args = parser.parse_args()
 
     if not args.audio_dir.exists():
@@ -306,7 +408,7 @@ def main():
         logger.error(f"Reference path not found: {args.ref_path}")
         sys.exit(1)
 
-    run_benchmark(args.audio_dir, args.ref_path, args.output)
+    run_benchmark(args.audio_dir, args.ref_path, args.output, workers=args.workers)
 
 
 if __name__ == "__main__":
@@ -1,15 +1,27 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
+import os
 import re
 import sys
 from pathlib import Path
-from typing import Iterable, List, Sequence
+from typing import Iterable, List, Optional, Sequence
 
 
-_SPLIT_RE = re.compile(r"[,\uFF0C;\uFF1B\u3001|\t]+")
+# Non-delimiter runs; finditer/findall yields the split parts directly.
+_PART_RE = re.compile(r"[^,\uFF0C;\uFF1B\u3001|\t]+")
 _BULLET_PREFIX_RE = re.compile(r"^\s*(?:[-*•·]|(\d+)[\.\)]|[（(]\d+[)）])\s+")
-_TRIM_RE = re.compile(r"^[\s\"'“”‘’]+|[\s\"'“”‘’]+$")
+# Bullet prefix + surrounding whitespace/quotes, stripped in a single sub() pass.
+_CLEAN_RE = re.compile(
+    r"^\s*(?:(?:[-*•·]|\d+[\.\)]|[（(]\d+[)）])\s+)?[\s\"'“”‘’]*|[\s\"'“”‘’]+$"
+)
+
+
+# Existing outputs at least this large are compared by streaming digest
+# instead of reading the whole file into memory.
+_HASH_COMPARE_MIN_BYTES = 64 * 1024
+_HASH_CHUNK_BYTES = 64 * 1024
 
 
 def _repo_root() -> Path:
@@ -21,9 +33,7 @@ def _clean_phrase(s: str) -> str:
     s = s.strip()
     if not s or s.startswith("#"):
         return ""
-    s = _BULLET_PREFIX_RE.sub("", s)
-    s = _TRIM_RE.sub("", s)
-    return s.strip()
+    return _CLEAN_RE.sub("", s)
 
 
 def extract_phrases(lines: Iterable[str], *, split_delims: bool = True) -> List[str]:
@@ -35,7 +45,7 @@ def extract_phrases(lines: Iterable[str], *, split_delims: bool = True) -> List[
         line = _BULLET_PREFIX_RE.sub("", line).strip()
         parts: Sequence[str]
         if split_delims:
-            parts = [p for p in _SPLIT_RE.split(line) if p.strip()]
+            parts = _PART_RE.findall(line)
         else:
             parts = [line]
 
@@ -61,6 +71,27 @@ def _load_existing_header(path: Path) -> List[str]:
     return header
 
 
+def _file_matches(path: Path, new_bytes: bytes) -> bool:
+    try:
+        size = path.stat().st_size
+    except OSError:
+        return False
+    if size != len(new_bytes):
+        return False
+
+    try:
+        if size < _HASH_COMPARE_MIN_BYTES:
+            return path.read_bytes() == new_bytes
+
+        digest = hashlib.blake2b(digest_size=16)
+        with path.open("rb") as f:
+            for chunk in iter(lambda: f.read(_HASH_CHUNK_BYTES), b""):
+                digest.update(chunk)
+    except OSError:
+        return False
+    return digest.digest() == hashlib.blake2b(new_bytes, digest_size=16).digest()
+
+
 def _write_output(path: Path, header_lines: List[str], phrases: List[str]) -> bool:
     content_lines: List[str] = []
     if header_lines:
@@ -71,14 +102,8 @@ def _write_output(path: Path, header_lines: List[str], phrases: List[str]) -> bo
     content_lines.extend([f"{p}\n" for p in phrases])
     new_content = "".join(content_lines)
 
-    old_content = ""
-    if path.exists():
-        try:
-            old_content = path.read_text(encoding="utf-8")
-        except Exception:
-            old_content = ""
-
-    if old_content == new_content:
+    # Compare against the exact bytes write_text() would produce.
+    if _file_matches(path, new_content.replace("\n", os.linesep).encode("utf-8")):
         return False
 
     path.parent.mkdir(parents=True, exist_ok=True)
@@ -86,6 +111,38 @@ def _write_output(path: Path, header_lines: List[str], phrases: List[str]) -> bo
     return True
 
 
+def _append_output(path: Path, phrases: List[str]) -> Optional[int]:
+    """Append phrases missing from an existing output file.
+
+    Returns the number of appended phrases, or None when the file cannot be
+    extended in place (missing, or it holds phrases no longer extracted) and
+    a full rewrite is needed.
+    """
+    try:
+        raw = path.read_bytes()
+    except OSError:
+        return None
+
+    existing = set()
+    for line in raw.decode("utf-8", errors="ignore").splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            existing.add(line)
+
+    if not existing.issubset(phrases):
+        return None
+
+    new_only = [p for p in phrases if p not in existing]
+    if not new_only:
+        return 0
+
+    with path.open("a", encoding="utf-8") as f:
+        if raw and not raw.endswith(b"\n"):
+            f.write("\n")
+        f.writelines(f"{p}\n" for p in new_only)
+    return len(new_only)
+
+
 def main(argv: Sequence[str]) -> int:
     parser = argparse.ArgumentParser(
         description="Extract unique context hotwords from a text file for meeting/recall transcription.",
@@ -113,6 +170,13 @@ def main(argv: Sequence[str]) -> int:
         default=1,
         help="Minimum non-whitespace char length to keep a phrase (default: 1).",
     )
+    parser.add_argument(
+        "--append-only",
+        action="store_true",
+        help="Append new phrases to an existing output instead of rewriting it "
+        "(new phrases land unsorted at the end; falls back to a full rewrite "
+        "when existing phrases were removed).",
+    )
 
     args = parser.parse_args(list(argv))
 
@@ -126,8 +190,11 @@ def main(argv: Sequence[str]) -> int:
     min_len = max(int(args.min_len), 0)
     phrases = [p for p in phrases if len(p.strip()) >= min_len]
 
-    # Stable + friendly sorting
-    unique_sorted = sorted(set(phrases), key=lambda s: (s.lower(), s))
+    # Stable + friendly sorting: decorate once with a caseless key, sort the
+    # tuples natively, then undecorate (no per-item key callback).
+    decorated = [(s.casefold(), s) for s in set(phrases)]
+    decorated.sort()
+    unique_sorted = [s for _, s in decorated]
 
     if args.output == "-":
         for p in unique_sorted:
@@ -135,6 +202,15 @@ def main(argv: Sequence[str]) -> int:
         return 0
 
     output_path = Path(args.output)
+    if args.append_only:
+        appended = _append_output(output_path, unique_sorted)
+        if appended is not None:
+            if appended:
+                print(f"Appended {appended} phrases -> {output_path}")
+            else:
+                print(f"No changes ({len(unique_sorted)} phrases) -> {output_path}")
+            return 0
+
     header = _load_existing_header(output_path)
     changed = _write_output(output_path, header, unique_sorted)
     if changed:
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import argparse
+import errno
 import os
+import selectors
 import signal
 import socket
 import subprocess
@@ -9,7 +11,7 @@ import sys
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import IO, Mapping
+from typing import IO, Iterable, Mapping
 
 
 RUN_DIR_REL = Path(".run") / "local_stack"
@@ -41,6 +43,52 @@ def is_port_open(host: str, port: int, timeout_s: float = 0.25) -> bool:
             return False
 
 
+_CONNECT_IN_PROGRESS = {errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EAGAIN}
+
+
+def probe_ports(addrs: Iterable[tuple[str, int]], timeout_s: float = 0.25) -> dict[tuple[str, int], bool]:
+    """Check several TCP ports at once.
+
+    All connects are started non-blocking and waited on with one selector, so
+    the total wait is bounded by ``timeout_s`` regardless of how many ports are
+    probed.
+    """
+    keys = list(dict.fromkeys((host, int(port)) for host, port in addrs))
+    results: dict[tuple[str, int], bool] = {}
+    sel = selectors.DefaultSelector()
+    try:
+        for key in keys:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.setblocking(False)
+            try:
+                rc = sock.connect_ex(key)
+            except OSError:
+                rc = -1
+            if rc in _CONNECT_IN_PROGRESS:
+                sel.register(sock, selectors.EVENT_WRITE, key)
+                continue
+            results[key] = rc == 0
+            sock.close()
+
+        deadline = time.monotonic() + float(timeout_s)
+        while sel.get_map():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            for sel_key, _events in sel.select(remaining):
+                sock = sel_key.fileobj
+                results[sel_key.data] = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0
+                sel.unregister(sock)
+                sock.close()
+    finally:
+        # Whatever is still pending timed out.
+        for sel_key in list(sel.get_map().values()):
+            results.setdefault(sel_key.data, False)
+            sel_key.fileobj.close()
+        sel.close()
+    return results
+
+
 def wait_for_port(host: str, port: int, timeout_s: float = 15.0, check_interval_s: float = 0.1) -> bool:
     deadline = time.time() + float(timeout_s)
     while time.time() < deadline:
@@ -143,8 +191,9 @@ def _open_log_file(path: Path) -> IO[str]:
 
 
 def start_services(specs: list[ServiceSpec], repo_root: Path, run_dir: Path) -> None:
+    open_ports = probe_ports((spec.host, spec.port) for spec in specs)
     for spec in specs:
-        if is_port_open(spec.host, spec.port):
+        if open_ports[(spec.host, int(spec.port))]:
             raise RuntimeError(f"Port already in use: {spec.host}:{spec.port} ({spec.name})")
 
     started: list[ServiceSpec] = []
@@ -218,10 +267,11 @@ def stop_services(specs: list[ServiceSpec], run_dir: Path, timeout_s: float = 5.
 
 def status_services(specs: list[ServiceSpec], run_dir: Path) -> list[dict]:
     rows: list[dict] = []
+    open_ports = probe_ports((spec.host, spec.port) for spec in specs)
     for spec in specs:
         pid = _read_pid(_pid_path(run_dir, spec.name))
         running = bool(pid is not None and pid_is_running(pid))
-        port_open = is_port_open(spec.host, spec.port)
+        port_open = open_ports[(spec.host, int(spec.port))]
         rows.append(
             {
                 "name": spec.name,
@@ -6,6 +6,7 @@ Used by the frontend for multi-container / multi-port deployments to probe:
 """
 
 import logging
+from typing import Optional, Tuple
 
 from fastapi import APIRouter
 
@@ -17,6 +18,16 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v1", tags=["backend"])
 
+# (backend, capabilities, speaker_unsupported_behavior) — the capability probes
+# only change when the backend is swapped or the config is updated at runtime.
+_capabilities_cache: Optional[Tuple[object, BackendCapabilities, str]] = None
+
+
+def invalidate_backend_capabilities() -> None:
+    """Drop cached capabilities (call after runtime config changes)."""
+    global _capabilities_cache
+    _capabilities_cache = None
+
 
 def _cap_bool(value: object) -> bool:
     # Many backends implement supports_* as bool properties. In tests we often use
@@ -24,18 +35,13 @@ def _cap_bool(value: object) -> bool:
     return value if isinstance(value, bool) else False
 
 
-@router.get("/backend", response_model=BackendInfoResponse)
-async def get_backend_info() -> BackendInfoResponse:
-    backend = engine_mod.model_manager.backend
-
-    info = {}
-    try:
-        raw_info = backend.get_info()
-        if isinstance(raw_info, dict):
-            info = raw_info
-    except Exception as e:
-        logger.warning(f"Failed to read backend.get_info(): {e}")
+def _get_capabilities(backend: object) -> Tuple[BackendCapabilities, str]:
+    global _capabilities_cache
+    cached = _capabilities_cache
+    if cached is not None and cached[0] is backend:
+        return cached[1], cached[2]
 
+    behavior = settings.speaker_unsupported_behavior_effective
     supports_speaker = _cap_bool(getattr(backend, "supports_speaker", False))
     supports_speaker_external = bool(getattr(settings, "speaker_external_diarizer_enable", False)) and bool(
         str(getattr(settings, "speaker_external_diarizer_base_url", "")).strip()
@@ -51,7 +57,6 @@ async def get_backend_info() -> BackendInfoResponse:
     elif supports_speaker_fallback:
         speaker_strategy = "fallback_diarization"
     else:
-        behavior = settings.speaker_unsupported_behavior_effective
         if behavior == "ignore":
             speaker_strategy = "ignore"
         elif behavior == "error":
@@ -67,10 +72,27 @@ async def get_backend_info() -> BackendInfoResponse:
         supports_speaker_external=supports_speaker_external,
         speaker_strategy=speaker_strategy,
     )
+    _capabilities_cache = (backend, capabilities, behavior)
+    return capabilities, behavior
+
+
+@router.get("/backend", response_model=BackendInfoResponse)
+async def get_backend_info() -> BackendInfoResponse:
+    backend = engine_mod.model_manager.backend
+
+    info = {}
+    try:
+        raw_info = backend.get_info()
+        if isinstance(raw_info, dict):
+            info = raw_info
+    except Exception as e:
+        logger.warning(f"Failed to read backend.get_info(): {e}")
+
+    capabilities, behavior = _get_capabilities(backend)
 
     return BackendInfoResponse(
         backend=settings.asr_backend,
         info=info,
         capabilities=capabilities,
-        speaker_unsupported_behavior=settings.speaker_unsupported_behavior_effective,
+        speaker_unsupported_behavior=behavior,
     )
@@ -139,6 +139,11 @@ async def update_config(request: ConfigUpdateRequest):
     if rejected:
         logger.warning(f"Rejected config updates: {rejected}")
 
+    # 配置变化可能影响 /api/v1/backend 的能力探测结果
+    if updated:
+        from src.api.routes.backend import invalidate_backend_capabilities
+        invalidate_backend_capabilities()
+
     # 如果更新了纠错相关配置，需要重新初始化引擎
     correction_keys = {"text_correct_enable", "text_correct_backend", "correction_pipeline"}
     if correction_keys & set(updated):
@@ -170,6 +175,9 @@ async def reload_engine():
         # 重新加载热词
         transcription_engine.load_all()
 
+        from src.api.routes.backend import invalidate_backend_capabilities
+        invalidate_backend_capabilities()
+
         logger.info("Transcription engine reloaded")
         return {"status": "success", "message": "Engine reloaded"}
     except Exception as e:
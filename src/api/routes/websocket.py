@@ -1,12 +1,25 @@
 """WebSocket 实时转写路由"""
 import json
-import uuid
+import secrets
 import asyncio
 import logging
+from functools import partial
+from typing import Any, Dict, NamedTuple, Optional, Tuple
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
 from src.config import settings
-from src.api.ws_manager import ws_manager, ConnectionState
+from src.api.ws_manager import (
+    OFFLINE_MODEL_EXECUTOR,
+    ONLINE_MODEL_EXECUTOR,
+    POSTPROCESS_EXECUTOR,
+    ConnectionState,
+    dumps_json,
+    encode_result,
+    send_json_fast,
+    ws_manager,
+)
+from src.core.asr_batcher import AsrBatcher
+from src.core.llm.cancel_token import CancelToken
 from src.core.engine import transcription_engine
 from src.models.model_manager import model_manager
 
@@ -14,11 +27,103 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["websocket"])
 
+# 每个连接待识别消息的队列上限 (约 200 帧)，满时阻塞接收以形成背压
+_STREAM_QUEUE_MAXSIZE = 200
 
-def _check_streaming_support() -> bool:
-    """检查当前后端是否支持流式转写"""
+# 在线中间结果的合并窗口 (秒): 窗口内相邻的同类增量合并为一条消息发送
+_PARTIAL_COALESCE_S = 0.03
+
+# 热词驻留表: 相同热词配置在所有连接间共享同一个规范化字符串
+_HOTWORDS_INTERN_MAX = 256
+_hotwords_interned: Dict[Any, Optional[str]] = {}
+
+
+def _intern_hotwords(value: Any) -> Optional[str]:
+    """规范化并驻留客户端下发的热词
+
+    支持空格分隔的字符串或列表；仅在配置变更时计算一次，
+    之后每次识别直接复用同一个对象 (也作为合批分组的键)。
+    """
+    if isinstance(value, list):
+        value = tuple(value)
+    try:
+        return _hotwords_interned[value]
+    except (KeyError, TypeError):
+        pass
+
+    if not value:
+        normalized = None
+    elif isinstance(value, tuple):
+        normalized = " ".join(str(w).strip() for w in value if str(w).strip()) or None
+    else:
+        normalized = str(value).strip() or None
+
+    if len(_hotwords_interned) >= _HOTWORDS_INTERN_MAX:
+        _hotwords_interned.clear()
+    try:
+        _hotwords_interned[value] = normalized
+    except TypeError:
+        pass  # 不可哈希的输入不驻留
+    return normalized
+
+
+async def _run_blocking(executor, fn, *args, **kwargs):
+    """在指定线程池中执行同步调用 (模型推理 / 纠错)，不阻塞事件循环"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, partial(fn, *args, **kwargs))
+
+
+def _generate_offline_batch(audios, hotwords: Optional[str]) -> list:
+    """一次推理识别多段音频 (PyTorch 离线模型)"""
+    offline_model = model_manager.loader.asr_model
+    result = offline_model.generate(input=list(audios), hotword=hotwords)
+    return [{"text": item.get("text", "")} for item in (result or [])]
+
+
+# 并发连接的离线识别在 20ms 窗口内合批，在离线模型的单线程执行器中串行推理
+_offline_batcher = AsrBatcher(_generate_offline_batch, executor=OFFLINE_MODEL_EXECUTOR)
+
+
+class _BackendTraits(NamedTuple):
+    """WebSocket 路由关心的后端能力 (每个后端实例只探测一次)"""
+    supports_streaming: bool
+    # 离线识别是否走 PyTorch loader (否则调用 backend.transcribe)
+    use_loader: bool
+    # 不支持流式时发送给客户端的警告消息 (预编码)
+    warning_message: Optional[str]
+
+
+# (backend, traits)；后端实例被替换时自动失效
+_backend_traits_cache: Optional[Tuple[object, _BackendTraits]] = None
+
+
+def _backend_traits() -> _BackendTraits:
+    """获取当前后端的能力 (按后端实例缓存)"""
+    global _backend_traits_cache
     backend = model_manager.backend
-    return backend.supports_streaming
+    cached = _backend_traits_cache
+    if cached is not None and cached[0] is backend:
+        return cached[1]
+
+    if backend.supports_streaming:
+        traits = _BackendTraits(True, True, None)
+    else:
+        backend_info = backend.get_info()
+        name = backend_info["name"]
+        traits = _BackendTraits(
+            supports_streaming=False,
+            use_loader=backend_info["type"] == "pytorch",
+            warning_message=dumps_json({
+                "warning": f"当前后端 {name} 不支持流式，已自动切换到 PyTorch 后端",
+                "backend": name,
+            }),
+        )
+        logger.warning(
+            f"Backend {name} does not support streaming, "
+            "falling back to PyTorch backend for WebSocket"
+        )
+    _backend_traits_cache = (backend, traits)
+    return traits
 
 
 async def _heartbeat_task(websocket: WebSocket, interval: int, timeout: int):
@@ -35,7 +140,7 @@ async def _heartbeat_task(websocket: WebSocket, interval: int, timeout: int):
         try:
             await asyncio.sleep(interval)
             # 发送 ping 帧
-            await websocket.send_json({"type": "ping", "timestamp": asyncio.get_event_loop().time()})
+            await send_json_fast(websocket, {"type": "ping", "timestamp": asyncio.get_event_loop().time()})
         except Exception as e:
             logger.debug(f"Heartbeat stopped: {e}")
             break
@@ -58,24 +163,17 @@ async def websocket_realtime(websocket: WebSocket):
     """
     await websocket.accept()
 
-    connection_id = str(uuid.uuid4())
-    ws_manager.connect(websocket, connection_id)
-    state = ws_manager.get_state(connection_id)
+    # 随机 64 位十六进制标识，比 uuid4 轻量且足以区分连接
+    connection_id = secrets.token_hex(8)
+    state = ws_manager.connect(websocket, connection_id)
 
     # 检查流式支持，发送警告信息
-    if not _check_streaming_support():
-        backend_info = model_manager.backend.get_info()
-        logger.warning(
-            f"Backend {backend_info['name']} does not support streaming, "
-            "falling back to PyTorch backend for WebSocket"
-        )
-        await websocket.send_json({
-            "warning": f"当前后端 {backend_info['name']} 不支持流式，已自动切换到 PyTorch 后端",
-            "backend": backend_info['name'],
-        })
+    traits = _backend_traits()
+    if not traits.supports_streaming:
+        await websocket.send_text(traits.warning_message)
 
     # 发送连接确认和配置信息
-    await websocket.send_json({
+    await send_json_fast(websocket, {
         "type": "connected",
         "connection_id": connection_id,
         "config": {
@@ -85,8 +183,12 @@ async def websocket_realtime(websocket: WebSocket):
         }
     })
 
-    frames = []
-    frames_online = []
+    # 接收与识别解耦: 接收循环只负责入队，识别由消费者任务按序执行，
+    # 识别结果交给写出任务合并后发送
+    queue: asyncio.Queue = asyncio.Queue(maxsize=_STREAM_QUEUE_MAXSIZE)
+    results: asyncio.Queue = asyncio.Queue()
+    writer = asyncio.create_task(_result_writer(websocket, results))
+    consumer = asyncio.create_task(_stream_consumer(state, queue, results.put_nowait))
 
     # 启动心跳任务
     heartbeat_coro = None
@@ -96,80 +198,62 @@ async def websocket_realtime(websocket: WebSocket):
         )
 
     try:
-        while True:
-            message = await websocket.receive()
+        receive = websocket.receive
+        enqueue = queue.put
+        while not consumer.done():
+            message = await receive()
+
+            # 处理二进制消息 (音频)：占绝大多数，最先判断；队列满时阻塞接收形成背压
+            audio_chunk = message.get("bytes")
+            if audio_chunk is not None:
+                await enqueue(audio_chunk)
+                continue
+
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
 
             # 处理文本消息 (配置)
-            if "text" in message:
-                try:
-                    config = json.loads(message["text"])
+            text = message.get("text")
+            if text is None:
+                continue
+            try:
+                config = json.loads(text)
+            except json.JSONDecodeError:
+                logger.warning(f"Invalid JSON config: {text}")
+                continue
 
-                    # 处理心跳响应
-                    if config.get("type") == "pong":
-                        continue
+            # 处理心跳响应
+            if config.get("type") == "pong":
+                continue
 
-                    _handle_config(state, config)
-                except json.JSONDecodeError:
-                    logger.warning(f"Invalid JSON config: {message['text']}")
+            # 取消 LLM 需立即生效，不在识别队列后排队
+            if config.get("type") == "cancel_llm":
+                _handle_config(state, config)
                 continue
 
-            # 处理二进制消息 (音频)
-            if "bytes" in message:
-                audio_chunk = message["bytes"]
-                frames.append(audio_chunk)
-                frames_online.append(audio_chunk)
-
-                # 在线识别 (每 chunk_interval 帧)
-                if len(frames_online) % state.chunk_interval == 0:
-                    if state.mode in ("2pass", "online"):
-                        audio_in = b"".join(frames_online)
-                        result = await _asr_online(audio_in, state)
-                        if result and result.get("text"):
-                            text = result["text"]
-                            # 流式去重
-                            if settings.stream_dedup_enable:
-                                text = state.text_merger.merge(text)
-                            if text:  # 只发送非空增量
-                                await websocket.send_json({
-                                    "mode": "2pass-online" if state.mode == "2pass" else "online",
-                                    "text": text,
-                                    "is_final": False,
-                                })
-                        frames_online = []
-
-                # 说话结束时执行离线识别
-                if not state.is_speaking:
-                    if state.mode in ("2pass", "offline") and frames:
-                        audio_in = b"".join(frames)
-                        result = await _asr_offline(audio_in, state)
-                        if result and result.get("text"):
-                            text = result["text"]
-                            # 热词纠错
-                            if transcription_engine._hotwords_loaded:
-                                correction = transcription_engine.corrector.correct(text)
-                                text = correction.text
-
-                            # 流式去重 (最终文本)
-                            if settings.stream_dedup_enable:
-                                text = state.text_merger.merge_final(text)
-
-                            await websocket.send_json({
-                                "mode": "2pass-offline" if state.mode == "2pass" else "offline",
-                                "text": text,
-                                "is_final": True,
-                            })
-
-                    # 重置
-                    frames = []
-                    frames_online = []
-                    state.reset()
+            # 其余配置与音频共用队列，保证先后顺序
+            await enqueue(config)
 
     except WebSocketDisconnect:
         logger.info(f"WebSocket disconnected: {connection_id}")
     except Exception as e:
         logger.error(f"WebSocket error: {e}", exc_info=True)
     finally:
-        # 取消心跳任务
+        # 取消识别与心跳任务
+        consumer.cancel()
+        try:
+            await consumer
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"WebSocket stream consumer error: {e}", exc_info=True)
+        writer.cancel()
+        try:
+            await writer
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.debug(f"WebSocket result writer stopped: {e}")
         if heartbeat_coro:
             heartbeat_coro.cancel()
             try:
@@ -179,6 +263,162 @@ async def websocket_realtime(websocket: WebSocket):
         ws_manager.disconnect(connection_id)
 
 
+async def _stream_consumer(state: ConnectionState, queue: asyncio.Queue, emit):
+    """按接收顺序处理配置与音频
+
+    每 chunk_interval 帧执行一次在线识别；说话结束后对整段音频执行离线识别。
+    结果通过 emit 交给 _result_writer: (mode, text, is_final) 元组或已编码的消息字符串。
+    """
+    # 流式去重开关不支持运行时修改，连接建立时读取一次
+    dedup_enable = settings.stream_dedup_enable
+    merger = state.text_merger
+
+    # 当前 (或最后一个) LLM 润色任务；润色在独立任务中执行，不阻塞后续语音的识别
+    polish: Optional[asyncio.Task] = None
+    try:
+        while True:
+            item = await queue.get()
+            if isinstance(item, dict):
+                _handle_config(state, item)
+                continue
+
+            # 原地追加；在线识别只送入上次调用后的新增音频，历史上下文由 asr_cache 保留
+            state.frames.extend(item)
+            state.online_chunks_since_flush += 1
+
+            # 在线识别 (每 chunk_interval 帧)
+            if state.online_chunks_since_flush >= state.chunk_interval:
+                if state.mode in ("2pass", "online"):
+                    with memoryview(state.frames) as view:
+                        audio_in = bytes(view[state.online_offset:])
+                    result = await _asr_online(audio_in, state)
+                    if result and result.get("text"):
+                        text = result["text"]
+                        # 流式去重
+                        if dedup_enable:
+                            text = merger.merge(text)
+                        if text:  # 只发送非空增量
+                            emit(("2pass-online" if state.mode == "2pass" else "online", text, False))
+                state.online_offset = len(state.frames)
+                state.online_chunks_since_flush = 0
+
+            # 说话结束时执行离线识别
+            if not state.is_speaking:
+                if state.mode in ("2pass", "offline") and state.frames:
+                    audio_in = bytes(state.frames)
+                    result = await _asr_offline(audio_in, state)
+                    if result and result.get("text"):
+                        text = result["text"]
+                        # 热词纠错
+                        if transcription_engine._hotwords_loaded:
+                            correction = await _run_blocking(
+                                POSTPROCESS_EXECUTOR, transcription_engine.corrector.correct, text
+                            )
+                            text = correction.text
+
+                        # 流式去重 (最终文本)
+                        if dedup_enable:
+                            text = merger.merge_final(text)
+
+                        offline_mode = "2pass-offline" if state.mode == "2pass" else "offline"
+                        emit((offline_mode, text, True))
+
+                        # LLM 润色 (需全局启用 LLM 且客户端开启 llm_polish)
+                        if state.llm_polish and settings.llm_enable:
+                            polish = _start_llm_polish(emit, state, text, f"{offline_mode}-polish", polish)
+
+                # 重置 (同时释放音频缓冲)
+                state.reset()
+    finally:
+        if polish is not None and not polish.done():
+            state.cancel_token.cancel()
+            polish.cancel()
+            await asyncio.gather(polish, return_exceptions=True)
+
+
+async def _result_writer(websocket: WebSocket, results: asyncio.Queue):
+    """发送识别结果
+
+    在线中间结果到达后最多再等待 _PARTIAL_COALESCE_S 秒，期间到达的同模式增量
+    拼接为一条消息，减少高并发下的发送次数；最终结果与其他消息不等待，按序立即发送。
+    """
+    loop = asyncio.get_running_loop()
+    get = results.get
+    while True:
+        items = [await get()]
+        deadline = loop.time() + _PARTIAL_COALESCE_S
+        while isinstance(items[-1], tuple) and not items[-1][2]:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                items.append(await asyncio.wait_for(get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        pending = None  # 尚未发送的在线增量 [mode, text]
+        for item in items:
+            if isinstance(item, tuple) and not item[2]:
+                if pending is not None and pending[0] == item[0]:
+                    pending[1] += item[1]
+                    continue
+                if pending is not None:
+                    await websocket.send_text(encode_result(pending[0], pending[1], False))
+                pending = [item[0], item[1]]
+                continue
+            if pending is not None:
+                await websocket.send_text(encode_result(pending[0], pending[1], False))
+                pending = None
+            if isinstance(item, tuple):
+                await websocket.send_text(encode_result(*item))
+            else:
+                await websocket.send_text(item)
+        if pending is not None:
+            await websocket.send_text(encode_result(pending[0], pending[1], False))
+
+
+def _start_llm_polish(
+    emit, state: ConnectionState, text: str, mode: str, previous: Optional[asyncio.Task]
+) -> asyncio.Task:
+    """为一段语音启动 LLM 润色任务
+
+    上一段润色仍在进行时沿用其取消令牌并排在其后执行，保证输出顺序，
+    cancel_llm 对排队中的润色同样生效；否则换用新令牌，不复位已取消的旧令牌。
+    """
+    if previous is None or previous.done():
+        state.cancel_token = CancelToken()
+    return asyncio.create_task(
+        _stream_llm_polish(emit, state.cancel_token, text, mode, previous)
+    )
+
+
+async def _stream_llm_polish(
+    emit, cancel_token: CancelToken, text: str, mode: str, previous: Optional[asyncio.Task] = None
+):
+    """流式下发 LLM 润色结果
+
+    每收到一段输出即发送 {"delta": ..., "is_final": false}，
+    结束后发送一条 {"text": 完整润色文本, "is_final": true}。
+    被取消或失败时最终文本回退为润色前的文本。
+    """
+    if previous is not None:
+        # 等待上一段润色发送完毕 (其异常已在其任务内处理)
+        await asyncio.wait([previous])
+    parts = []
+    try:
+        async for delta in transcription_engine._apply_llm_polish_stream(
+            text, role=settings.llm_role, cancel_token=cancel_token
+        ):
+            parts.append(delta)
+            emit(dumps_json({"mode": mode, "delta": delta, "is_final": False}))
+    except Exception as e:
+        logger.warning(f"LLM polish stream failed: {e}")
+        parts = []
+
+    polished = "" if cancel_token.is_cancelled else "".join(parts).strip()
+    emit(dumps_json({"mode": mode, "text": polished or text, "is_final": True}))
+
+
 def _handle_config(state: ConnectionState, config: dict):
     """处理配置消息"""
     # 处理 LLM 取消请求
@@ -192,9 +432,11 @@ def _handle_config(state: ConnectionState, config: dict):
     if "mode" in config:
         state.mode = config["mode"]
     if "hotwords" in config:
-        state.hotwords = config["hotwords"]
+        state.hotwords = _intern_hotwords(config["hotwords"])
     if "chunk_interval" in config:
         state.chunk_interval = config["chunk_interval"]
+    if "llm_polish" in config:
+        state.llm_polish = bool(config["llm_polish"])
 
 
 async def _asr_online(audio_in: bytes, state: ConnectionState) -> dict:
@@ -205,14 +447,21 @@ async def _asr_online(audio_in: bytes, state: ConnectionState) -> dict:
     try:
         # 使用 PyTorch 后端的流式模型
         online_model = model_manager.loader.asr_model_online
-        result = online_model.generate(
+        result = await _run_blocking(
+            ONLINE_MODEL_EXECUTOR,
+            online_model.generate,
             input=audio_in,
             cache=state.asr_cache,
             is_final=not state.is_speaking,
             hotword=state.hotwords,
         )
         if result:
-            state.asr_cache = result[0].get("cache", {})
+            # FunASR 原地更新传入的 cache，同一个 dict 跨分块复用；
+            # 仅当结果显式返回了另一个 cache 时才拷入
+            new_cache = result[0].get("cache")
+            if new_cache is not None and new_cache is not state.asr_cache:
+                state.asr_cache.clear()
+                state.asr_cache.update(new_cache)
             return {"text": result[0].get("text", "")}
     except Exception as e:
         logger.error(f"Online ASR error: {e}")
@@ -225,21 +474,15 @@ async def _asr_offline(audio_in: bytes, state: ConnectionState) -> dict:
     使用配置的后端进行离线识别。
     """
     try:
-        backend = model_manager.backend
-
         # 如果后端支持，使用后端转写
-        if backend.supports_streaming or backend.get_info()["type"] == "pytorch":
-            # PyTorch 后端使用 loader
-            offline_model = model_manager.loader.asr_model
-            result = offline_model.generate(
-                input=audio_in,
-                hotword=state.hotwords,
-            )
-            if result:
-                return {"text": result[0].get("text", "")}
+        if _backend_traits().use_loader:
+            # PyTorch 后端使用 loader，与其他连接的请求合批推理
+            return await _offline_batcher.submit(audio_in, state.hotwords)
         else:
             # 其他后端使用 backend.transcribe
-            result = backend.transcribe(
+            result = await _run_blocking(
+                OFFLINE_MODEL_EXECUTOR,
+                model_manager.backend.transcribe,
                 audio_in,
                 hotwords=state.hotwords,
             )
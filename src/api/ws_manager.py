@@ -1,5 +1,7 @@
 """WebSocket 连接管理"""
+import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional
 from dataclasses import dataclass, field
 from fastapi import WebSocket
@@ -9,18 +11,75 @@ from src.core.text_processor.stream_merger import StreamTextMerger
 from src.core.llm.cancel_token import CancelToken
 from src.utils.service_metrics import metrics
 
+# orjson (可选): C 实现的 JSON 序列化，未安装时回退到标准库
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# 所有连接共享的后处理线程池 (热词纠错等，不调用 ASR 模型)，按 ncpu 限制并发
+POSTPROCESS_EXECUTOR = ThreadPoolExecutor(max_workers=max(1, settings.ncpu), thread_name_prefix="postprocess")
+
+# FunASR AutoModel 每次推理都会把 cache / is_final / hotword 写入实例共享的 kwargs，
+# 同一模型上并发调用 generate 会串用其他连接的流式缓存与热词。
+# 每个模型各用一个单线程执行器，保证其推理串行
+ONLINE_MODEL_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="asr-online")
+OFFLINE_MODEL_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="asr-offline")
+
+
+def dumps_json(data: Any) -> str:
+    """序列化为紧凑 JSON 文本 (与 WebSocket.send_json 输出一致)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data).decode("utf-8")
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+# 识别结果消息的固定前缀/后缀 (按 mode 缓存)，每条消息只需编码 text 字段
+_RESULT_TEMPLATES: Dict[tuple, tuple] = {}
+
 
-@dataclass
+def encode_result(mode: str, text: str, is_final: bool) -> str:
+    """编码识别结果消息，等价于 dumps_json({"mode", "text", "is_final"})"""
+    key = (mode, is_final)
+    template = _RESULT_TEMPLATES.get(key)
+    if template is None:
+        template = (
+            '{"mode":' + dumps_json(mode) + ',"text":',
+            ',"is_final":' + ("true" if is_final else "false") + "}",
+        )
+        _RESULT_TEMPLATES[key] = template
+    return template[0] + dumps_json(text) + template[1]
+
+
+async def send_json_fast(websocket: WebSocket, data: Any):
+    """以文本帧发送 JSON 消息
+
+    仍使用文本帧 (而非二进制)，保持现有客户端按文本解析的协议不变。
+    """
+    await websocket.send_text(dumps_json(data))
+
+
+@dataclass(slots=True)
 class ConnectionState:
     """WebSocket 连接状态"""
+    # 所属连接 (由 WebSocketManager.connect 设置)
+    websocket: Optional[WebSocket] = None
     is_speaking: bool = False
     asr_cache: Dict[str, Any] = field(default_factory=dict)
     vad_cache: Dict[str, Any] = field(default_factory=dict)
     chunk_interval: int = 10
     mode: str = "2pass"
     hotwords: Optional[str] = None
+    # 音频缓冲: 整段话原地追加，供离线识别使用
+    frames: bytearray = field(default_factory=bytearray)
+    # 上次在线识别时 frames 的长度，其后的部分即待在线识别的新增音频
+    online_offset: int = 0
+    # 距上次在线识别已累积的音频帧数
+    online_chunks_since_flush: int = 0
     text_merger: StreamTextMerger = field(default_factory=lambda: StreamTextMerger(
         overlap_chars=settings.stream_dedup_overlap,
         error_tolerance=settings.stream_dedup_tolerance,
@@ -31,17 +90,23 @@ class ConnectionState:
     latency_samples: list = field(default_factory=list)
     adaptive_chunk_enable: bool = True
 
-    # LLM 取消令牌
+    # 当前 LLM 润色使用的取消令牌 (每轮润色换新，排队中的润色共用)
     cancel_token: CancelToken = field(default_factory=CancelToken)
+    # 离线结果是否追加流式 LLM 润色 (客户端配置 llm_polish)
+    llm_polish: bool = False
 
     def reset(self):
         """重置状态"""
         self.is_speaking = False
-        self.asr_cache = {}
-        self.vad_cache = {}
+        # 原地清空，保留 dict 对象供下一段语音复用
+        self.asr_cache.clear()
+        self.vad_cache.clear()
+        # 重新分配而非 clear，及时释放长语音占用的内存
+        self.frames = bytearray()
+        self.online_offset = 0
+        self.online_chunks_since_flush = 0
         self.text_merger.reset()
-        # 重置取消令牌
-        self.cancel_token.reset()
+        # 取消令牌不在此复位: 上一段语音的润色可能仍在进行，由下次启动润色时换新令牌
 
     def update_latency(self, latency_ms: float):
         """更新延迟样本并自适应调整分块大小
@@ -77,35 +142,39 @@ class WebSocketManager:
     """WebSocket 连接管理器"""
 
     def __init__(self):
-        self.connections: Dict[str, WebSocket] = {}
-        self.states: Dict[str, ConnectionState] = {}
-
-    def connect(self, websocket: WebSocket, connection_id: str):
-        """添加新连接"""
-        self.connections[connection_id] = websocket
-        self.states[connection_id] = ConnectionState()
+        # 连接 ID -> 连接状态 (状态中持有 websocket)，单表查找
+        self.sessions: Dict[str, ConnectionState] = {}
+
+    @property
+    def connections(self) -> Dict[str, WebSocket]:
+        """连接 ID -> WebSocket 的只读快照"""
+        return {cid: state.websocket for cid, state in self.sessions.items()}
+
+    def connect(self, websocket: WebSocket, connection_id: str) -> ConnectionState:
+        """添加新连接，返回其连接状态"""
+        state = ConnectionState(websocket=websocket)
+        self.sessions[connection_id] = state
         metrics.ws_connect()
         logger.info(f"WebSocket connected: {connection_id}")
+        return state
 
     def disconnect(self, connection_id: str):
         """移除连接"""
-        if connection_id in self.connections:
-            del self.connections[connection_id]
-        if connection_id in self.states:
-            del self.states[connection_id]
+        self.sessions.pop(connection_id, None)
         metrics.ws_disconnect()
         logger.info(f"WebSocket disconnected: {connection_id}")
 
     def get_state(self, connection_id: str) -> Optional[ConnectionState]:
         """获取连接状态"""
-        return self.states.get(connection_id)
+        return self.sessions.get(connection_id)
 
     async def send_json(self, connection_id: str, data: Dict[str, Any]):
         """发送 JSON 消息"""
-        websocket = self.connections.get(connection_id)
+        state = self.sessions.get(connection_id)
+        websocket = state.websocket if state else None
         if websocket:
             try:
-                await websocket.send_json(data)
+                await send_json_fast(websocket, data)
             except Exception as e:
                 logger.error(f"Failed to send message to {connection_id}: {e}")
 
@@ -0,0 +1,118 @@
+"""ASR 动态微批处理
+
+并发连接的离线识别请求在一个很短的时间窗口内聚合为一批，
+一次性提交给模型，摊薄单次推理 (kernel launch) 的固定开销。
+"""
+import asyncio
+import logging
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 批处理函数: (音频列表, 热词) -> 与输入一一对应的结果列表
+BatchFn = Callable[[Sequence[bytes], Optional[str]], List[Any]]
+
+
+@dataclass
+class _Pending:
+    """等待批处理的单个请求"""
+    audio: bytes
+    hotwords: Optional[str]
+    future: asyncio.Future = field(repr=False)
+
+
+class AsrBatcher:
+    """动态微批处理器
+
+    首个请求到达后最多再等待 window_s 秒收集后续请求 (至多 max_batch 个)，
+    按热词分组后各执行一次批量推理，再将结果分发回各自的 Future。
+    """
+
+    def __init__(
+        self,
+        batch_fn: BatchFn,
+        max_batch: int = 8,
+        window_s: float = 0.02,
+        executor: Optional[Executor] = None,
+    ):
+        """
+        Args:
+            batch_fn: 同步批处理函数，在 executor 线程中执行
+            max_batch: 单批最大请求数
+            window_s: 聚合等待窗口 (秒)
+            executor: 执行 batch_fn 的线程池，None 使用默认线程池
+        """
+        self.batch_fn = batch_fn
+        self.max_batch = max(1, max_batch)
+        self.window_s = window_s
+        self.executor = executor
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _ensure_worker(self) -> asyncio.Queue:
+        """在当前事件循环上启动后台批处理任务 (惰性创建)"""
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+        return self._queue
+
+    async def submit(self, audio: bytes, hotwords: Optional[str] = None) -> Any:
+        """提交单个请求并等待其批处理结果"""
+        queue = self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await queue.put(_Pending(audio, hotwords, future))
+        return await future
+
+    async def _collect(self, first: _Pending) -> List[_Pending]:
+        """以 first 为起点，在时间窗口内收集一批请求"""
+        batch = [first]
+        deadline = self._loop.time() + self.window_s
+        while len(batch) < self.max_batch:
+            timeout = deadline - self._loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            first = await self._queue.get()
+            batch = await self._collect(first)
+
+            # 热词不同的请求无法共用一次推理，按热词分组
+            groups: Dict[Optional[str], List[_Pending]] = {}
+            for item in batch:
+                groups.setdefault(item.hotwords, []).append(item)
+
+            for hotwords, items in groups.items():
+                await self._dispatch(hotwords, items)
+
+    async def _dispatch(self, hotwords: Optional[str], items: List[_Pending]):
+        """执行一组请求并分发结果"""
+        audios: Tuple[bytes, ...] = tuple(item.audio for item in items)
+        try:
+            results = await self._loop.run_in_executor(
+                self.executor, self.batch_fn, audios, hotwords
+            )
+            if len(results) != len(items):
+                raise RuntimeError(
+                    f"Batch result size mismatch: {len(results)} != {len(items)}"
+                )
+        except Exception as e:
+            logger.error(f"ASR batch failed ({len(items)} items): {e}")
+            for item in items:
+                if not item.future.done():
+                    item.future.set_exception(e)
+            return
+
+        for item, result in zip(items, results):
+            if not item.future.done():
+                item.future.set_result(result)
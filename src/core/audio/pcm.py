@@ -8,12 +8,21 @@ This module provides small utilities without requiring FFmpeg/librosa/soundfile.
 
 from __future__ import annotations
 
-import io
-import wave
+import struct
+import threading
 from typing import Tuple
 
 import numpy as np
 
+# numba (optional): compiled conversion loops for long uploads.
+try:
+    from numba import njit
+
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - exercised when numba is missing
+    njit = None
+    NUMBA_AVAILABLE = False
+
 __all__ = [
     "is_wav_bytes",
     "pcm16le_bytes_to_float32",
@@ -21,6 +30,45 @@ __all__ = [
     "wav_bytes_to_float32",
 ]
 
+_PCM16_SCALE = np.float32(1.0 / 32768.0)
+
+# Per-thread float32 scratch reused by float32_to_pcm16le_bytes. Inputs longer
+# than the cap get a one-off buffer so long uploads don't pin memory.
+_SCRATCH_MAX_SAMPLES = 16000 * 60
+_scratch = threading.local()
+
+
+# Below this many samples the NumPy ufunc path is already bandwidth-bound and
+# cheaper than crossing into the JIT kernel.
+_KERNEL_MIN_SAMPLES = 1 << 18
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True, fastmath=True, boundscheck=False)
+    def _pcm16_to_f32_kernel(src, out, scale):
+        for i in range(src.shape[0]):
+            out[i] = np.float32(src[i]) * scale
+
+    @njit(cache=True, boundscheck=False)
+    def _f32_to_pcm16_kernel(src, out):
+        for i in range(src.shape[0]):
+            v = src[i] * np.float32(32768.0)
+            if v > 32767.0:
+                v = np.float32(32767.0)
+            elif v < -32768.0:
+                v = np.float32(-32768.0)
+            out[i] = np.int16(v)
+
+
+def _get_scratch(n: int) -> np.ndarray:
+    if n > _SCRATCH_MAX_SAMPLES:
+        return np.empty((n,), dtype=np.float32)
+    buf = getattr(_scratch, "buf", None)
+    if buf is None or buf.size < n:
+        buf = np.empty((max(n, 16000),), dtype=np.float32)
+        _scratch.buf = buf
+    return buf[:n]
+
 
 def is_wav_bytes(data: bytes) -> bool:
     """Best-effort check for a RIFF/WAVE header."""
@@ -36,8 +84,14 @@ def pcm16le_bytes_to_float32(pcm: bytes) -> np.ndarray:
     if len(pcm) % 2 != 0:
         pcm = pcm[: len(pcm) - 1]
 
+    # Zero-copy int16 view; the cast and scale run as one fused ufunc pass.
     audio_i16 = np.frombuffer(pcm, dtype=np.int16)
-    return audio_i16.astype(np.float32) / 32768.0
+    out = np.empty(audio_i16.shape, dtype=np.float32)
+    if NUMBA_AVAILABLE and audio_i16.size >= _KERNEL_MIN_SAMPLES:
+        _pcm16_to_f32_kernel(audio_i16, out, _PCM16_SCALE)
+    else:
+        np.multiply(audio_i16, _PCM16_SCALE, out=out)
+    return out
 
 
 def float32_to_pcm16le_bytes(audio: np.ndarray) -> bytes:
@@ -49,9 +103,55 @@ def float32_to_pcm16le_bytes(audio: np.ndarray) -> bytes:
     if a.size == 0:
         return b""
 
-    a = np.clip(a, -1.0, 0.9999695)  # avoid overflow at +1.0
-    audio_i16 = (a * 32768.0).astype(np.int16)
-    return audio_i16.tobytes()
+    if NUMBA_AVAILABLE and a.size >= _KERNEL_MIN_SAMPLES:
+        out = np.empty((a.size,), dtype=np.int16)
+        _f32_to_pcm16_kernel(np.ascontiguousarray(a).reshape(-1), out)
+        return out.tobytes()
+
+    # Scale into a reused scratch buffer, then clip in place to the int16
+    # range (same result as clipping to [-1, 0.9999695] before scaling).
+    scratch = _get_scratch(a.size)
+    np.multiply(a.reshape(-1), np.float32(32768.0), out=scratch)
+    np.clip(scratch, -32768.0, 32767.0, out=scratch)
+    return scratch.astype(np.int16).tobytes()
+
+
+_WAVE_FORMAT_PCM = 1
+
+
+def _parse_wav(data: bytes) -> Tuple[int, int, int, memoryview]:
+    """Walk RIFF chunks; return (channels, sample_rate, bits, pcm_view).
+
+    The PCM payload is a zero-copy view into ``data``. A data chunk that
+    claims more bytes than are present (e.g. streamed WAV) is truncated to
+    what is available, like ``wave.readframes`` does.
+    """
+    if not is_wav_bytes(data):
+        raise ValueError("Not a RIFF/WAVE file")
+
+    fmt = None
+    pos = 12
+    end = len(data)
+    while pos + 8 <= end:
+        chunk_id = data[pos:pos + 4]
+        (size,) = struct.unpack_from("<I", data, pos + 4)
+        body = pos + 8
+        if chunk_id == b"fmt ":
+            if size < 16 or body + 16 > end:
+                raise ValueError("Truncated WAV fmt chunk")
+            audio_format, channels, sample_rate, _, _, bits = struct.unpack_from("<HHIIHH", data, body)
+            if audio_format != _WAVE_FORMAT_PCM:
+                raise ValueError(f"Unsupported WAV format tag: {audio_format}")
+            fmt = (channels, sample_rate, bits)
+        elif chunk_id == b"data":
+            if fmt is None:
+                raise ValueError("WAV data chunk before fmt chunk")
+            payload = memoryview(data)[body:min(body + size, end)]
+            return fmt[0], fmt[1], fmt[2], payload
+        # Chunks are word-aligned.
+        pos = body + size + (size & 1)
+
+    raise ValueError("WAV file has no data chunk")
 
 
 def wav_bytes_to_float32(wav_data: bytes) -> Tuple[np.ndarray, int]:
@@ -59,16 +159,11 @@ def wav_bytes_to_float32(wav_data: bytes) -> Tuple[np.ndarray, int]:
 
     Only supports PCM16 mono WAV, which matches TingWu's internal standard.
     """
-    with wave.open(io.BytesIO(wav_data), "rb") as wf:
-        channels = wf.getnchannels()
-        sampwidth = wf.getsampwidth()
-        sample_rate = wf.getframerate()
-        frames = wf.readframes(wf.getnframes())
+    channels, sample_rate, bits, frames = _parse_wav(wav_data)
 
     if channels != 1:
         raise ValueError(f"Only mono WAV is supported (channels=1), got {channels}")
-    if sampwidth != 2:
-        raise ValueError(f"Only 16-bit WAV is supported (sampwidth=2), got {sampwidth}")
+    if bits != 16:
+        raise ValueError(f"Only 16-bit WAV is supported (sampwidth=2), got {bits // 8}")
 
     return pcm16le_bytes_to_float32(frames), int(sample_rate)
-
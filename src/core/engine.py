@@ -1,8 +1,9 @@
 """核心转写引擎"""
 import asyncio
 import logging
+import threading
 import time
-from typing import Dict, Any, Optional, Union, List, Tuple, Callable
+from typing import TYPE_CHECKING, AsyncIterator, Dict, Any, Optional, Union, List, Tuple, Callable
 from pathlib import Path
 import json
 
@@ -13,10 +14,8 @@ from src.config import settings
 from src.models.model_manager import model_manager
 from src.core.hotword import PhonemeCorrector
 from src.core.hotword.rule_corrector import RuleCorrector
-from src.core.hotword.rectification import RectificationRAG
-from src.core.speaker import SpeakerLabeler, build_speaker_turns
-from src.core.llm import LLMClient, LLMMessage, PromptBuilder
-from src.core.llm.roles import get_role
+from src.core.speaker import SpeakerLabeler
+from src.core.speaker.turns import build_speaker_turns
 from src.core.text_processor import TextPostProcessor, PostProcessorSettings
 from src.core.text_processor.text_corrector import TextCorrector
 from src.core.audio.chunker import AudioChunker
@@ -27,6 +26,12 @@ from src.core.speaker.external_diarizer_normalize import normalize_segments
 from src.core.speaker.external_diarizer_turns import segments_to_turns
 from src.utils.service_metrics import metrics
 
+# LLM / 纠错历史等模块较重，首次使用时再导入，
+# 使仅需流式识别的进程 (如 WebSocket 路由) 保持轻量
+if TYPE_CHECKING:
+    from src.core.hotword.rectification import RectificationRAG
+    from src.core.llm import CancelToken, LLMClient, LLMMessage
+
 logger = logging.getLogger(__name__)
 
 
@@ -41,8 +46,9 @@ class TranscriptionEngine:
             faiss_index_type=settings.hotword_faiss_index_type,
         )
         self.rule_corrector = RuleCorrector()
-        self.rectification_rag = RectificationRAG()
-        self.speaker_labeler = SpeakerLabeler(label_style=settings.speaker_label_style)
+        # 纠错历史在 load_rectify_history() 时创建
+        self.rectification_rag: Optional["RectificationRAG"] = None
+        self._speaker_labeler: Optional["SpeakerLabeler"] = None
 
         # 文本后处理器
         self.post_processor = TextPostProcessor.from_config(settings)
@@ -59,8 +65,7 @@ class TranscriptionEngine:
         self._text_correct_enabled = settings.text_correct_enable
 
         # LLM 组件
-        self._llm_client: Optional[LLMClient] = None
-        self._prompt_builder: Optional[PromptBuilder] = None
+        self._llm_client: Optional["LLMClient"] = None
         # Forced hotwords (强制替换/纠错)：用于 PhonemeCorrector + rules 等纠错链路。
         self._hotwords_list: List[str] = []
         # Context hotwords (上下文提示)：仅用于前向注入/提示模型，不做强制替换。
@@ -70,6 +75,10 @@ class TranscriptionEngine:
         self._context_hotwords_loaded = False
         self._rules_loaded = False
         self._rectify_loaded = False
+
+        # 同步入口调用异步 LLM / 外部服务时复用的后台事件循环 (首次使用时启动)
+        self._bg_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._bg_loop_lock = threading.Lock()
 
     def warmup(self, duration: float = 1.0) -> Dict[str, Any]:
         """预热模型，消除首次推理延迟
@@ -126,9 +135,11 @@ class TranscriptionEngine:
         return results
 
     @property
-    def llm_client(self) -> LLMClient:
+    def llm_client(self) -> "LLMClient":
         """懒加载 LLM 客户端"""
         if self._llm_client is None:
+            from src.core.llm import LLMClient
+
             self._llm_client = LLMClient(
                 base_url=settings.llm_base_url,
                 model=settings.llm_model,
@@ -141,6 +152,32 @@ class TranscriptionEngine:
             )
         return self._llm_client
 
+    def _run_coroutine_sync(self, coro):
+        """在后台常驻事件循环中执行协程并阻塞等待结果
+
+        避免每次调用 asyncio.run 新建/销毁事件循环，循环上的连接等资源可跨调用复用。
+        """
+        loop = self._bg_loop
+        if loop is None or loop.is_closed():
+            with self._bg_loop_lock:
+                loop = self._bg_loop
+                if loop is None or loop.is_closed():
+                    loop = asyncio.new_event_loop()
+                    threading.Thread(
+                        target=loop.run_forever,
+                        name="engine-bg-loop",
+                        daemon=True,
+                    ).start()
+                    self._bg_loop = loop
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    @property
+    def speaker_labeler(self) -> "SpeakerLabeler":
+        """懒加载说话人标注器"""
+        if self._speaker_labeler is None:
+            self._speaker_labeler = SpeakerLabeler(label_style=settings.speaker_label_style)
+        return self._speaker_labeler
+
     @property
     def text_corrector(self) -> Optional[TextCorrector]:
         """懒加载文本纠错器"""
@@ -209,6 +246,8 @@ class TranscriptionEngine:
             path = str(settings.hotwords_dir / "hot-rectify.txt")
 
         if Path(path).exists():
+            from src.core.hotword.rectification import RectificationRAG
+
             self.rectification_rag = RectificationRAG(rectify_file=path)
             count = self.rectification_rag.load_history()
             logger.info(f"Loaded {count} rectify records from {path}")
@@ -453,40 +492,90 @@ class TranscriptionEngine:
         Returns:
             (纠错后文本, 相似词候选列表 [(原词, 热词, 分数), ...])
         """
-        original = text
+        texts, all_similars = self._apply_corrections_batch(
+            [text],
+            post_processor=post_processor,
+            correction_pipeline=correction_pipeline,
+        )
+        return texts[0], all_similars
+
+    def _apply_corrections_batch(
+        self,
+        texts: List[str],
+        *,
+        post_processor: Optional[TextPostProcessor] = None,
+        correction_pipeline: Optional[str] = None,
+    ) -> Tuple[List[str], List[Tuple[str, str, float]]]:
+        """对多段文本应用纠错管线
+
+        管线解析与各步骤的开关判断只做一次，然后逐步骤处理全部文本
+        (同一纠错器连续处理，减少长音频逐句调用的开销)。
+
+        Returns:
+            (纠错后文本列表, 相似词候选列表 [(原词, 热词, 分数), ...])
+        """
+        originals = texts
+        texts = list(texts)
         all_similars: List[Tuple[str, str, float]] = []
         pipeline_str = correction_pipeline or settings.correction_pipeline
         pipeline = [s.strip() for s in pipeline_str.split(',') if s.strip()]
         pp = post_processor or self.post_processor
 
         for step in pipeline:
-            if step == "hotword" and self._hotwords_loaded and text:
-                prev = text
-                correction = self.corrector.correct(text)
-                text = correction.text
-                all_similars.extend(correction.similars)
-                if text != prev:
-                    logger.debug(f"Hotword correction: {prev!r} -> {text!r}")
-
-            elif step == "rules" and self._rules_loaded and text:
-                prev = text
-                text = self.rule_corrector.substitute(text)
-                if text != prev:
-                    logger.debug(f"Rule correction: {prev!r} -> {text!r}")
-
-            elif step == "pycorrector" and self._text_correct_enabled and text and self.text_corrector:
-                prev = text
-                text, errors = self.text_corrector.correct(text)
-                if text != prev:
-                    logger.debug(f"Text correction: {prev!r} -> {text!r}, errors={errors}")
+            if step == "hotword" and self._hotwords_loaded:
+                correct = self.corrector.correct
+                for i, text in enumerate(texts):
+                    if not text:
+                        continue
+                    correction = correct(text)
+                    texts[i] = correction.text
+                    all_similars.extend(correction.similars)
+                    if texts[i] != text:
+                        logger.debug(f"Hotword correction: {text!r} -> {texts[i]!r}")
+
+            elif step == "rules" and self._rules_loaded:
+                substitute = self.rule_corrector.substitute
+                for i, text in enumerate(texts):
+                    if not text:
+                        continue
+                    texts[i] = substitute(text)
+                    if texts[i] != text:
+                        logger.debug(f"Rule correction: {text!r} -> {texts[i]!r}")
+
+            elif step == "pycorrector" and self._text_correct_enabled:
+                for i, text in enumerate(texts):
+                    if not text or not self.text_corrector:
+                        continue
+                    texts[i], errors = self.text_corrector.correct(text)
+                    if texts[i] != text:
+                        logger.debug(f"Text correction: {text!r} -> {texts[i]!r}, errors={errors}")
 
             elif step == "post_process":
-                text = pp.process(text)
+                process = pp.process
+                texts = [process(text) for text in texts]
+
+        for original, text in zip(originals, texts):
+            if text != original:
+                logger.debug(f"Total correction: {original!r} -> {text!r}")
 
-        if text != original:
-            logger.debug(f"Total correction: {original!r} -> {text!r}")
+        return texts, all_similars
 
-        return text, all_similars
+    def _correct_sentences(
+        self,
+        sentence_info: List[Dict[str, Any]],
+        *,
+        post_processor: Optional[TextPostProcessor] = None,
+    ) -> List[Tuple[str, str, float]]:
+        """批量纠错每个句子的文本 (原地更新)，返回相似词候选"""
+        if not sentence_info:
+            return []
+        texts, similars = self._apply_corrections_batch(
+            [sent.get("text", "") for sent in sentence_info],
+            post_processor=post_processor,
+        )
+        for sent, text in zip(sentence_info, texts):
+            sent["text"] = text
+        return similars
 
     def _filter_low_confidence(
         self,
@@ -529,16 +618,9 @@ class TranscriptionEngine:
                 elif fallback == "llm" and settings.llm_enable:
                     # 使用 LLM 进行纠错 (异步转同步)
                     try:
-                        import asyncio
-                        try:
-                            loop = asyncio.get_event_loop()
-                            corrected = loop.run_until_complete(
-                                self._apply_llm_polish(text, role="corrector")
-                            )
-                        except RuntimeError:
-                            corrected = asyncio.run(
-                                self._apply_llm_polish(text, role="corrector")
-                            )
+                        corrected = self._run_coroutine_sync(
+                            self._apply_llm_polish(text, role="corrector")
+                        )
                         if corrected and corrected != text:
                             logger.debug(f"Low confidence ({confidence:.2f}) LLM: {text!r} -> {corrected!r}")
                             sent['text'] = corrected
@@ -578,6 +660,64 @@ class TranscriptionEngine:
         if not text:
             return text
 
+        llm_messages = self._build_llm_polish_messages(
+            text,
+            role=role,
+            prev_context=prev_context,
+            next_context=next_context,
+            similarity_candidates=similarity_candidates,
+        )
+
+        # 调用 LLM
+        result_parts = []
+        async for chunk in self.llm_client.chat(llm_messages, stream=False):
+            result_parts.append(chunk)
+
+        polished = "".join(result_parts).strip()
+        return polished if polished else text
+
+    async def _apply_llm_polish_stream(
+        self,
+        text: str,
+        role: str = "default",
+        similarity_candidates: Optional[List[Tuple[str, str, float]]] = None,
+        cancel_token: Optional["CancelToken"] = None,
+    ) -> AsyncIterator[str]:
+        """流式 LLM 润色，逐段产出增量文本
+
+        与 _apply_llm_polish 使用相同的提示词，但以 stream=True 调用 LLM，
+        首个 token 到达即可下发，无需等待完整响应。
+
+        Args:
+            text: 待润色文本
+            role: LLM 角色
+            similarity_candidates: 相似词候选 [(原词, 热词, 分数), ...]
+            cancel_token: 取消令牌，取消后停止产出
+        """
+        if not text:
+            return
+
+        llm_messages = self._build_llm_polish_messages(
+            text, role=role, similarity_candidates=similarity_candidates
+        )
+        async for chunk in self.llm_client.chat(
+            llm_messages, stream=True, cancel_token=cancel_token
+        ):
+            if chunk:
+                yield chunk
+
+    def _build_llm_polish_messages(
+        self,
+        text: str,
+        role: str = "default",
+        prev_context: Optional[str] = None,
+        next_context: Optional[str] = None,
+        similarity_candidates: Optional[List[Tuple[str, str, float]]] = None,
+    ) -> List["LLMMessage"]:
+        """构建单段润色的 LLM 消息"""
+        from src.core.llm import LLMMessage, PromptBuilder
+        from src.core.llm.roles import get_role
+
         # 获取角色
         role_obj = get_role(role)
 
@@ -606,15 +746,7 @@ class TranscriptionEngine:
         )
 
         # 转换为 LLMMessage
-        llm_messages = [LLMMessage(role=m["role"], content=m["content"]) for m in messages]
-
-        # 调用 LLM
-        result_parts = []
-        async for chunk in self.llm_client.chat(llm_messages, stream=False):
-            result_parts.append(chunk)
-
-        polished = "".join(result_parts).strip()
-        return polished if polished else text
+        return [LLMMessage(role=m["role"], content=m["content"]) for m in messages]
 
     async def _apply_llm_fulltext_polish(
         self,
@@ -643,6 +775,9 @@ class TranscriptionEngine:
             logger.warning(f"Text too long for fulltext polish ({len(text)} > {max_chars}), truncating")
             text = text[:max_chars]
 
+        from src.core.llm import LLMMessage, PromptBuilder
+        from src.core.llm.roles import get_role
+
         # 使用 corrector 角色
         role_obj = get_role("corrector")
         prompt_builder = PromptBuilder(system_prompt=role_obj.system_prompt)
@@ -758,6 +893,9 @@ class TranscriptionEngine:
         if not sentences:
             return sentences
 
+        from src.core.llm import LLMMessage, PromptBuilder
+        from src.core.llm.roles import get_role
+
         role_obj = get_role(role)
 
         for i in range(0, len(sentences), batch_size):
@@ -865,10 +1003,7 @@ class TranscriptionEngine:
                     apply_llm=apply_llm,
                     llm_role=llm_role,
                 )
-                try:
-                    out = asyncio.get_event_loop().run_until_complete(coro)
-                except RuntimeError:
-                    out = asyncio.run(coro)
+                out = self._run_coroutine_sync(coro)
 
                 if out is not None:
                     metrics.record_diarizer_call(success=True, latency_s=time.time() - diarizer_t0)
@@ -940,44 +1075,25 @@ class TranscriptionEngine:
             text, similars = self._apply_corrections(text, post_processor=post_processor)
             all_similars.extend(similars)
             # 同时纠错每个句子的文本
-            for sent in sentence_info:
-                sent["text"], sent_similars = self._apply_corrections(
-                    sent.get("text", ""),
-                    post_processor=post_processor,
-                )
-                all_similars.extend(sent_similars)
+            all_similars.extend(self._correct_sentences(sentence_info, post_processor=post_processor))
 
         # 去重相似词候选
         all_similars = self._dedupe_similars(all_similars)
 
         # LLM 润色 - 传入相似词候选
         if apply_llm:
-            try:
-                if settings.llm_fulltext_enable:
-                    text = asyncio.get_event_loop().run_until_complete(
-                        self._apply_llm_fulltext_polish(
-                            text,
-                            max_chars=settings.llm_fulltext_max_chars,
-                            similarity_candidates=all_similars
-                        )
-                    )
-                else:
-                    text = asyncio.get_event_loop().run_until_complete(
-                        self._apply_llm_polish(text, role=llm_role, similarity_candidates=all_similars)
-                    )
-            except RuntimeError:
-                if settings.llm_fulltext_enable:
-                    text = asyncio.run(
-                        self._apply_llm_fulltext_polish(
-                            text,
-                            max_chars=settings.llm_fulltext_max_chars,
-                            similarity_candidates=all_similars
-                        )
-                    )
-                else:
-                    text = asyncio.run(
-                        self._apply_llm_polish(text, role=llm_role, similarity_candidates=all_similars)
+            if settings.llm_fulltext_enable:
+                text = self._run_coroutine_sync(
+                    self._apply_llm_fulltext_polish(
+                        text,
+                        max_chars=settings.llm_fulltext_max_chars,
+                        similarity_candidates=all_similars
                     )
+                )
+            else:
+                text = self._run_coroutine_sync(
+                    self._apply_llm_polish(text, role=llm_role, similarity_candidates=all_similars)
+                )
 
         # 说话人标注
         speaker_options = self._get_request_speaker_options(asr_options) if with_speaker else {}
@@ -1192,12 +1308,7 @@ class TranscriptionEngine:
         if apply_hotword:
             text, similars = self._apply_corrections(text, post_processor=post_processor)
             all_similars.extend(similars)
-            for sent in sentence_info:
-                sent["text"], sent_similars = self._apply_corrections(
-                    sent.get("text", ""),
-                    post_processor=post_processor,
-                )
-                all_similars.extend(sent_similars)
+            all_similars.extend(self._correct_sentences(sentence_info, post_processor=post_processor))
 
         # 去重相似词候选
         all_similars = self._dedupe_similars(all_similars)
@@ -2111,44 +2222,25 @@ class TranscriptionEngine:
                 all_similars.extend(similars_accu)
 
             # 同时纠错每个句子的文本
-            for sent in sentence_info:
-                sent["text"], sent_similars = self._apply_corrections(
-                    sent.get("text", ""),
-                    post_processor=post_processor,
-                )
-                all_similars.extend(sent_similars)
+            all_similars.extend(self._correct_sentences(sentence_info, post_processor=post_processor))
 
         # 去重相似词候选
         all_similars = self._dedupe_similars(all_similars)
 
         # 全文 LLM 润色 - 传入相似词候选
-        if apply_llm and text:
-            try:
-                if settings.llm_fulltext_enable:
-                    text = asyncio.get_event_loop().run_until_complete(
-                        self._apply_llm_fulltext_polish(
-                            text,
-                            max_chars=settings.llm_fulltext_max_chars,
-                            similarity_candidates=all_similars
-                        )
-                    )
-                else:
-                    text = asyncio.get_event_loop().run_until_complete(
-                        self._apply_llm_polish(text, role=llm_role, similarity_candidates=all_similars)
-                    )
-            except RuntimeError:
-                if settings.llm_fulltext_enable:
-                    text = asyncio.run(
-                        self._apply_llm_fulltext_polish(
-                            text,
-                            max_chars=settings.llm_fulltext_max_chars,
-                            similarity_candidates=all_similars
-                        )
-                    )
-                else:
-                    text = asyncio.run(
-                        self._apply_llm_polish(text, role=llm_role, similarity_candidates=all_similars)
+        if apply_llm and text:
+            if settings.llm_fulltext_enable:
+                text = self._run_coroutine_sync(
+                    self._apply_llm_fulltext_polish(
+                        text,
+                        max_chars=settings.llm_fulltext_max_chars,
+                        similarity_candidates=all_similars
                     )
+                )
+            else:
+                text = self._run_coroutine_sync(
+                    self._apply_llm_polish(text, role=llm_role, similarity_candidates=all_similars)
+                )
 
         # 说话人标注
         speaker_options = self._get_request_speaker_options(asr_options) if with_speaker else {}
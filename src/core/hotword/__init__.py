@@ -1,6 +1,6 @@
 """Hotword processing module"""
 from src.core.hotword.corrector import PhonemeCorrector, CorrectionResult
-from src.core.hotword.phoneme import Phoneme, get_phoneme_info, SIMILAR_PHONEMES
+from src.core.hotword.phoneme import Phoneme, get_phoneme_info, SIMILAR_PHONEMES, SIMILAR_LOOKUP
 from src.core.hotword.shape_corrector import ShapeCorrector, JointCorrector
 
 __all__ = [
@@ -9,6 +9,7 @@ __all__ = [
     'Phoneme',
     'get_phoneme_info',
     'SIMILAR_PHONEMES',
+    'SIMILAR_LOOKUP',
     'ShapeCorrector',
     'JointCorrector',
 ]
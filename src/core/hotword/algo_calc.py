@@ -5,38 +5,49 @@
 - lcs_length: 最长公共子序列 (用于英文匹配)
 - find_best_match: 带词边界约束的模糊匹配
 - fuzzy_substring_search_constrained: 边界约束搜索
+
+DP 内核由 Numba JIT 编译：音素序列先编码为整数 id (encode_phonemes)，
+两两匹配代价通过预计算的代价表一次性取出，内核中只做标量运算。
 """
-from typing import List, Tuple
+import threading
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Sequence, Tuple, Union
+
+import numpy as np
+from numba import njit
 
-from src.core.hotword.phoneme import Phoneme, SIMILAR_PHONEMES
+from src.core.hotword.phoneme import Phoneme, SIMILAR_LOOKUP
 
 
 def lcs_length(s1: str, s2: str) -> int:
     """
     计算两个字符串的最长公共子序列 (LCS) 长度
 
-    时间复杂度: O(m*n)
-    空间复杂度: O(min(m,n)) - 使用滚动数组优化
+    Hyyrö 位并行算法：较短串的每个字符对应一个位掩码，
+    对较长串的每个字符只做常数次整数位运算。
+
+    时间复杂度: O(m*⌈n/w⌉) (w 为机器字长，n 为较短串长度)
     """
     if len(s1) < len(s2):
         s1, s2 = s2, s1
 
-    m, n = len(s1), len(s2)
+    n = len(s2)
     if n == 0:
         return 0
 
-    prev = [0] * (n + 1)
-    curr = [0] * (n + 1)
+    # 字符 -> 在较短串中出现位置的位掩码
+    masks: Dict[str, int] = {}
+    for i, c in enumerate(s2):
+        masks[c] = masks.get(c, 0) | (1 << i)
 
-    for i in range(1, m + 1):
-        for j in range(1, n + 1):
-            if s1[i-1] == s2[j-1]:
-                curr[j] = prev[j-1] + 1
-            else:
-                curr[j] = max(prev[j], curr[j-1])
-        prev, curr = curr, prev
+    full = (1 << n) - 1
+    v = full
+    for c in s1:
+        u = v & masks.get(c, 0)
+        v = ((v + u) | (v - u)) & full
 
-    return prev[n]
+    # v 中被清零的位数即 LCS 长度
+    return n - v.bit_count()
 
 
 def get_phoneme_cost(p1: Phoneme, p2: Phoneme) -> float:
@@ -62,10 +73,9 @@ def get_phoneme_cost(p1: Phoneme, p2: Phoneme) -> float:
 
     # 中文音素：检查相似音素
     if p1.lang == 'zh' and p2.lang == 'zh':
-        pair = {p1.value, p2.value}
-        for s in SIMILAR_PHONEMES:
-            if pair.issubset(s):
-                return 0.5
+        similar = SIMILAR_LOOKUP.get((p1.value, p2.value))
+        if similar is not None:
+            return similar
 
     # 英文单词：使用 LCS 计算相似度
     if p1.lang == 'en' and p2.lang == 'en':
@@ -97,10 +107,9 @@ def get_tuple_cost(t1: Tuple, t2: Tuple) -> float:
         # 声调差异给予较低代价
         if t1[4] and t2[4]:  # both are tones
             return 0.5
-        pair = {t1[0], t2[0]}
-        for s in SIMILAR_PHONEMES:
-            if pair.issubset(s):
-                return 0.5
+        similar = SIMILAR_LOOKUP.get((t1[0], t2[0]))
+        if similar is not None:
+            return similar
 
     # 英文单词字符级相似度
     if t1[1] == 'en':
@@ -112,130 +121,425 @@ def get_tuple_cost(t1: Tuple, t2: Tuple) -> float:
     return 1.0
 
 
-def find_best_match(main_seq: List[Phoneme], sub_seq: List[Phoneme]) -> Tuple[float, int, int]:
+# ---------------------------------------------------------------------------
+# 音素编码与代价表
+# ---------------------------------------------------------------------------
+
+class PhonemeCodes(NamedTuple):
+    """预编码的音素序列 (供 JIT 内核使用)"""
+    ids: np.ndarray             # 音素 id (int64)
+    word_start: np.ndarray      # 是否词起始 (bool)
+    word_end: np.ndarray        # 是否词结束 (bool)
+    en_index: np.ndarray        # 英文单词所在位置 (int64)
+    en_values: Tuple[str, ...]  # 对应的英文单词
+
+
+PhonemeSeq = Union[Sequence[Tuple], PhonemeCodes]
+
+# 所有英文单词共用一个 id，两两代价 (LCS 相似度) 按需单独计算
+_EN_KEY = ('en', '')
+
+
+class _PhonemeCostTable:
+    """音素 id 表及其两两匹配代价矩阵
+
+    中文音素、数字、符号的取值有限，代价在 id 首次出现时与已有 id 逐一计算并写入
+    矩阵 (按容量翻倍扩展)；计算 DP 时按 id 花式索引即可得到整张代价矩阵。
     """
-    寻找最佳模糊匹配位置（基于 Phoneme 对象，限制只能从字边界开始）
 
-    Args:
-        main_seq: 主音素序列（长）
-        sub_seq: 子音素序列（短，热词）
+    def __init__(self, capacity: int = 128):
+        self._ids: Dict[Tuple[str, str], int] = {}
+        self._keys: List[Tuple[str, str]] = []
+        self._lock = threading.Lock()
+        # tuple_costs 对应 get_tuple_cost (声调差异 0.5)，phoneme_costs 对应 get_phoneme_cost
+        self.tuple_costs = np.ones((capacity, capacity), dtype=np.float64)
+        self.phoneme_costs = np.ones((capacity, capacity), dtype=np.float64)
+        self.id_of(_EN_KEY)
+
+    @staticmethod
+    def _costs(k1: Tuple[str, str], k2: Tuple[str, str]) -> Tuple[float, float]:
+        lang1, v1 = k1
+        lang2, v2 = k2
+        if k1 == _EN_KEY or k2 == _EN_KEY:
+            return 1.0, 1.0
+        t1 = (v1, lang1, False, False, v1.isdigit())
+        t2 = (v2, lang2, False, False, v2.isdigit())
+        return (
+            get_tuple_cost(t1, t2),
+            get_phoneme_cost(Phoneme(v1, lang1), Phoneme(v2, lang2)),
+        )
+
+    def id_of(self, key: Tuple[str, str]) -> int:
+        idx = self._ids.get(key)
+        if idx is not None:
+            return idx
+        with self._lock:
+            idx = self._ids.get(key)
+            if idx is not None:
+                return idx
+            idx = len(self._keys)
+            if idx >= len(self.tuple_costs):
+                self._grow(2 * len(self.tuple_costs))
+            for other, k in enumerate(self._keys):
+                tc, pc = self._costs(key, k)
+                self.tuple_costs[idx, other] = self.tuple_costs[other, idx] = tc
+                self.phoneme_costs[idx, other] = self.phoneme_costs[other, idx] = pc
+            self.tuple_costs[idx, idx] = 0.0
+            self.phoneme_costs[idx, idx] = 0.0
+            self._keys.append(key)
+            self._ids[key] = idx
+            return idx
+
+    def _grow(self, capacity: int):
+        for name in ('tuple_costs', 'phoneme_costs'):
+            old = getattr(self, name)
+            new = np.ones((capacity, capacity), dtype=np.float64)
+            new[:len(old), :len(old)] = old
+            # 整体替换引用，正在读取旧矩阵的线程不受影响
+            setattr(self, name, new)
+
+
+_COST_TABLE = _PhonemeCostTable()
+
+
+@lru_cache(maxsize=65536)
+def _en_cost(v1: str, v2: str) -> float:
+    """英文单词匹配代价 (字符级 LCS 相似度)"""
+    if v1 == v2:
+        return 0.0
+    max_len = max(len(v1), len(v2))
+    return 1.0 - (lcs_length(v1, v2) / max_len) if max_len > 0 else 1.0
 
-    Returns:
-        (score, start_index, end_index)
-        score: 相似度 0-1
-        start_index: 匹配在 main_seq 中的起始索引 (inclusive)
-        end_index: 匹配在 main_seq 中的结束索引 (exclusive)
+
+def encode_phonemes(seq: Sequence[Union[Tuple, Phoneme]]) -> PhonemeCodes:
+    """将音素序列 (info 元组或 Phoneme) 编码为 PhonemeCodes
+
+    词边界直接存为布尔掩码，内核中 O(1) 判断；逐项先收集到列表，
+    最后一次性转换为数组，避免逐元素写 NumPy 数组的开销。
     """
-    n = len(sub_seq)
-    m = len(main_seq)
-    if n == 0 or m == 0:
-        return 0.0, 0, 0
+    ids = []
+    word_start = []
+    word_end = []
+    en_index = []
+    en_values = []
+    id_of = _COST_TABLE.id_of
+    en_id = id_of(_EN_KEY)
+    for i, item in enumerate(seq):
+        if isinstance(item, Phoneme):
+            item = item.info
+        value, lang = item[0], item[1]
+        word_start.append(item[2])
+        word_end.append(item[3])
+        if lang == 'en':
+            ids.append(en_id)
+            en_index.append(i)
+            en_values.append(value)
+        else:
+            ids.append(id_of((lang, value)))
+    return PhonemeCodes(
+        np.array(ids, dtype=np.int64),
+        np.array(word_start, dtype=np.bool_),
+        np.array(word_end, dtype=np.bool_),
+        np.array(en_index, dtype=np.int64), tuple(en_values),
+    )
+
+
+def _as_codes(seq: PhonemeSeq) -> PhonemeCodes:
+    return seq if isinstance(seq, PhonemeCodes) else encode_phonemes(seq)
+
+
+def _concat_codes(seqs: Sequence[PhonemeCodes]) -> Tuple[PhonemeCodes, np.ndarray]:
+    """首尾拼接多个编码序列，返回 (拼接结果, 各序列起始行偏移)"""
+    lengths = [len(c.ids) for c in seqs]
+    offsets = np.zeros(len(seqs) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    en_index = [c.en_index + off for c, off in zip(seqs, offsets[:-1]) if len(c.en_index)]
+    en_values = tuple(v for c in seqs for v in c.en_values)
+    empty_i = np.empty(0, dtype=np.int64)
+    empty_b = np.empty(0, dtype=np.bool_)
+    codes = PhonemeCodes(
+        np.concatenate([c.ids for c in seqs]) if seqs else empty_i,
+        np.concatenate([c.word_start for c in seqs]) if seqs else empty_b,
+        np.concatenate([c.word_end for c in seqs]) if seqs else empty_b,
+        np.concatenate(en_index) if en_index else empty_i,
+        en_values,
+    )
+    return codes, offsets
+
+
+def _cost_matrix(a: PhonemeCodes, b: PhonemeCodes, tone_similar: bool = True) -> np.ndarray:
+    """a × b 的匹配代价矩阵
+
+    tone_similar=True 对应 get_tuple_cost，False 对应 get_phoneme_cost。
+    """
+    table = _COST_TABLE.tuple_costs if tone_similar else _COST_TABLE.phoneme_costs
+    cost = table[np.ix_(a.ids, b.ids)]
+    if len(a.en_index) and len(b.en_index):
+        cost[np.ix_(a.en_index, b.en_index)] = [
+            [_en_cost(v1, v2) for v2 in b.en_values] for v1 in a.en_values
+        ]
+    return cost
 
-    # 预计算字边界：只允许从这些位置开始匹配
-    valid_starts = [j for j in range(m) if main_seq[j].is_word_start]
 
-    # DP 矩阵: rows=n+1, cols=m+1
-    dp = [[0.0] * (m + 1) for _ in range(n + 1)]
+# ---------------------------------------------------------------------------
+# JIT 内核
+# ---------------------------------------------------------------------------
+
+@njit(cache=True)
+def _substring_distance_kernel(cost, max_dist):
+    """子序列 (行) 在主序列 (列) 任意位置的最小编辑距离，滚动数组
+
+    每行的最小值随行号单调不减，某行最小值已超过 max_dist 时提前返回 inf。
+    返回 (最小距离, 匹配结束列)；末行最小值在循环中顺带求出，无需再扫描一遍。
+    """
+    n, m = cost.shape
+    prev = np.zeros(m + 1)
+    curr = np.zeros(m + 1)
+    row_min = 0.0
+    row_arg = 0
+    for i in range(1, n + 1):
+        curr[0] = float(i)
+        row_min = curr[0]
+        row_arg = 0
+        for j in range(1, m + 1):
+            v = prev[j] + 1.0
+            ins = curr[j - 1] + 1.0
+            if ins < v:
+                v = ins
+            sub = prev[j - 1] + cost[i - 1, j - 1]
+            if sub < v:
+                v = sub
+            curr[j] = v
+            if v < row_min:
+                row_min = v
+                row_arg = j
+        if row_min > max_dist:
+            return np.inf, -1
+        prev, curr = curr, prev
+    return row_min, row_arg
+
+
+@njit(cache=True)
+def _constrained_kernel(cost, word_start, word_end, threshold):
+    """边界约束 DP
+
+    只保留末行距离与各单元格对应的匹配起点 (两行滚动，起点用 int32 减少
+    每个单元格的写入量)，最后在内核中按词结束边界、距离上限与阈值筛选，
+    返回 (scores, starts, ends)。
+    """
+    n, m = cost.shape
+    prev = np.full(m + 1, np.inf)
+    curr = np.full(m + 1, np.inf)
+    prev_start = np.zeros(m + 1, dtype=np.int32)
+    curr_start = np.zeros(m + 1, dtype=np.int32)
+
+    # 第一行：允许从任何词起始边界开始匹配
+    prev[0] = 0.0
+    for j in range(1, m):
+        if word_start[j]:
+            prev[j] = 0.0
+            prev_start[j] = j
+
+    for i in range(1, n + 1):
+        curr[0] = np.inf
+        curr_start[0] = 0
+        for j in range(1, m + 1):
+            dist_match = prev[j - 1] + cost[i - 1, j - 1]
+            dist_del = prev[j] + 1.0
+            dist_ins = curr[j - 1] + 1.0
+
+            min_dist = dist_match
+            if dist_del < min_dist:
+                min_dist = dist_del
+            if dist_ins < min_dist:
+                min_dist = dist_ins
+            curr[j] = min_dist
+
+            if min_dist == dist_match:
+                curr_start[j] = prev_start[j - 1]
+            elif min_dist == dist_del:
+                curr_start[j] = prev_start[j]
+            else:
+                curr_start[j] = curr_start[j - 1]
+        prev, curr = curr, prev
+        prev_start, curr_start = curr_start, prev_start
+
+    scores = np.empty(m)
+    starts = np.empty(m, dtype=np.int64)
+    ends = np.empty(m, dtype=np.int64)
+    count = 0
+    max_dist = n * 0.8
+    for j in range(1, m + 1):
+        # 约束：终点必须是词边界
+        if not word_end[j - 1]:
+            continue
+        dist = prev[j]
+        if dist >= max_dist:  # 距离太大，强制过滤
+            continue
+        score = 1.0 - (dist / n)
+        if score >= threshold:
+            scores[count] = score
+            starts[count] = prev_start[j]
+            ends[count] = j
+            count += 1
+    return scores[:count], starts[:count], ends[:count]
 
-    # 初始化第一行 (Start Constraints)
-    for j in range(m + 1):
-        dp[0][j] = 0.0 if j in valid_starts else float('inf')
 
-    # 初始化第一列
+@njit(cache=True)
+def _best_match_kernel(cost, word_start):
+    """带起点约束的模糊匹配 DP + 回溯，返回 (最小距离, 起始, 结束)"""
+    n, m = cost.shape
+    dp = np.empty((n + 1, m + 1))
+
+    # 第一行：只允许从字边界开始
+    for j in range(m + 1):
+        dp[0, j] = 0.0 if (j < m and word_start[j]) else np.inf
     for i in range(1, n + 1):
-        dp[i][0] = dp[i-1][0] + 1.0
+        dp[i, 0] = dp[i - 1, 0] + 1.0
 
-    # 填充 DP 矩阵
     for i in range(1, n + 1):
         for j in range(1, m + 1):
-            cost = get_phoneme_cost(sub_seq[i-1], main_seq[j-1])
-            dp[i][j] = min(
-                dp[i-1][j] + 1.0,     # Deletion
-                dp[i][j-1] + 1.0,     # Insertion
-                dp[i-1][j-1] + cost   # Match/Mismatch/Similar
-            )
-
-    # 找到最后一行最小值的位置，且起始位置必须在字边界
-    min_dist = float('inf')
+            v = dp[i - 1, j] + 1.0
+            ins = dp[i, j - 1] + 1.0
+            if ins < v:
+                v = ins
+            sub = dp[i - 1, j - 1] + cost[i - 1, j - 1]
+            if sub < v:
+                v = sub
+            dp[i, j] = v
+
+    min_dist = np.inf
     end_pos = 0
     best_start = 0
-
     for j in range(1, m + 1):
-        if dp[n][j] < min_dist:
+        if dp[n, j] < min_dist:
             # 回溯找到起始位置
-            curr_i, curr_j = n, j
-            while curr_i > 0:
-                cost = get_phoneme_cost(sub_seq[curr_i-1], main_seq[curr_j-1])
-
-                if curr_j > 0 and abs(dp[curr_i][curr_j] - (dp[curr_i-1][curr_j-1] + cost)) < 1e-9:
-                    curr_i -= 1
-                    curr_j -= 1
-                elif abs(dp[curr_i][curr_j] - (dp[curr_i-1][curr_j] + 1.0)) < 1e-9:
-                    curr_i -= 1
-                elif curr_j > 0 and abs(dp[curr_i][curr_j] - (dp[curr_i][curr_j-1] + 1.0)) < 1e-9:
-                    curr_j -= 1
+            ci, cj = n, j
+            while ci > 0:
+                if cj > 0 and abs(dp[ci, cj] - (dp[ci - 1, cj - 1] + cost[ci - 1, cj - 1])) < 1e-9:
+                    ci -= 1
+                    cj -= 1
+                elif abs(dp[ci, cj] - (dp[ci - 1, cj] + 1.0)) < 1e-9:
+                    ci -= 1
+                elif cj > 0 and abs(dp[ci, cj] - (dp[ci, cj - 1] + 1.0)) < 1e-9:
+                    cj -= 1
                 else:
-                    curr_i -= 1
+                    ci -= 1
 
             # 检查起始位置是否在字边界
-            if curr_j in valid_starts:
-                min_dist = dp[n][j]
+            if cj < m and word_start[cj]:
+                min_dist = dp[n, j]
                 end_pos = j
-                best_start = curr_j
+                best_start = cj
+
+    return min_dist, best_start, end_pos
+
+
+@njit(cache=True)
+def _constrained_batch_kernel(cost, offsets, word_start, word_end, threshold):
+    """对按行拼接的多个热词逐一执行边界约束 DP，结果附带所属热词下标"""
+    m = cost.shape[1]
+    k = len(offsets) - 1
+    scores = np.empty(k * m)
+    starts = np.empty(k * m, dtype=np.int64)
+    ends = np.empty(k * m, dtype=np.int64)
+    owners = np.empty(k * m, dtype=np.int64)
+    count = 0
+    for h in range(k):
+        if offsets[h + 1] == offsets[h]:
+            continue
+        s, st, e = _constrained_kernel(
+            cost[offsets[h]:offsets[h + 1]], word_start, word_end, threshold
+        )
+        c = len(s)
+        scores[count:count + c] = s
+        starts[count:count + c] = st
+        ends[count:count + c] = e
+        owners[count:count + c] = h
+        count += c
+    return scores[:count], starts[:count], ends[:count], owners[:count]
+
+
+# ---------------------------------------------------------------------------
+# 对外接口
+# ---------------------------------------------------------------------------
+
+def find_best_match(
+    main_seq: Union[List[Phoneme], PhonemeCodes],
+    sub_seq: Union[List[Phoneme], PhonemeCodes],
+) -> Tuple[float, int, int]:
+    """
+    寻找最佳模糊匹配位置（基于 Phoneme 对象，限制只能从字边界开始）
+
+    Args:
+        main_seq: 主音素序列（长），可为 encode_phonemes 预编码结果
+        sub_seq: 子音素序列（短，热词），可为预编码结果
+
+    Returns:
+        (score, start_index, end_index)
+        score: 相似度 0-1
+        start_index: 匹配在 main_seq 中的起始索引 (inclusive)
+        end_index: 匹配在 main_seq 中的结束索引 (exclusive)
+    """
+    main_codes = _as_codes(main_seq)
+    sub_codes = _as_codes(sub_seq)
+    n = len(sub_codes.ids)
+    m = len(main_codes.ids)
+    if n == 0 or m == 0:
+        return 0.0, 0, 0
+
+    cost = _cost_matrix(sub_codes, main_codes, tone_similar=False)
+    min_dist, best_start, end_pos = _best_match_kernel(cost, main_codes.word_start)
 
     # 计算分数
-    score = 1.0 - (min_dist / n) if n > 0 else 0.0
-    return max(0.0, score), best_start, end_pos
+    score = 1.0 - (min_dist / n)
+    return max(0.0, score), int(best_start), int(end_pos)
 
 
-def fuzzy_substring_distance(hw_info: List[Tuple], input_info: List[Tuple]) -> float:
+def fuzzy_substring_distance(
+    hw_info: PhonemeSeq,
+    input_info: PhonemeSeq,
+    max_dist: float = float('inf'),
+) -> float:
     """
     计算子序列在主序列中的最小编辑距离（允许子序列匹配主序列的任意部分）
-    使用滚动数组优化的动态规划实现
 
     参数:
-        hw_info: 热词音素序列（info 元组列表）
-        input_info: 输入音素序列（info 元组列表）
+        hw_info: 热词音素序列（info 元组列表或 PhonemeCodes）
+        input_info: 输入音素序列（info 元组列表或 PhonemeCodes）
+        max_dist: 距离上限，确定超过时提前终止并返回 inf
+                  (按阈值筛选时可传 n * (1 - threshold) + 1)
     """
-    n = len(hw_info)
-    m = len(input_info)
+    hw_codes = _as_codes(hw_info)
+    input_codes = _as_codes(input_info)
+    n = len(hw_codes.ids)
+    m = len(input_codes.ids)
     if n == 0:
         return 0.0
     if m == 0:
         return float(n)
 
-    prev = [0.0] * (m + 1)
-    curr = [0.0] * (m + 1)
-
-    for i in range(1, n + 1):
-        curr[0] = float(i)
-        for j in range(1, m + 1):
-            cost = get_tuple_cost(hw_info[i-1], input_info[j-1])
-            curr[j] = min(
-                prev[j] + 1.0,
-                curr[j-1] + 1.0,
-                prev[j-1] + cost
-            )
-        prev, curr = curr, prev
-
-    return min(prev)
+    cost = _cost_matrix(hw_codes, input_codes)
+    distance, _ = _substring_distance_kernel(cost, float(max_dist))
+    return float(distance)
 
 
-def fuzzy_substring_score(hw_info: List[Tuple], input_info: List[Tuple]) -> float:
+def fuzzy_substring_score(hw_info: PhonemeSeq, input_info: PhonemeSeq) -> float:
     """
     计算子序列在主序列中的相似度分数（0-1之间）
     """
-    n = len(hw_info)
+    hw_codes = _as_codes(hw_info)
+    n = len(hw_codes.ids)
     if n == 0:
         return 0.0
-    distance = fuzzy_substring_distance(hw_info, input_info)
+    distance = fuzzy_substring_distance(hw_codes, input_info)
     score = 1.0 - (distance / n)
     return max(0.0, min(1.0, score))
 
 
 def fuzzy_substring_search_constrained(
-    hw_info: List[Tuple],
-    input_info: List[Tuple],
+    hw_info: PhonemeSeq,
+    input_info: PhonemeSeq,
     threshold: float = 0.6
 ) -> List[Tuple[float, int, int]]:
     """
@@ -247,74 +551,60 @@ def fuzzy_substring_search_constrained(
 
     参数:
         hw_info: 热词音素 info 元组列表 (value, lang, is_word_start, is_word_end, is_tone, char_start, char_end)
-        input_info: 输入文本音素 info 元组列表
+                 或 encode_phonemes 预编码结果
+        input_info: 输入文本音素 info 元组列表或预编码结果
         threshold: 相似度阈值
 
     返回:
         List[(score, start_idx, end_idx)] - 匹配结果列表（按分数降序）
     """
-    n = len(hw_info)
-    m = len(input_info)
+    hw_codes = _as_codes(hw_info)
+    input_codes = _as_codes(input_info)
+    n = len(hw_codes.ids)
+    m = len(input_codes.ids)
     if n == 0 or m == 0:
         return []
 
-    # DP 矩阵: [n+1][m+1]
-    dp = [[float('inf')] * (m + 1) for _ in range(n + 1)]
-    path = [[(0, 0)] * (m + 1) for _ in range(n + 1)]
+    cost = _cost_matrix(hw_codes, input_codes)
+    scores, starts, ends = _constrained_kernel(
+        cost, input_codes.word_start, input_codes.word_end, float(threshold)
+    )
 
-    # 初始化第一行：允许从任何词起始边界开始匹配
-    for j in range(m + 1):
-        if j == 0:
-            dp[0][j] = 0.0
-            path[0][j] = (0, j)
-        elif j < m and input_info[j][2]:  # is_word_start
-            dp[0][j] = 0.0
-            path[0][j] = (0, j)
-
-    # 填充 DP
-    for i in range(1, n + 1):
-        for j in range(1, m + 1):
-            cost = get_tuple_cost(hw_info[i-1], input_info[j-1])
-
-            dist_match = dp[i-1][j-1] + cost
-            dist_del = dp[i-1][j] + 1.0
-            dist_ins = dp[i][j-1] + 1.0
-
-            min_dist = min(dist_match, dist_del, dist_ins)
-            dp[i][j] = min_dist
-
-            if min_dist == dist_match:
-                path[i][j] = path[i-1][j-1]
-            elif min_dist == dist_del:
-                path[i][j] = path[i-1][j]
-            else:
-                path[i][j] = path[i][j-1]
-
-    # 收集结果
-    results = []
-
-    for j in range(1, m + 1):
-        # 约束：终点必须是词边界
-        if not input_info[j-1][3]:  # is_word_end
-            continue
-
-        dist = dp[n][j]
-        if dist >= n * 0.8:  # 距离太大，强制过滤
-            continue
+    # 每个终点至多一条结果，按得分降序 (同分保持终点顺序)
+    results = list(zip(scores.tolist(), starts.tolist(), ends.tolist()))
+    results.sort(key=lambda x: x[0], reverse=True)
+    return results
 
-        score = 1.0 - (dist / n)
-        if score >= threshold:
-            start_idx = path[n][j][1]
-            end_idx = j
-            results.append((score, start_idx, end_idx))
 
-    # 按得分降序
-    results.sort(key=lambda x: x[0], reverse=True)
+def fuzzy_substring_search_constrained_many(
+    hw_infos: Sequence[PhonemeSeq],
+    input_info: PhonemeSeq,
+    threshold: float = 0.6
+) -> List[List[Tuple[float, int, int]]]:
+    """
+    对多个热词批量执行 fuzzy_substring_search_constrained
 
-    # 区间排重
-    used_ends = {}
-    for score, s, e in results:
-        if e not in used_ends or score > used_ends[e][0]:
-            used_ends[e] = (score, s, e)
+    所有热词共用一张代价矩阵 (一次花式索引) 和一次内核调用，
+    省去逐个热词的 Python 调度开销。
 
-    return sorted(used_ends.values(), key=lambda x: x[0], reverse=True)
+    返回:
+        与 hw_infos 一一对应的结果列表
+    """
+    input_codes = _as_codes(input_info)
+    if not hw_infos:
+        return []
+    if len(input_codes.ids) == 0:
+        return [[] for _ in hw_infos]
+
+    stacked, offsets = _concat_codes([_as_codes(hw) for hw in hw_infos])
+    cost = _cost_matrix(stacked, input_codes)
+    scores, starts, ends, owners = _constrained_batch_kernel(
+        cost, offsets, input_codes.word_start, input_codes.word_end, float(threshold)
+    )
+
+    results: List[List[Tuple[float, int, int]]] = [[] for _ in hw_infos]
+    for score, start, end, owner in zip(scores.tolist(), starts.tolist(), ends.tolist(), owners.tolist()):
+        results[owner].append((score, start, end))
+    for found in results:
+        found.sort(key=lambda x: x[0], reverse=True)
+    return results
@@ -10,13 +10,18 @@
 import os
 import logging
 import threading
+from collections import OrderedDict
 from typing import List, Dict, Tuple, NamedTuple, Optional
 
 import numpy as np
 
-from src.core.hotword.phoneme import Phoneme, get_phoneme_info, SIMILAR_PHONEMES
+from src.core.hotword.phoneme import Phoneme, get_phoneme_info
 from src.core.hotword.rag import FastRAG
-from src.core.hotword.algo_calc import fuzzy_substring_search_constrained
+from src.core.hotword.algo_calc import (
+    PhonemeCodes,
+    encode_phonemes,
+    fuzzy_substring_search_constrained_many,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -80,10 +85,16 @@ class PhonemeCorrector:
         self.threshold = threshold
         self.similar_threshold = similar_threshold if similar_threshold is not None else (threshold - 0.2)
         self.hotwords: Dict[str, List[Phoneme]] = {}
+        # 热词音素的预编码结果 (精确匹配阶段的 JIT 内核输入)
+        self._hotword_codes: Dict[str, PhonemeCodes] = {}
         self.fast_rag = FastRAG(threshold=min(self.threshold, self.similar_threshold) - 0.1)
         self._lock = threading.Lock()
-        self._cache: Dict[str, CorrectionResult] = {}
+        # LRU 结果缓存: (文本, 热词版本) -> 未截断的纠错结果
+        self._cache: "OrderedDict[Tuple[str, int], CorrectionResult]" = OrderedDict()
+        self._cache_lock = threading.Lock()
         self._cache_size = cache_size
+        # 每次更新热词递增，进行中的旧版本结果不会写入缓存
+        self._hotwords_version = 0
 
         # 字形联合纠错
         self.use_shape_rerank = use_shape_rerank
@@ -219,11 +230,16 @@ class PhonemeCorrector:
             if phs:
                 new_hotwords[hw] = phs
 
+        new_codes = {hw: encode_phonemes(phs) for hw, phs in new_hotwords.items()}
+
         with self._lock:
             self.hotwords = new_hotwords
+            self._hotword_codes = new_codes
             self.fast_rag = FastRAG(threshold=min(self.threshold, self.similar_threshold) - 0.1)
             self.fast_rag.add_hotwords(new_hotwords)
-            self._cache.clear()  # 热词变化时清空缓存
+            self._hotwords_version += 1
+            with self._cache_lock:
+                self._cache.clear()  # 热词变化时清空缓存
 
             # 重建 FAISS 索引
             if self.use_faiss and self._faiss_available:
@@ -252,15 +268,21 @@ class PhonemeCorrector:
         if not text or not self.hotwords:
             return CorrectionResult(text or "", [], [])
 
-        # 缓存检查
-        if text in self._cache:
-            return self._cache[text]
+        # 缓存检查 (流式场景下同一文本会被反复纠错)
+        key = (text, self._hotwords_version)
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+        if cached is not None:
+            return cached._replace(similars=cached.similars[:top_k])
 
         input_phs = get_phoneme_info(text)
         if not input_phs:
             return CorrectionResult(text, [], [])
 
         with self._lock:
+            version = self._hotwords_version
             # 阶段1: 粗筛
             if self.use_faiss and self._faiss_available and self._faiss_index is not None:
                 # 使用 FAISS 向量检索
@@ -281,28 +303,32 @@ class PhonemeCorrector:
 
             # 阶段2: 精确匹配 (带边界约束)
             input_processed = [p.info for p in input_phs]
-            matches, similars = self._find_matches(text, fast_results, input_processed)
+            matches, similars = self._find_matches(
+                text, fast_results, input_processed, encode_phonemes(input_processed)
+            )
 
         # 阶段3: 冲突解决与替换
         new_text, final_matches = self._resolve_and_replace(text, matches)
 
-        result = CorrectionResult(
-            new_text,
-            final_matches,
-            similars[:top_k]
-        )
+        result = CorrectionResult(new_text, final_matches, similars)
 
-        # 写入缓存
-        if len(self._cache) < self._cache_size:
-            self._cache[text] = result
+        # 写入缓存 (超出容量时淘汰最久未用的条目)
+        if self._cache_size > 0:
+            with self._cache_lock:
+                if version == self._hotwords_version:
+                    self._cache[(text, version)] = result
+                    self._cache.move_to_end((text, version))
+                    if len(self._cache) > self._cache_size:
+                        self._cache.popitem(last=False)
 
-        return result
+        return result._replace(similars=similars[:top_k])
 
     def _find_matches(
         self,
         text: str,
         fast_results: List[Tuple[str, float]],
-        input_processed: List[Tuple]
+        input_processed: List[Tuple],
+        input_codes: Optional[PhonemeCodes] = None,
     ) -> Tuple[List[MatchResult], List[Tuple[str, str, float]]]:
         """
         精细匹配逻辑：边界约束的模糊搜索
@@ -311,6 +337,7 @@ class PhonemeCorrector:
             text: 原始文本
             fast_results: FastRAG 粗筛结果 [(热词, 分数), ...]
             input_processed: 输入音素 info 元组列表
+            input_codes: input_processed 的预编码结果 (None 时自动编码)
 
         Returns:
             (matches, similars)
@@ -318,16 +345,21 @@ class PhonemeCorrector:
         matches = []
         similars = []
         search_threshold = min(self.threshold, self.similar_threshold) - 0.1
+        if input_codes is None:
+            input_codes = encode_phonemes(input_processed)
+
+        candidates = [hw for hw, _ in fast_results]
+        hw_codes = []
+        for hw in candidates:
+            codes = self._hotword_codes.get(hw)
+            hw_codes.append(codes if codes is not None else encode_phonemes(self.hotwords[hw]))
+
+        # 所有候选热词一次性执行边界约束搜索
+        all_segments = fuzzy_substring_search_constrained_many(
+            hw_codes, input_codes, threshold=search_threshold
+        )
 
-        for hw, fast_score in fast_results:
-            hw_phonemes = self.hotwords[hw]
-            hw_compare = [p.info for p in hw_phonemes]
-
-            # 使用边界约束搜索
-            found_segments = fuzzy_substring_search_constrained(
-                hw_compare, input_processed, threshold=search_threshold
-            )
-
+        for hw, found_segments in zip(candidates, all_segments):
             for score, start_phon_idx, end_phon_idx in found_segments:
                 # 从 input_processed 获取字符位置
                 char_start = input_processed[start_phon_idx][5]
@@ -399,16 +431,20 @@ class PhonemeCorrector:
                     final_matches.append(m)
                 occupied_ranges.append((m.start, m.end))
 
-        # 执行替换 (从后向前，避免索引偏移)
-        final_matches.sort(key=lambda x: x.start, reverse=True)
-        result_list = list(text)
+        # 执行替换: 按起点顺序单遍拼接 (区间互不重叠)
+        final_matches.sort(key=lambda x: x.start)
+        parts = []
+        cursor = 0
         for m in final_matches:
-            result_list[m.start:m.end] = list(m.hotword)
+            parts.append(text[cursor:m.start])
+            parts.append(m.hotword)
+            cursor = m.end
+        parts.append(text[cursor:])
 
         # 构建返回结果
         result_info = [
             (m.original, m.hotword, round(m.score, 3))
-            for m in sorted(final_matches, key=lambda x: x.start)
+            for m in final_matches
         ]
 
-        return "".join(result_list), result_info
+        return "".join(parts), result_info
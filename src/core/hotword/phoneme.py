@@ -1,29 +1,34 @@
 """音素处理模块 - 基于 CapsWriter-Offline"""
 import re
-from dataclasses import dataclass
-from typing import List, Literal, Tuple
+from dataclasses import dataclass, field
+from typing import Dict, List, Literal, Tuple
 
 from pypinyin import pinyin, Style
 
 
 @dataclass(frozen=True, slots=True)
 class Phoneme:
-    """音素数据类"""
+    """音素数据类 (不可变)
+
+    is_tone 与 info 元组在构造时计算一次并存储，匹配阶段反复读取无需重建。
+    """
     value: str
     lang: Literal['zh', 'en', 'num', 'other']
     is_word_start: bool = False
     is_word_end: bool = False
     char_start: int = 0
     char_end: int = 0
+    is_tone: bool = field(init=False, repr=False, compare=False)
+    info: Tuple = field(init=False, repr=False, compare=False)
 
-    @property
-    def is_tone(self) -> bool:
-        return self.value.isdigit()
+    def __post_init__(self):
+        is_tone = self.value.isdigit()
+        object.__setattr__(self, 'is_tone', is_tone)
+        object.__setattr__(self, 'info', (self.value, self.lang, self.is_word_start,
+                                          self.is_word_end, is_tone, self.char_start, self.char_end))
 
-    @property
-    def info(self) -> Tuple:
-        return (self.value, self.lang, self.is_word_start,
-                self.is_word_end, self.is_tone, self.char_start, self.char_end)
+    def __hash__(self) -> int:
+        return hash(self.info)
 
 
 # 相似音素集合 (用于模糊匹配) - 基于 CapsWriter-Offline
@@ -43,6 +48,11 @@ SIMILAR_PHONEMES = [
     {'p', 'b'}, {'t', 'd'}, {'k', 'g'},
 ]
 
+# 相似音素对 (双向) -> 匹配代价，单次哈希查询代替逐组扫描
+SIMILAR_LOOKUP: Dict[Tuple[str, str], float] = {
+    (a, b): 0.5 for s in SIMILAR_PHONEMES for a in s for b in s if a != b
+}
+
 
 def get_phoneme_info(text: str, split_char: bool = True) -> List[Phoneme]:
     """提取文本的音素序列"""
@@ -7,8 +7,11 @@ from numba import njit
 from src.core.hotword.phoneme import Phoneme
 
 @njit(cache=True)
-def _fuzzy_substring_numba(main, sub):
-    """Numba 加速的模糊子串距离计算"""
+def _fuzzy_substring_numba(main, sub, max_dist=np.inf):
+    """Numba 加速的模糊子串距离计算
+
+    每行最小值单调不减，超过 max_dist 时提前返回 inf。
+    """
     n, m = len(sub), len(main)
     if n == 0 or m == 0:
         return float(n)
@@ -18,67 +21,111 @@ def _fuzzy_substring_numba(main, sub):
         dp[i, 0] = float(i)
 
     for i in range(1, n+1):
+        row_min = dp[i, 0]
         for j in range(1, m+1):
             cost = 0.0 if sub[i-1] == main[j-1] else 1.0
             dp[i, j] = min(dp[i-1, j] + 1.0,
                           dp[i, j-1] + 1.0,
                           dp[i-1, j-1] + cost)
+            if dp[i, j] < row_min:
+                row_min = dp[i, j]
+        if row_min > max_dist:
+            return np.inf
 
     return np.min(dp[n, 1:])
 
 
+@njit(cache=True)
+def _batch_fuzzy_numba(main, buf, offsets, max_dists):
+    """一次调用计算多个候选 (buf[offsets[k]:offsets[k+1]]) 的模糊子串距离
+
+    每个候选只有微秒级计算量，串行循环即可；并行区域会引入线程层的
+    退出挂起与并发调用问题。
+    """
+    count = len(offsets) - 1
+    out = np.empty(count)
+    for k in range(count):
+        out[k] = _fuzzy_substring_numba(main, buf[offsets[k]:offsets[k+1]], max_dists[k])
+    return out
+
+
 class FastRAG:
     """快速 RAG 热词检索"""
 
     def __init__(self, threshold: float = 0.6):
         self.threshold = threshold
         self.ph_to_id: Dict[str, int] = {}
-        self.index: Dict[int, List[Tuple[str, any]]] = defaultdict(list)
+        # 倒排索引只存热词 id (int32 数组)，名称与编码按 id 各存一份
+        self.index: Dict[int, np.ndarray] = {}
+        self.hw_names: List[str] = []
+        self.hw_codes: List[np.ndarray] = []
+        self.hw_lens = np.empty(0, dtype=np.int64)
         self.hotword_count = 0
 
     def _encode(self, phs: List[Phoneme]):
         """将音素序列编码为整数序列"""
-        ids = []
-        for p in phs:
-            if p.value not in self.ph_to_id:
-                self.ph_to_id[p.value] = len(self.ph_to_id) + 1
-            ids.append(self.ph_to_id[p.value])
-        return np.array(ids, dtype=np.int32)
+        ph_to_id = self.ph_to_id
+        vals = [p.value for p in phs]
+        # 先一次性登记新音素，再批量查表
+        for v in dict.fromkeys(vals):
+            if v not in ph_to_id:
+                ph_to_id[v] = len(ph_to_id) + 1
+        return np.fromiter(map(ph_to_id.__getitem__, vals), dtype=np.int32, count=len(vals))
 
 
     def add_hotwords(self, hotwords: Dict[str, List[Phoneme]]):
         """添加热词到索引"""
+        buckets: Dict[int, List[int]] = defaultdict(list)
         for hw, phs in hotwords.items():
             if not phs:
                 continue
             codes = self._encode(phs)
+            hw_id = len(self.hw_names)
+            self.hw_names.append(hw)
+            self.hw_codes.append(codes)
             # 使用前两个音素建立倒排索引
             for i in range(min(len(codes), 2)):
-                self.index[codes[i]].append((hw, codes))
+                buckets[int(codes[i])].append(hw_id)
             self.hotword_count += 1
 
+        for code, ids in buckets.items():
+            new_ids = np.array(ids, dtype=np.int32)
+            old_ids = self.index.get(code)
+            self.index[code] = new_ids if old_ids is None else np.concatenate([old_ids, new_ids])
+        self.hw_lens = np.fromiter(map(len, self.hw_codes), dtype=np.int64, count=len(self.hw_codes))
+
     def search(self, input_phs: List[Phoneme], top_k: int = 10) -> List[Tuple[str, float]]:
         """搜索匹配的热词"""
         if not input_phs:
             return []
 
         input_codes = self._encode(input_phs)
-        unique = set(input_codes.tolist())
-        candidates = []
-        for c in unique:
-            candidates.extend(self.index.get(c, []))
+        index = self.index
+        buckets = [index[c] for c in set(input_codes.tolist()) if c in index]
+        if not buckets:
+            return []
 
-        seen = set()
-        results = []
+        # 桶合并去重 + 长度过滤均为向量化操作
+        hw_ids = np.unique(np.concatenate(buckets))
+        hw_ids = hw_ids[self.hw_lens[hw_ids] <= len(input_codes) + 3]
+        if not len(hw_ids):
+            return []
 
-        for hw, cands in candidates:
-            if hw in seen or len(cands) > len(input_codes) + 3:
-                continue
-            seen.add(hw)
-            dist = _fuzzy_substring_numba(input_codes, cands)
-            score = 1.0 - (dist / len(cands))
-            if score >= self.threshold:
-                results.append((hw, round(float(score), 3)))
+        # 候选编码拼接为连续缓冲区，一次串行内核调用完成全部打分
+        cand_codes = [self.hw_codes[i] for i in hw_ids]
+        lengths = self.hw_lens[hw_ids]
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        # 超过该距离的候选必然低于阈值，可提前终止
+        max_dists = lengths * (1.0 - self.threshold) + 1.0
+        dists = _batch_fuzzy_numba(input_codes, np.concatenate(cand_codes), offsets, max_dists)
+        scores = 1.0 - dists / lengths
+
+        results = [
+            (self.hw_names[hw_id], round(float(score), 3))
+            for hw_id, score in zip(hw_ids.tolist(), scores)
+            if score >= self.threshold
+        ]
 
         results.sort(key=lambda x: x[1], reverse=True)
         return results[:top_k]
@@ -11,7 +11,7 @@
 from typing import List, Tuple, Dict, Optional
 
 from src.core.hotword.phoneme import Phoneme, get_phoneme_info
-from src.core.hotword.algo_calc import find_best_match
+from src.core.hotword.algo_calc import encode_phonemes, find_best_match
 
 
 class AccuRAG:
@@ -73,6 +73,9 @@ class AccuRAG:
         # 确定检索范围
         search_targets = candidate_hws if candidate_hws else list(self.hotwords.keys())
 
+        # 输入只编码一次，所有候选热词共用
+        input_codes = encode_phonemes(input_phonemes)
+
         matches = []
         for hw in search_targets:
             if hw not in self.hotwords:
@@ -85,7 +88,7 @@ class AccuRAG:
                 continue
 
             # 使用 find_best_match 进行精确计算（含模糊音权重）
-            score, start_idx, end_idx = find_best_match(input_phonemes, hw_phonemes)
+            score, start_idx, end_idx = find_best_match(input_codes, hw_phonemes)
 
             # 根据参数决定是否应用阈值
             if not apply_threshold or score >= self.threshold:
@@ -11,14 +11,15 @@
     用 --- 分隔的多行内容，每段第一行是错误文本，第二行是正确文本。
     忽略以 # 开头的注释和空行。
 """
+import re
 import threading
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 from difflib import SequenceMatcher
 from dataclasses import dataclass
 
 from src.core.hotword.phoneme import Phoneme, get_phoneme_info
-from src.core.hotword.algo_calc import fuzzy_substring_distance
+from src.core.hotword.algo_calc import PhonemeCodes, encode_phonemes, fuzzy_substring_distance
 
 
 @dataclass
@@ -36,45 +37,76 @@ class RectifyRecord:
         self.wrong = wrong
         self.right = right
         self.fragments = fragments
-        # 预计算每个片段的音素序列
-        self.fragment_phonemes = {
-            f: get_phoneme_info(f) for f in fragments
-        }
+        # 只保留片段音素的预编码结果 (id 数组 + 词边界)，检索时直接复用
+        self.fragment_codes = {}
+        for f in fragments:
+            phs = get_phoneme_info(f)
+            if phs:
+                self.fragment_codes[f] = encode_phonemes(phs)
+
+    @property
+    def fragment_phonemes(self):
+        """每个片段的音素序列 (按需重新计算，仅用于调试)"""
+        return {f: get_phoneme_info(f) for f in self.fragments}
 
     def __repr__(self):
         return f"RectifyRecord('{self.wrong}' => '{self.right}', fragments={self.fragments})"
 
 
+# 单个汉字，或连续的字母数字 ([^\W_] 与 str.isalnum 等价)
+_WORD_RE = re.compile(r'[\u4e00-\u9fff]|[^\W_]+')
+# 驼峰分界: 小写字母后紧跟大写字母
+_CAMEL_RE = re.compile(r'(?<=[a-z])(?=[A-Z])')
+
+
+def _camel_breaks(word: str) -> List[int]:
+    """返回单词内部的驼峰切分位置"""
+    if word.isascii():
+        return [m.start() for m in _CAMEL_RE.finditer(word)]
+    return [k for k in range(1, len(word)) if word[k].isupper() and word[k - 1].islower()]
+
+
 def _get_word_boundaries(text: str) -> List[Tuple[int, int, str]]:
     """
     获取文本中所有单词的边界
     Returns: [(start, end, word), ...]
     """
     boundaries = []
-    i, n = 0, len(text)
-    while i < n:
-        if not (text[i].isalnum() or '\u4e00' <= text[i] <= '\u9fff'):
-            i += 1
+    for m in _WORD_RE.finditer(text):
+        start, end = m.span()
+        word = m.group()
+        cuts = _camel_breaks(word) if len(word) > 1 else None
+        if not cuts:
+            boundaries.append((start, end, word))
             continue
-        start = i
-        if '\u4e00' <= text[i] <= '\u9fff':
-            i += 1
-        elif text[i].isalnum():
-            last_was_lower = text[i].islower()
-            while i < n and text[i].isalnum():
-                if text[i].isupper() and last_was_lower and i > start:
-                    break
-                last_was_lower = text[i].islower()
-                i += 1
-        boundaries.append((start, i, text[start:i]))
+        prev = 0
+        for cut in cuts:
+            boundaries.append((start + prev, start + cut, word[prev:cut]))
+            prev = cut
+        boundaries.append((start + prev, end, word[prev:]))
     return boundaries
 
 
-def _expand_by_words(text: str, start: int, end: int, expand_count: int = 1) -> Tuple[int, int]:
-    """按单词数量向左右扩展片段"""
-    bounds = _get_word_boundaries(text)
-    start_idx = next((i for i, b in enumerate(bounds) if b[0] == start), None)
-    end_idx = next((i + 1 for i, b in enumerate(bounds) if b[1] == end), None)
+def _word_index(
+    bounds: List[Tuple[int, int, str]]
+) -> Tuple[List[Tuple[int, int, str]], Dict[int, int], Dict[int, int]]:
+    """为单词边界建立 起点->下标 与 终点->下标+1 的查找表"""
+    starts = {b[0]: i for i, b in enumerate(bounds)}
+    ends = {b[1]: i + 1 for i, b in enumerate(bounds)}
+    return bounds, starts, ends
+
+
+def _expand_by_words(
+    text: str,
+    start: int,
+    end: int,
+    expand_count: int = 1,
+    index: Optional[Tuple[List[Tuple[int, int, str]], Dict[int, int], Dict[int, int]]] = None,
+) -> Tuple[int, int]:
+    """按单词数量向左右扩展片段 (index 为 _word_index 的预计算结果)"""
+    bounds, starts, ends = index if index is not None else _word_index(_get_word_boundaries(text))
+    start_idx = starts.get(start)
+    end_idx = ends.get(end)
 
     if start_idx is None or end_idx is None:
         return start, end
@@ -97,10 +129,12 @@ def extract_diff_fragments(
     wrong_bounds = _get_word_boundaries(wrong)
     right_bounds = _get_word_boundaries(right)
 
+    # 关闭 autojunk，长句中的高频词不会被当作噪声跳过
     matcher = SequenceMatcher(
         None,
         [b[2] for b in wrong_bounds],
-        [b[2] for b in right_bounds]
+        [b[2] for b in right_bounds],
+        autojunk=False,
     )
     fragments: List[Fragment] = []
 
@@ -114,7 +148,8 @@ def extract_diff_fragments(
             if frag_text:
                 fragments.append(Fragment(frag_text, right, right_bounds[j1][0], right_bounds[j2-1][1]))
 
-    # 智能过滤和扩展
+    # 智能过滤和扩展 (每个句子的单词查找表只建一次)
+    indexes = {}
     result = []
     for frag in fragments:
         phonemes = get_phoneme_info(frag.text)
@@ -125,8 +160,12 @@ def extract_diff_fragments(
             result.append(frag.text)
         else:
             # 中文片段太短，扩展单词
+            index = indexes.get(frag.source_text)
+            if index is None:
+                bounds = wrong_bounds if frag.source_text == wrong else right_bounds
+                index = indexes[frag.source_text] = _word_index(bounds)
             exp_start, exp_end = _expand_by_words(
-                frag.source_text, frag.start, frag.end, expand_words
+                frag.source_text, frag.start, frag.end, expand_words, index
             )
             expanded = frag.source_text[exp_start:exp_end]
             result.append(expanded if expanded else frag.text)
@@ -147,6 +186,8 @@ class RectificationRAG:
         self.threshold = threshold
         self.records: List[RectifyRecord] = []
         self._lock = threading.Lock()
+        # 最近一次查询的 (文本, 音素, 编码)，重复查询同一文本时直接复用
+        self._last_input: Optional[Tuple[str, List[Phoneme], PhonemeCodes]] = None
 
     def load_history(self) -> int:
         """
@@ -189,24 +230,27 @@ class RectificationRAG:
     def _score_record(
         self,
         input_phonemes: List[Phoneme],
-        record: RectifyRecord
+        record: RectifyRecord,
+        input_codes: Optional[PhonemeCodes] = None,
     ) -> Tuple[float, List[dict]]:
         """计算单条记录与输入音素序列的匹配得分"""
+        if input_codes is None:
+            input_codes = encode_phonemes(input_phonemes)
+
         fragment_details = []
-        for fragment, frag_phonemes in record.fragment_phonemes.items():
-            if not frag_phonemes:
+        for fragment, frag_codes in record.fragment_codes.items():
+            n = len(frag_codes.ids)
+            # 距离超过该上限的片段不可能达到阈值，提前终止并跳过
+            max_dist = n * (1.0 - self.threshold) + 1.0
+            min_dist = fuzzy_substring_distance(frag_codes, input_codes, max_dist)
+            if min_dist == float('inf'):
                 continue
-
-            input_info = [p.info for p in input_phonemes]
-            frag_info = [p.info for p in frag_phonemes]
-
-            min_dist = fuzzy_substring_distance(frag_info, input_info)
-            score = 1.0 - (min_dist / len(frag_info))
+            score = 1.0 - (min_dist / n)
 
             fragment_details.append({
                 'fragment': fragment,
                 'score': round(score, 3),
-                'phonemes': len(frag_info)
+                'phonemes': n
             })
 
         if not fragment_details:
@@ -229,16 +273,23 @@ class RectificationRAG:
         if not text or not self.records:
             return []
 
-        input_phonemes = get_phoneme_info(text)
-        if not input_phonemes:
-            return []
+        last = self._last_input
+        if last is not None and last[0] == text:
+            _, input_phonemes, input_codes = last
+        else:
+            input_phonemes = get_phoneme_info(text)
+            if not input_phonemes:
+                return []
+            # 输入只编码一次，所有记录共用
+            input_codes = encode_phonemes(input_phonemes)
+            self._last_input = (text, input_phonemes, input_codes)
 
         with self._lock:
             records = self.records[:]
 
         matches = []
         for record in records:
-            best_score, _ = self._score_record(input_phonemes, record)
+            best_score, _ = self._score_record(input_phonemes, record, input_codes)
             if best_score >= self.threshold:
                 matches.append((record.wrong, record.right, round(best_score, 3)))
 
@@ -19,18 +19,334 @@ corrector.substitute('国内交流电50赫兹')      # 输出：国内交流电5
 """
 import re
 import os
+import threading
 from pathlib import Path
 from threading import Lock
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+# hyperscan (可选): 字面量规则组的多模式 SIMD 扫描
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    hyperscan = None
+    HYPERSCAN_AVAILABLE = False
+
+# 执行步骤: (正则对象, 替换文本或函数, 原始模式或 match -> 原始模式)
+# hyperscan 字面量组的替换为 None (使用其自带的替换表)
+_Step = Tuple[re.Pattern, Union[str, Callable, None], Union[str, Callable]]
+
+_REPEAT_OPS = tuple(
+    getattr(sre_parse, name)
+    for name in ('MAX_REPEAT', 'MIN_REPEAT', 'POSSESSIVE_REPEAT')
+    if hasattr(sre_parse, name)
+)
+# 字符集展开的区间上限，更宽的字符类视为无法分析
+_MAX_RANGE = 256
+
+
+def _literals_overlap(a: str, b: str) -> bool:
+    """两个字面量在文本中的出现位置是否可能重叠 (包含或首尾相接)"""
+    if a in b or b in a:
+        return True
+    for k in range(1, min(len(a), len(b))):
+        if a.endswith(b[:k]) or b.endswith(a[:k]):
+            return True
+    return False
+
+
+def _literal_replacement(compiled: re.Pattern, replacement: str, pattern: str) -> Optional[str]:
+    """纯字面量规则返回展开后的替换文本，否则返回 None"""
+    if re.escape(pattern) != pattern:
+        return None
+    try:
+        return compiled.sub(replacement, pattern)
+    except re.error:
+        return None
+
+
+def _collect_chars(items, chars: set) -> bool:
+    """收集解析树可能匹配的全部字符；含通配、类别、断言、反向引用等时返回 False"""
+    for op, av in items:
+        if op is sre_parse.LITERAL:
+            chars.add(chr(av))
+        elif op is sre_parse.IN:
+            for item_op, item_av in av:
+                if item_op is sre_parse.LITERAL:
+                    chars.add(chr(item_av))
+                elif item_op is sre_parse.RANGE and item_av[1] - item_av[0] < _MAX_RANGE:
+                    chars.update(map(chr, range(item_av[0], item_av[1] + 1)))
+                else:
+                    return False
+        elif op is sre_parse.SUBPATTERN:
+            _, add_flags, _, sub = av
+            if add_flags & re.IGNORECASE or not _collect_chars(sub, chars):
+                return False
+        elif op in _REPEAT_OPS:
+            if not _collect_chars(av[2], chars):
+                return False
+        elif op is sre_parse.BRANCH:
+            if not all(_collect_chars(sub, chars) for sub in av[1]):
+                return False
+        else:
+            return False
+    return True
+
+
+def _pattern_charset(compiled: re.Pattern) -> Optional[frozenset]:
+    """正则规则可能匹配的字符集合；不能匹配空串且可静态分析时才返回"""
+    if compiled.flags & ~re.UNICODE:
+        return None
+    try:
+        parsed = sre_parse.parse(compiled.pattern)
+    except Exception:
+        return None
+    chars = set()
+    if parsed.getwidth()[0] == 0 or not _collect_chars(parsed, chars):
+        return None
+    return frozenset(chars)
+
+
+class _LiteralMatch:
+    """hyperscan 命中的最小 Match 接口 (仅 group(0))"""
+    __slots__ = ('_text',)
+
+    def __init__(self, text: str):
+        self._text = text
+
+    def group(self, index: int = 0) -> str:
+        return self._text
+
+
+class _HyperscanLiterals:
+    """
+    hyperscan 版的字面量交替模式
+
+    提供与 re.Pattern 相同的 sub 接口：repl 为 None 时直接按构造时的
+    替换表 (table) 拼接字节，否则对每个命中调用 repl(match)。组内字面量
+    互不重叠，按起点贪心选取不重叠的命中即与 re 的最左匹配结果一致。
+    """
+
+    def __init__(self, table: Dict[str, str]):
+        self.table = table
+        self._literals = list(table)
+        self._encoded = [lit.encode('utf-8') for lit in self._literals]
+        self._replacements = [table[lit].encode('utf-8') for lit in self._literals]
+        self._db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+        self._db.compile(
+            expressions=self._encoded,
+            ids=list(range(len(self._encoded))),
+            elements=len(self._encoded),
+            flags=[hyperscan.HS_FLAG_SOM_LEFTMOST] * len(self._encoded),
+            literal=True,
+        )
+        # scratch 不能跨线程共享，每个线程各持一份
+        self._local = threading.local()
+
+    def _scan(self, data: bytes) -> List[Tuple[int, int, int]]:
+        scratch = getattr(self._local, 'scratch', None)
+        if scratch is None:
+            scratch = self._local.scratch = hyperscan.Scratch(self._db)
+        hits = []
+        self._db.scan(
+            data,
+            match_event_handler=lambda idx, start, end, flags, ctx: hits.append((start, end, idx)),
+            scratch=scratch,
+        )
+        hits.sort()
+        picked = []
+        cursor = 0
+        for start, end, idx in hits:
+            if start >= cursor:
+                picked.append((start, end, idx))
+                cursor = end
+        return picked
+
+    def sub(self, repl: Optional[Callable], text: str) -> str:
+        data = text.encode('utf-8')
+        hits = self._scan(data)
+        if not hits:
+            return text
+        out = bytearray()
+        cursor = 0
+        for start, end, idx in hits:
+            out += data[cursor:start]
+            if repl is None:
+                out += self._replacements[idx]
+            else:
+                out += repl(_LiteralMatch(self._literals[idx])).encode('utf-8')
+            cursor = end
+        out += data[cursor:]
+        return out.decode('utf-8')
+
+
+def _plan_rules(rules: Tuple[Tuple[re.Pattern, str, str], ...]) -> Tuple[_Step, ...]:
+    """
+    将规则编排为执行步骤
+
+    相邻的纯字面量规则合并为一个交替模式 (安装了 hyperscan 时使用其
+    多模式扫描)，单遍扫描完成替换。只有逐条
+    执行与单遍替换结果必然一致时才合并：组内字面量互不重叠，且前面规则
+    的替换结果不含后面字面量的字符 (不会产生链式替换)；替换为空会拼接
+    前后文本，因此之后另起一组。
+
+    相邻的正则规则在可静态分析时同样合并为 (p1)|(p2)|... 交替模式，按
+    m.lastindex 分派替换：各规则可能匹配的字符集两两不相交，替换为不含
+    分组引用的非空文本，且不含后面规则的字符。其余规则按原顺序单独执行。
+    """
+    steps: List[_Step] = []
+    group: List[Tuple[str, str, Tuple[re.Pattern, str, str]]] = []
+    regex_group: List[Tuple[frozenset, Tuple[re.Pattern, str, str]]] = []
+
+    def flush():
+        if len(group) == 1:
+            steps.append(group[0][2])
+        elif group:
+            table = {lit: expanded for lit, expanded, _ in group}
+            sources = {lit: rule[2] for lit, _, rule in group}
+            source = lambda m: sources[m.group(0)]
+            fused = None
+            if HYPERSCAN_AVAILABLE:
+                try:
+                    fused = _HyperscanLiterals(table)
+                except hyperscan.error:
+                    fused = None
+            if fused is not None:
+                steps.append((fused, None, source))
+            else:
+                fused = re.compile('|'.join(sorted(table, key=len, reverse=True)))
+                steps.append((fused, lambda m: table[m.group(0)], source))
+        group.clear()
+
+    def flush_regex():
+        rules_in_group = [rule for _, rule in regex_group]
+        regex_group.clear()
+        if len(rules_in_group) < 2:
+            steps.extend(rules_in_group)
+            return
+        try:
+            fused = re.compile('|'.join(f'({rule[2]})' for rule in rules_in_group))
+        except re.error:
+            # 如分组名冲突，退回逐条执行
+            steps.extend(rules_in_group)
+            return
+        # 每条规则外层分组的编号 -> (替换文本, 原始模式)
+        dispatch = {}
+        index = 1
+        for compiled, replacement, pattern in rules_in_group:
+            dispatch[index] = (replacement, pattern)
+            index += compiled.groups + 1
+        steps.append((
+            fused,
+            lambda m: dispatch[m.lastindex][0],
+            lambda m: dispatch[m.lastindex][1],
+        ))
+
+    for rule in rules:
+        compiled, replacement, pattern = rule
+        expanded = _literal_replacement(compiled, replacement, pattern)
+        if expanded is None:
+            flush()
+            charset = None
+            if replacement and '\\' not in replacement:
+                charset = _pattern_charset(compiled)
+            if charset is None:
+                flush_regex()
+                steps.append(rule)
+                continue
+            if any(chars & charset or set(prev[1]) & charset for chars, prev in regex_group):
+                flush_regex()
+            regex_group.append((charset, rule))
+            continue
+        flush_regex()
+        if any(_literals_overlap(lit, pattern) or set(exp) & set(pattern) for lit, exp, _ in group):
+            flush()
+        group.append((pattern, expanded, rule))
+        if not expanded:
+            flush()
+    flush()
+    flush_regex()
+    return tuple(steps)
+
+
+def _rule_triggers(rules: Tuple[Tuple[re.Pattern, str, str], ...]) -> Optional[frozenset]:
+    """
+    任一规则命中时文本中必然出现的字符集合
+
+    字面量规则取首字符，可静态分析的正则取其全部可能字符。只要有一条
+    规则无法分析 (或可能匹配空串) 就返回 None，表示不能提前跳过。
+    第一条规则未命中时文本不变，因此文本与该集合不相交时所有规则都不会命中。
+    """
+    triggers = set()
+    for compiled, replacement, pattern in rules:
+        if re.escape(pattern) == pattern:
+            triggers.add(pattern[0])
+            continue
+        charset = _pattern_charset(compiled)
+        if charset is None:
+            return None
+        triggers |= charset
+    return frozenset(triggers)
+
+
+def _parse_rules(rule_text: str) -> Tuple[
+    Tuple[Tuple[re.Pattern, str, str], ...], Tuple[_Step, ...], Optional[frozenset]
+]:
+    """解析规则文本，返回 (预编译规则, 执行步骤, 触发字符集)"""
+    rules = []
+
+    for line in rule_text.splitlines():
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+
+        parts = line.split(' = ', 1)
+        if len(parts) == 2:
+            pattern = parts[0].strip()
+            replacement = parts[1].strip()
+            if not pattern:
+                continue
+            try:
+                compiled = re.compile(pattern)
+            except re.error:
+                # 无效的正则表达式在加载时过滤
+                continue
+            rules.append((compiled, replacement, pattern))
+
+    rules = tuple(rules)
+    return rules, _plan_rules(rules), _rule_triggers(rules)
+
+
+# 规则文件编译缓存: 路径 -> (mtime_ns, size, 解析结果)，文件未变化时
+# 各会话直接共享编译好的规则；每个路径只保留最新版本
+_FILE_CACHE: Dict[str, Tuple[int, int, Tuple]] = {}
+_FILE_CACHE_LOCK = Lock()
 
 
 class RuleCorrector:
     """规则纠错器 - 基于正则表达式的精确替换"""
 
     def __init__(self):
-        self.patterns: Dict[str, str] = {}
+        # 预编译的规则 (正则对象, 替换文本, 原始模式)，按文件顺序排列。
+        # update_rules 整体替换为新的不可变元组 (属性赋值是原子的)，
+        # 读取方直接取引用，无需加锁或复制。
+        self._rules: Tuple[Tuple[re.Pattern, str, str], ...] = ()
+        # 由 _rules 编排出的执行步骤 (字面量规则已合并)
+        self._steps: Tuple[_Step, ...] = ()
+        # 规则命中所必需的字符集合 (None 表示无法判断)，文本与其不相交时直接跳过
+        self._triggers: Optional[frozenset] = frozenset()
         self._lock = Lock()
 
+    @property
+    def patterns(self) -> Dict[str, str]:
+        """规则模式 -> 替换文本 (只读视图)"""
+        return {source: replacement for _, replacement, source in self._rules}
+
     def update_rules(self, rule_text: str) -> int:
         """
         更新规则词典（线程安全）
@@ -42,24 +358,15 @@ class RuleCorrector:
         Returns:
             加载的规则数量
         """
-        new_patterns = {}
-
-        for line in rule_text.splitlines():
-            line = line.strip()
-            if not line or line.startswith('#'):
-                continue
-
-            parts = line.split(' = ', 1)
-            if len(parts) == 2:
-                pattern = parts[0].strip()
-                replacement = parts[1].strip()
-                if pattern:
-                    new_patterns[pattern] = replacement
+        return self._publish(*_parse_rules(rule_text))
 
+    def _publish(self, rules, steps, triggers) -> int:
+        # 写入方之间串行，读取方无锁
         with self._lock:
-            self.patterns = new_patterns
-
-        return len(new_patterns)
+            self._rules = rules
+            self._steps = steps
+            self._triggers = triggers
+        return len(rules)
 
     def load_rules_file(self, path: str) -> int:
         """
@@ -72,10 +379,21 @@ class RuleCorrector:
             加载的规则数量
         """
         path = Path(path)
-        if path.exists():
-            content = path.read_text(encoding='utf-8')
-            return self.update_rules(content)
-        return 0
+        try:
+            st = path.stat()
+        except OSError:
+            return 0
+
+        key = str(path.resolve())
+        with _FILE_CACHE_LOCK:
+            cached = _FILE_CACHE.get(key)
+        if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+            return self._publish(*cached[2])
+
+        parsed = _parse_rules(path.read_text(encoding='utf-8'))
+        with _FILE_CACHE_LOCK:
+            _FILE_CACHE[key] = (st.st_mtime_ns, st.st_size, parsed)
+        return self._publish(*parsed)
 
     def substitute(self, text: str) -> str:
         """
@@ -87,19 +405,19 @@ class RuleCorrector:
         Returns:
             替换后的文本
         """
-        if not text or not self.patterns:
+        steps = self._steps
+        if not text or not steps:
             return text or ""
+        triggers = self._triggers
+        if triggers is not None and triggers.isdisjoint(text):
+            return text
 
         result = text
-
-        with self._lock:
-            patterns = self.patterns.copy()
-
-        for pattern, replacement in patterns.items():
+        for pattern, replacement, _ in steps:
             try:
-                result = re.sub(pattern, replacement, result)
+                result = pattern.sub(replacement, result)
             except re.error:
-                # 忽略无效的正则表达式
+                # 忽略无效的替换模板 (如引用不存在的分组)
                 pass
 
         return result
@@ -114,25 +432,34 @@ class RuleCorrector:
         Returns:
             (替换后文本, [(原文, 替换后, 规则模式), ...])
         """
-        if not text or not self.patterns:
+        steps = self._steps
+        if not text or not steps:
             return text or "", []
+        triggers = self._triggers
+        if triggers is not None and triggers.isdisjoint(text):
+            return text, []
 
         result = text
         replacements = []
+        for pattern, replacement, source in steps:
+            if isinstance(replacement, str):
+                expand = lambda m, r=replacement: m.expand(r)
+            elif replacement is None:
+                expand = lambda m, t=pattern.table: t[m.group(0)]
+            else:
+                expand = replacement
 
-        with self._lock:
-            patterns = self.patterns.copy()
+            # 单遍替换：在回调中展开替换模板并记录信息
+            def record(match, expand=expand, source=source):
+                original = match.group(0)
+                replaced = expand(match)
+                if original != replaced:
+                    rule = source if isinstance(source, str) else source(match)
+                    replacements.append((original, replaced, rule))
+                return replaced
 
-        for pattern, replacement in patterns.items():
             try:
-                matches = list(re.finditer(pattern, result))
-                if matches:
-                    for match in matches:
-                        original = match.group(0)
-                        replaced = re.sub(pattern, replacement, original)
-                        if original != replaced:
-                            replacements.append((original, replaced, pattern))
-                    result = re.sub(pattern, replacement, result)
+                result = pattern.sub(record, result)
             except re.error:
                 pass
 
@@ -1,5 +1,6 @@
 """角色基类和注册器"""
-from abc import ABC, abstractmethod
+import threading
+from abc import ABC
 from typing import Dict, Type, Optional
 
 
@@ -8,12 +9,13 @@ class Role(ABC):
 
     name: str = "base"
     description: str = "基础角色"
+    # 系统提示词，子类以类属性直接定义
+    system_prompt: str
 
-    @property
-    @abstractmethod
-    def system_prompt(self) -> str:
-        """系统提示词"""
-        pass
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if not isinstance(getattr(cls, "system_prompt", None), str):
+            raise TypeError(f"{cls.__name__} must define class attribute 'system_prompt'")
 
     def format_user_input(self, text: str) -> str:
         """格式化用户输入（子类可覆盖）"""
@@ -25,6 +27,7 @@ class RoleRegistry:
 
     _roles: Dict[str, Type[Role]] = {}
     _instances: Dict[str, Role] = {}
+    _lock = threading.Lock()
 
     @classmethod
     def register(cls, role_class: Type[Role]) -> Type[Role]:
@@ -34,13 +37,18 @@ class RoleRegistry:
 
     @classmethod
     def get(cls, name: str) -> Optional[Role]:
-        """获取角色实例"""
-        if name not in cls._instances:
-            role_class = cls._roles.get(name)
-            if role_class is None:
-                return None
-            cls._instances[name] = role_class()
-        return cls._instances[name]
+        """获取角色实例 (双重检查加锁，并发首次获取只实例化一次)"""
+        role = cls._instances.get(name)
+        if role is not None:
+            return role
+        with cls._lock:
+            role = cls._instances.get(name)
+            if role is None:
+                role_class = cls._roles.get(name)
+                if role_class is None:
+                    return None
+                role = cls._instances[name] = role_class()
+        return role
 
     @classmethod
     def list_roles(cls) -> Dict[str, str]:
@@ -9,9 +9,7 @@ class CodeRole(Role):
     name = "code"
     description = "代码模式：识别变量名、函数名、代码片段"
 
-    @property
-    def system_prompt(self) -> str:
-        return """# 角色
+    system_prompt = """# 角色
 
 你是一位代码输入助手，你的任务是将语音转录的代码相关文本转换为正确的代码格式。
 
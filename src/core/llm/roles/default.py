@@ -9,9 +9,7 @@ class DefaultRole(Role):
     name = "default"
     description = "语音润色：清除语气词、修正识别错误、修正专有名词"
 
-    @property
-    def system_prompt(self) -> str:
-        return """# 角色
+    system_prompt = """# 角色
 
 你是一位高级智能复读机，你的任务是将用户提供的语音转录文本进行润色和整理和再输出。
 
@@ -11,9 +11,7 @@ class MeetingRole(Role):
     name = "meeting"
     description = "会议转录：只修明显 ASR 错误和标点，严禁改写/总结/增删"
 
-    @property
-    def system_prompt(self) -> str:
-        return """# 角色
+    system_prompt = """# 角色
 
 你是一名“会议转录纠错员”。你的任务是对语音识别（ASR）输出进行**最小改动**的纠错与标点整理，让会议/访谈/回忆转录更易读。
 
@@ -9,9 +9,7 @@ class TranslatorRole(Role):
     name = "translator"
     description = "翻译：中文翻英文，英文翻中文"
 
-    @property
-    def system_prompt(self) -> str:
-        return """# 角色
+    system_prompt = """# 角色
 
 你是一位专业的翻译，你的任务是将用户提供的语音转录文本翻译成另一种语言。
 
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
-from typing import Any, Iterable, List
+import math
+from typing import Any, Iterable, List, Sequence, Tuple
+
+import numpy as np
 
 from src.core.speaker.external_diarizer_types import (
     ExternalDiarizerSegment,
@@ -9,6 +12,13 @@ from src.core.speaker.external_diarizer_types import (
 
 
 def _try_coerce_int(value: Any) -> int | None:
+    # Plain ints and floats (the usual JSON payloads) skip the exception path.
+    if type(value) is int:
+        return value
+    if type(value) is float:
+        if value != value or value in (math.inf, -math.inf):
+            return None
+        return int(value)
     try:
         return int(value)
     except (TypeError, ValueError, OverflowError):
@@ -22,6 +32,51 @@ def _coerce_int(value: Any, *, default: int) -> int:
     return coerced
 
 
+# Below this many segments the per-row loop is cheaper than building arrays.
+_VECTORIZE_MIN_SEGMENTS = 256
+_INT64_MAX = np.iinfo(np.int64).max
+
+
+def _normalize_rows_np(
+    rows: Sequence[Tuple[int, int, int]],
+    duration_ms: int | None,
+) -> List[ExternalDiarizerSegment] | None:
+    """Vectorized clamp/filter/sort over (spk, start, end) int rows.
+
+    Returns None when the values do not fit int64 so the caller can fall back
+    to the per-row path.
+    """
+    try:
+        arr = np.array(rows, dtype=np.int64).reshape(-1, 3)
+    except (OverflowError, TypeError, ValueError):
+        return None
+
+    spk = arr[:, 0]
+    upper = duration_ms if duration_ms is not None and duration_ms <= _INT64_MAX else None
+    start = np.clip(arr[:, 1], 0, upper)
+    end = np.clip(arr[:, 2], 0, upper)
+
+    keep = end > start
+    spk, start, end = spk[keep], start[keep], end[keep]
+    if not _is_sorted_np(spk, start, end):
+        order = np.lexsort((spk, end, start))
+        spk, start, end = spk[order], start[order], end[order]
+    return [
+        {"spk": s, "start": a, "end": b}
+        for s, a, b in zip(spk.tolist(), start.tolist(), end.tolist())
+    ]
+
+
+def _is_sorted_np(spk: np.ndarray, start: np.ndarray, end: np.ndarray) -> bool:
+    """Whether rows are already ordered by (start, end, spk)."""
+    if len(start) < 2:
+        return True
+    s0, s1 = start[:-1], start[1:]
+    e0, e1 = end[:-1], end[1:]
+    ok = (s1 > s0) | ((s1 == s0) & ((e1 > e0) | ((e1 == e0) & (spk[1:] >= spk[:-1]))))
+    return bool(ok.all())
+
+
 def normalize_segments(
     raw_segments: Iterable[ExternalDiarizerSegmentLike] | None,
     duration_ms: int | None,
@@ -45,22 +100,36 @@ def normalize_segments(
         if duration_ms_int is not None and duration_ms_int < 0:
             duration_ms_int = 0
 
-    normalized: List[ExternalDiarizerSegment] = []
-
+    rows = []
+    all_int = True
     for seg in raw_segments:
         if seg is None:
             continue
 
         try:
-            spk_raw = seg.get("spk")
-            start_raw = seg.get("start")
-            end_raw = seg.get("end")
+            row = (seg.get("spk"), seg.get("start"), seg.get("end"))
         except AttributeError:
             continue
 
-        spk = _try_coerce_int(spk_raw)
-        start = _try_coerce_int(start_raw)
-        end = _try_coerce_int(end_raw)
+        rows.append(row)
+        if all_int and not (type(row[0]) is int and type(row[1]) is int and type(row[2]) is int):
+            all_int = False
+
+    # Long recordings with plain int fields take the array path.
+    if all_int and len(rows) >= _VECTORIZE_MIN_SEGMENTS:
+        fast = _normalize_rows_np(rows, duration_ms_int)
+        if fast is not None:
+            return fast
+
+    normalized: List[ExternalDiarizerSegment] = []
+    # Diarizers almost always emit chronological output; only sort when needed.
+    in_order = True
+    last_key = None
+
+    for spk_raw, start_raw, end_raw in rows:
+        spk = spk_raw if type(spk_raw) is int else _try_coerce_int(spk_raw)
+        start = start_raw if type(start_raw) is int else _try_coerce_int(start_raw)
+        end = end_raw if type(end_raw) is int else _try_coerce_int(end_raw)
 
         if spk is None or start is None or end is None:
             continue
@@ -80,6 +149,11 @@ def normalize_segments(
             continue
 
         normalized.append({"spk": spk, "start": start, "end": end})
+        key = (start, end, spk)
+        if in_order and last_key is not None and key < last_key:
+            in_order = False
+        last_key = key
 
-    normalized.sort(key=lambda s: (s["start"], s["end"], s["spk"]))
+    if not in_order:
+        normalized.sort(key=lambda s: (s["start"], s["end"], s["spk"]))
     return normalized
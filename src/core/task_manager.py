@@ -3,14 +3,17 @@
 支持异步任务队列处理，适用于 URL 音频转写等耗时操作。
 """
 import asyncio
+import heapq
 import logging
 import threading
+import time
 import uuid
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timedelta
 from enum import Enum
-from queue import Queue
-from typing import Any, Callable, Dict, List, Optional
+from queue import Empty, Queue
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -51,22 +54,33 @@ class TaskManager:
     结果存储在内存中（可扩展为 Redis/MySQL）。
     """
 
-    def __init__(self, max_results: int = 1000, result_ttl: int = 3600):
+    def __init__(self, max_results: int = 1000, result_ttl: int = 3600, max_workers: int = 1):
         """
         初始化任务管理器
 
         Args:
             max_results: 最大结果缓存数
             result_ttl: 结果存活时间（秒）
+            max_workers: 并发处理任务的工作线程数。默认 1: 转写任务共用同一个
+                FunASR AutoModel，并发调用 generate 会互相串用热词与缓存，
+                仅当处理器不共享模型时才应调大
         """
-        self._queue: Queue[TaskItem] = Queue()
-        self._results: Dict[str, TaskResult] = {}
+        # None 为停止哨兵，由 stop() 为每个工作线程放入一个
+        self._queue: "Queue[Optional[TaskItem]]" = Queue()
+        # 按提交顺序排列，超出容量时从头部淘汰最旧的结果
+        self._results: "OrderedDict[str, TaskResult]" = OrderedDict()
+        # (过期时间, 任务 ID) 小顶堆，清理时只弹出已过期的堆顶
+        self._expiry_heap: List[Tuple[datetime, str]] = []
         self._handlers: Dict[str, Callable] = {}
         self._max_results = max_results
         self._result_ttl = result_ttl
         self._lock = threading.Lock()
-        self._worker_thread: Optional[threading.Thread] = None
+        self._max_workers = max(1, max_workers)
+        self._worker_threads: List[threading.Thread] = []
         self._running = False
+        # 按时间间隔清理，避免每个任务都加锁扫描
+        self._cleanup_interval = 30.0
+        self._last_cleanup = 0.0
 
     def register_handler(self, task_type: str, handler: Callable):
         """
@@ -97,13 +111,12 @@ class TaskManager:
             payload=payload
         )
 
-        # 初始化结果
-        with self._lock:
-            self._results[task_id] = TaskResult(
-                task_id=task_id,
-                status=TaskStatus.PENDING,
-                created_at=task.created_at
-            )
+        # 初始化结果 (单次字典写入是原子的，事件循环线程无需等待工作线程的锁)
+        self._results[task_id] = TaskResult(
+            task_id=task_id,
+            status=TaskStatus.PENDING,
+            created_at=task.created_at
+        )
 
         self._queue.put(task)
         logger.info(f"Task submitted: {task_id} ({task_type})")
@@ -113,6 +126,8 @@ class TaskManager:
         """
         获取任务结果
 
+        由事件循环调用，不加锁：读取与删除都是单次原子字典操作。
+
         Args:
             task_id: 任务 ID
             delete: 获取后是否删除
@@ -120,11 +135,10 @@ class TaskManager:
         Returns:
             任务结果，不存在则返回 None
         """
-        with self._lock:
-            result = self._results.get(task_id)
-            if result and delete and result.status in (TaskStatus.COMPLETED, TaskStatus.FAILED):
-                del self._results[task_id]
-            return result
+        result = self._results.get(task_id)
+        if result and delete and result.status in (TaskStatus.COMPLETED, TaskStatus.FAILED):
+            self._results.pop(task_id, None)
+        return result
 
     def get_status(self, task_id: str) -> Optional[TaskStatus]:
         """获取任务状态"""
@@ -137,42 +151,62 @@ class TaskManager:
             return
 
         self._running = True
-        self._worker_thread = threading.Thread(target=self._worker, daemon=True)
-        self._worker_thread.start()
-        logger.info("Task manager started")
+        # 多个工作线程共享同一队列，任务并发处理
+        self._worker_threads = [
+            threading.Thread(target=self._worker, name=f"task-mgr-{i}", daemon=True)
+            for i in range(self._max_workers)
+        ]
+        for thread in self._worker_threads:
+            thread.start()
+        logger.info(f"Task manager started ({self._max_workers} workers)")
 
     def stop(self):
         """停止任务处理器"""
         self._running = False
-        if self._worker_thread:
-            self._worker_thread.join(timeout=5)
+        for _ in self._worker_threads:
+            self._queue.put(None)
+        for thread in self._worker_threads:
+            thread.join(timeout=5)
+        self._worker_threads = []
         logger.info("Task manager stopped")
 
     def _worker(self):
         """后台工作线程"""
         while self._running:
             try:
-                # 阻塞获取任务，超时 1 秒
+                # 阻塞获取任务；空闲时每个清理间隔唤醒一次，stop() 通过哨兵唤醒
                 try:
-                    task = self._queue.get(timeout=1)
-                except:
+                    task = self._queue.get(timeout=self._cleanup_interval)
+                except Empty:
+                    self._maybe_cleanup()
+                    continue
+
+                if task is None:
+                    # 重启后残留的旧哨兵直接忽略
                     continue
 
                 self._process_task(task)
-                self._cleanup_old_results()
+                self._maybe_cleanup()
 
             except Exception as e:
                 logger.error(f"Worker error: {e}")
 
+    def _maybe_cleanup(self):
+        """距上次清理超过间隔或结果数超出上限时才清理"""
+        now = time.monotonic()
+        if now - self._last_cleanup > self._cleanup_interval or len(self._results) > self._max_results:
+            self._cleanup_old_results()
+            self._last_cleanup = now
+
     def _process_task(self, task: TaskItem):
         """处理单个任务"""
         task_id = task.task_id
         logger.info(f"Processing task: {task_id} ({task.task_type})")
 
-        # 更新状态为处理中
-        with self._lock:
-            if task_id in self._results:
-                self._results[task_id].status = TaskStatus.PROCESSING
+        # 结果对象可能随时被 get_result 取走，只持有引用进行更新
+        entry = self._results.get(task_id)
+        if entry is not None:
+            entry.status = TaskStatus.PROCESSING
 
         try:
             handler = self._handlers.get(task.task_type)
@@ -181,44 +215,45 @@ class TaskManager:
 
             result = handler(task.payload)
 
-            # 更新结果
-            with self._lock:
-                if task_id in self._results:
-                    self._results[task_id].status = TaskStatus.COMPLETED
-                    self._results[task_id].completed_at = datetime.now()
-                    self._results[task_id].result = result
+            # 更新结果 (状态最后写入，读到 COMPLETED 时结果已就绪)
+            if entry is not None:
+                entry.completed_at = datetime.now()
+                entry.result = result
+                entry.status = TaskStatus.COMPLETED
+                self._schedule_expiry(entry)
 
             logger.info(f"Task completed: {task_id}")
 
         except Exception as e:
             logger.error(f"Task failed: {task_id} - {e}")
-            with self._lock:
-                if task_id in self._results:
-                    self._results[task_id].status = TaskStatus.FAILED
-                    self._results[task_id].completed_at = datetime.now()
-                    self._results[task_id].error = str(e)
+            if entry is not None:
+                entry.completed_at = datetime.now()
+                entry.error = str(e)
+                entry.status = TaskStatus.FAILED
+                self._schedule_expiry(entry)
+
+    def _schedule_expiry(self, entry: TaskResult):
+        """登记结果过期时间 (堆只在工作线程之间共享，由 _lock 保护)"""
+        expires_at = entry.completed_at + timedelta(seconds=self._result_ttl)
+        with self._lock:
+            heapq.heappush(self._expiry_heap, (expires_at, entry.task_id))
 
     def _cleanup_old_results(self):
-        """清理过期结果"""
+        """清理过期结果 (只处理已过期的堆顶与超出容量的最旧条目)"""
         now = datetime.now()
         with self._lock:
-            to_delete = []
-            for task_id, result in self._results.items():
-                if result.completed_at:
-                    age = (now - result.completed_at).total_seconds()
-                    if age > self._result_ttl:
-                        to_delete.append(task_id)
-
-            # 超过最大数量时清理最旧的
-            if len(self._results) > self._max_results:
-                sorted_results = sorted(
-                    self._results.items(),
-                    key=lambda x: x[1].created_at
-                )
-                to_delete.extend([r[0] for r in sorted_results[:len(self._results) - self._max_results]])
-
-            for task_id in set(to_delete):
-                del self._results[task_id]
+            heap = self._expiry_heap
+            while heap and heap[0][0] < now:
+                _, task_id = heapq.heappop(heap)
+                # 已被 get_result 取走的任务只剩堆中的残留条目
+                self._results.pop(task_id, None)
+
+            # 超过最大数量时清理最旧的 (get_result 可能同时取走条目)
+            while len(self._results) > self._max_results:
+                try:
+                    self._results.popitem(last=False)
+                except KeyError:
+                    break
 
 
 # 全局任务管理器
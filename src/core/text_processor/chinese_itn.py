@@ -18,6 +18,8 @@
 __all__ = ['ChineseITN']
 
 import re
+from bisect import bisect_left
+from functools import lru_cache
 
 
 # ============================================================
@@ -32,13 +34,25 @@ ERHUA_WHITELIST = {
     '小儿', '男儿', '儿郎', '生儿', '养儿', '侄儿',
 }
 
-# 儿化正则：匹配"X儿"模式（X为中文字符）
-_ERHUA_PATTERN = re.compile(r'([\u4e00-\u9fff])儿')
+# 白名单中以"儿"开头的词，整体匹配后原样保留
+_ERHUA_PROTECTED = sorted((w for w in ERHUA_WHITELIST if w.startswith('儿')), key=len, reverse=True)
+
+# 儿化正则：单遍扫描，先匹配受保护的词，否则匹配"X儿"模式（X为中文字符），
+# 其后的"儿"属于受保护词时不匹配
+_ERHUA_PATTERN = re.compile(
+    '({})|([\u4e00-\u9fff])儿(?!{})'.format(
+        '|'.join(map(re.escape, _ERHUA_PROTECTED)),
+        '|'.join(re.escape(w[1:]) for w in _ERHUA_PROTECTED),
+    )
+)
 
 
 def _erhua_replace(match):
     """儿化替换回调"""
-    char_before = match.group(1)
+    protected = match.group(1)
+    if protected:
+        return protected
+    char_before = match.group(2)
     word = char_before + '儿'
     if word in ERHUA_WHITELIST:
         return word
@@ -58,22 +72,7 @@ def remove_erhua(text: str) -> str:
     if not text or '儿' not in text:
         return text
 
-    # 先保护白名单中以"儿"开头的词
-    protected = {}
-    for word in sorted(ERHUA_WHITELIST, key=len, reverse=True):
-        if word in text and word.startswith('儿'):
-            placeholder = f'\x00{len(protected)}\x00'
-            text = text.replace(word, placeholder)
-            protected[placeholder] = word
-
-    # 替换儿化
-    text = _ERHUA_PATTERN.sub(_erhua_replace, text)
-
-    # 还原被保护的词
-    for placeholder, word in protected.items():
-        text = text.replace(placeholder, word)
-
-    return text
+    return _ERHUA_PATTERN.sub(_erhua_replace, text)
 
 
 # ============================================================
@@ -100,12 +99,16 @@ NUM_MAPPER = {
     '六': '6',  '七': '7',  '八': '8',  '九': '9',
     '点': '.',
 }
+# 逐字映射在 C 层完成 (str.translate)，字符集用于校验是否全部可映射
+_NUM_TRANS = str.maketrans(NUM_MAPPER)
+_NUM_CHARS = frozenset(NUM_MAPPER)
 
 # 中文数字对数值的映射
 VALUE_MAPPER = {
     '零': 0,  '一': 1,  '二': 2,  '两': 2,  '三': 3,  '四': 4,  '五': 5,
     '六': 6,  '七': 7,  '八': 8,  '九': 9,  "十": 10,  "百": 100,  "千": 1000,  "万": 10000,  "亿": 100000000,
 }
+_VALUE_GET = VALUE_MAPPER.get
 
 # 成语和习语黑名单
 IDIOMS = '''
@@ -120,6 +123,16 @@ IDIOMS = '''
 十二五 十三五 十四五 十五五 十六五 十七五 十八五
 '''.split()
 
+# 成语起点扫描：零宽前瞻交替，一次 finditer 得到所有成语出现的起点
+_IDIOM_STARTS = re.compile('(?=(?:{}))'.format('|'.join(map(re.escape, IDIOMS))))
+
+
+def _idiom_starts(text):
+    """返回文本中所有成语出现位置的起点 (升序)"""
+    if not IDIOMS:
+        return []
+    return [m.start() for m in _IDIOM_STARTS.finditer(text)]
+
 # 模糊表达黑名单（包含"几"的表达不转换）
 FUZZY_REGEX = re.compile(r'几')
 
@@ -145,7 +158,7 @@ _TIME_QUARTER_INLINE = re.compile(r"([零一二两三四五六七八九十]+)点
 
 def _chinese_digit_to_num(char):
     """将单个中文数字转为阿拉伯数字"""
-    return VALUE_MAPPER.get(char, 0)
+    return _VALUE_GET(char, 0)
 
 def _parse_tens(tens):
     """解析"十"或"X十"格式的数值"""
@@ -207,26 +220,24 @@ def _convert_range_pattern_3(match):
     v2 = _chinese_digit_to_num(d2)
     return f"{v1}~{v2}"
 
+# 范围表达式检测 (单位表为模块常量，模式只编译一次)
+_optional_unit = rf'(?:{"|".join(re.escape(u) for u in _sorted_units)})?'
+_range_expression = re.compile(rf'''(?x)
+    (?<!点)
+    (?:
+        [二三四五六七八九]{{2}}(?:十|[百千万亿]){_optional_unit}
+        |
+        [一二三四五六七八九]?十[一二三四五六七八九]{{2}}(?:[万千亿]|{_optional_unit})
+        |
+        [一二三四五六七八九][百千][二三四五六七八九]{{2}}十
+        |
+        [一二三四五六七八九十]+[万千百][一二三四五六七八九]{{2}}{_optional_unit}
+    )
+''')
+
 def _is_range_expression(text):
     """判断是否为范围表达式"""
-    sorted_units = sorted(UNIT_MAPPING.keys(), key=len, reverse=True)
-    unit_pattern = '|'.join(re.escape(u) for u in sorted_units)
-    optional_unit = rf'(?:{unit_pattern})?'
-
-    range_pattern = re.compile(rf'''(?x)
-        (?<!点)
-        (?:
-            [二三四五六七八九]{{2}}(?:十|[百千万亿]){optional_unit}
-            |
-            [一二三四五六七八九]?十[一二三四五六七八九]{{2}}(?:[万千亿]|{optional_unit})
-            |
-            [一二三四五六七八九][百千][二三四五六七八九]{{2}}十
-            |
-            [一二三四五六七八九十]+[万千百][一二三四五六七八九]{{2}}{optional_unit}
-        )
-    ''')
-
-    return range_pattern.search(text) is not None
+    return _range_expression.search(text) is not None
 
 def _convert_range_expression(text):
     """转换范围表达式"""
@@ -234,9 +245,8 @@ def _convert_range_expression(text):
     mapped_unit = ''
 
     numeric_units = {'万', '亿', '千', '百', '十'}
-    sorted_units = sorted(UNIT_MAPPING.keys(), key=len, reverse=True)
 
-    for unit_cn in sorted_units:
+    for unit_cn in _sorted_units:
         if unit_cn in numeric_units:
             continue
         if text.endswith(unit_cn):
@@ -267,6 +277,9 @@ def _convert_range_expression(text):
 
 # 用于去除末尾单位的正则
 _unit_suffix_pattern = re.compile(rf'({COMMON_UNITS}|[a-zA-Z]+)$')
+# _strip_unit 先剥离中文单位，没有时再剥离字母单位
+_unit_only_suffix_pattern = re.compile(rf'({COMMON_UNITS})$')
+_letter_suffix_pattern = re.compile(r'[a-zA-Z]+$')
 
 # 总模式，筛选出可能需要替换的内容
 _pattern = re.compile(f"""(?ix)
@@ -303,14 +316,15 @@ _value_num = re.compile(f"十?(零?[一二两三四五六七八九十][十百千
 _consecutive_tens = re.compile(rf'^((?:十[一二三四五六七八九])+)({COMMON_UNITS})?$')
 _consecutive_hundreds = re.compile(rf'^((?:[一二三四五六七八九]百零?[一二三四五六七八九])+)({COMMON_UNITS})?$')
 
+# 以下三个模式只用于 fullmatch，"点" 后必须跟小数位，用可选分组代替条件分组
 # 百分值
-_percent_value = re.compile('(?<![一二三四五六七八九])(百分之)[零一二三四五六七八九十百千万]+(点)?(?(2)[零一二三四五六七八九]+)')
+_percent_value = re.compile('(?<![一二三四五六七八九])(百分之)[零一二三四五六七八九十百千万]+(?:点[零一二三四五六七八九]+)?')
 
 # 分数
-_fraction_value = re.compile('([零一二三四五六七八九十百千万]+(点)?(?(2)[零一二三四五六七八九]+))分之([零一二三四五六七八九十百千万]+(点)?(?(4)[零一二三四五六七八九]+))')
+_fraction_value = re.compile('([零一二三四五六七八九十百千万]+(?:点[零一二三四五六七八九]+)?)分之([零一二三四五六七八九十百千万]+(?:点[零一二三四五六七八九]+)?)')
 
 # 比值
-_ratio_value = re.compile('([零一二三四五六七八九十百千万]+(点)?(?(2)[零一二三四五六七八九]+))比([零一二三四五六七八九十百千万]+(点)?(?(4)[零一二三四五六七八九]+))')
+_ratio_value = re.compile('([零一二三四五六七八九十百千万]+(?:点[零一二三四五六七八九]+)?)比([零一二三四五六七八九十百千万]+(?:点[零一二三四五六七八九]+)?)')
 
 # 时间
 _time_value = re.compile("[零一二两三四五六七八九十]+点([零一二三四五六七八九十]+分)([零一二三四五六七八九十]+秒)?")
@@ -318,6 +332,11 @@ _time_value = re.compile("[零一二两三四五六七八九十]+点([零一二
 # 日期
 _date_value = re.compile("([零一二三四五六七八九十]+年)?([一二三四五六七八九十]+月)?([一二三四五六七八九十]+[日号])?")
 
+# 转换函数内部使用的切分模式
+_time_split = re.compile('[点分秒]')
+_tens_part = re.compile(r'十[一二三四五六七八九]')
+_hundreds_part = re.compile(r'[一二三四五六七八九]百零?[一二三四五六七八九]')
+
 
 # ============================================================
 # 第四部分：辅助函数
@@ -336,8 +355,7 @@ def _is_consecutive_value(text):
 
 def _strip_unit(original):
     """把数字后面跟着的单位剥离开，并应用单位映射"""
-    unit_pattern = re.compile(rf'({COMMON_UNITS})$')
-    match = unit_pattern.search(original)
+    match = _unit_only_suffix_pattern.search(original)
 
     if match:
         unit_cn = match.group(1)
@@ -349,7 +367,7 @@ def _strip_unit(original):
         unit = ''
 
     if not unit and stripped:
-        letter_match = re.search(r'[a-zA-Z]+$', stripped)
+        letter_match = _letter_suffix_pattern.search(stripped)
         if letter_match:
             unit = letter_match.group()
             stripped = stripped[:letter_match.start()]
@@ -364,10 +382,12 @@ def _strip_unit(original):
 def _convert_pure_num(original, strict=False):
     """把中文数字转为对应的阿拉伯数字"""
     stripped, unit = _strip_unit(original)
-    if stripped in ['一'] and not strict:
+    if stripped == '一' and not strict:
         return original
-    converted = [NUM_MAPPER[c] for c in stripped]
-    return ''.join(converted) + unit
+    if not _NUM_CHARS.issuperset(stripped):
+        # 与逐字查表一致：含无法映射的字符时交由调用方回退
+        raise KeyError(stripped)
+    return stripped.translate(_NUM_TRANS) + unit
 
 def _convert_value_num(original):
     """把中文数值转为阿拉伯数字"""
@@ -378,24 +398,28 @@ def _convert_value_num(original):
     if not int_part:
         return original
 
-    # 计算整数部分的值
+    # 计算整数部分的值 (每个字只查一次表，按数值分支；亿与未知字符忽略)
     value, temp, base = 0, 0, 1
     for c in int_part:
-        if c == '十' :
-            temp = 10 if temp==0 else VALUE_MAPPER[c]*temp
-            base = 1
-        elif c == '零':
+        v = _VALUE_GET(c)
+        if v is None:
+            continue
+        if v < 10:
+            if v:
+                temp += v
+            else:
+                base = 1
+        elif v == 10:
+            temp = 10 if temp == 0 else 10 * temp
             base = 1
-        elif c in '一二两三四五六七八九':
-            temp += VALUE_MAPPER[c]
-        elif c in '万':
+        elif v == 10000:
             value += temp
-            value *= VALUE_MAPPER[c]
-            base = VALUE_MAPPER[c] // 10
+            value *= 10000
+            base = 1000
             temp = 0
-        elif c in '百千':
-            value += temp * VALUE_MAPPER[c]
-            base = VALUE_MAPPER[c] // 10
+        elif v < 10000:
+            value += temp * v
+            base = v // 10
             temp = 0
     value += temp * base
     final = str(value)
@@ -424,7 +448,7 @@ def _convert_ratio_value(original):
 
 def _convert_time_value(original):
     """转换时间"""
-    res = [x for x in re.split('[点分秒]', original) if x]
+    res = [x for x in _time_split.split(original) if x]
     final = ''
     hour = _convert_value_num(res[0])
     final += hour.zfill(2)
@@ -459,12 +483,12 @@ def _split_consecutive_value(text):
     stripped, unit = _strip_unit(text)
 
     if _consecutive_tens.match(stripped):
-        parts = re.findall(r'十[一二三四五六七八九]', stripped)
+        parts = _tens_part.findall(stripped)
         nums = [_convert_value_num(p) for p in parts]
         return ' '.join(nums) + unit
 
     if _consecutive_hundreds.match(stripped):
-        parts = re.findall(r'[一二三四五六七八九]百零?[一二三四五六七八九]', stripped)
+        parts = _hundreds_part.findall(stripped)
         nums = [_convert_value_num(p) for p in parts]
         return ' '.join(nums) + unit
 
@@ -520,18 +544,48 @@ def _pre_normalize_zero_circles(text: str) -> str:
 # 第六部分：主替换逻辑
 # ============================================================
 
-def _replace(original):
-    """主替换函数"""
+# 按优先级排列的命名交替：fullmatch 依次尝试各分支，与逐个 fullmatch 的结果一致
+_tail_value = re.compile('|'.join(
+    f'(?P<{name}>{pattern.pattern})'
+    for name, pattern in (
+        ('percent', _percent_value),
+        ('fraction', _fraction_value),
+        ('ratio', _ratio_value),
+        ('date', _date_value),
+    )
+))
+_TAIL_CONVERTERS = {
+    'percent': _convert_percent_value,
+    'fraction': _convert_fraction_value,
+    'ratio': _convert_ratio_value,
+    'date': _convert_date_value,
+}
+
+
+# 有意义的转换至少需要一个数字字；只有数位/单位/连接字的候选 (如 "万万"、
+# "百比千"、"点") 原样保留，不再被误转为 "0万"、"0:0"
+_DIGIT_CHARS = frozenset('零幺一二两三四五六七八九十')
+
+
+def _replace(original, idiom_starts=None):
+    """主替换函数 (idiom_starts 为整句预先扫描出的成语起点)"""
+    head = original.group(1)
+    original_text = original.group(2)
+    # 不含数字字的候选直接原样返回，跳过全部分派
+    if _DIGIT_CHARS.isdisjoint(original_text):
+        return head + original_text if head else original_text
+
     string = original.string
+    if idiom_starts is None:
+        idiom_starts = _idiom_starts(string)
     l_pos, r_pos = original.regs[2]
     l_pos = max(l_pos-2, 0)
-    head = original.group(1)
-    original_text = original.group(2)
     original = original_text
 
     try:
         # 成语/习语检测
-        if IDIOMS and any([string.find(idiom) in range(l_pos, r_pos) for idiom in IDIOMS]):
+        i = bisect_left(idiom_starts, l_pos)
+        if i < len(idiom_starts) and idiom_starts[i] < r_pos:
             final = original
 
         # 模糊表达检测
@@ -546,36 +600,26 @@ def _replace(original):
         elif _time_value.fullmatch(original):
             final = _convert_time_value(original)
 
-        # 纯数字
-        elif _pure_num.fullmatch(_strip_trailing_unit(original)):
-            final = _convert_pure_num(original)
-
-        # 连续数值
-        elif _is_consecutive_value(original):
-            final = _split_consecutive_value(original)
-
-        # 数值
-        elif _value_num.fullmatch(_strip_trailing_unit(original)):
-            final = _convert_value_num(original)
-
-        # 百分数
-        elif _percent_value.fullmatch(original):
-            final = _convert_percent_value(original)
+        else:
+            # 纯数字与数值都匹配去掉末尾单位后的文本，只剥离一次
+            stripped = _strip_trailing_unit(original)
 
-        # 分数
-        elif _fraction_value.fullmatch(original):
-            final = _convert_fraction_value(original)
+            # 纯数字
+            if _pure_num.fullmatch(stripped):
+                final = _convert_pure_num(original)
 
-        # 比值
-        elif _ratio_value.fullmatch(original):
-            final = _convert_ratio_value(original)
+            # 连续数值
+            elif _is_consecutive_value(original):
+                final = _split_consecutive_value(original)
 
-        # 日期
-        elif _date_value.fullmatch(original):
-            final = _convert_date_value(original)
+            # 数值
+            elif _value_num.fullmatch(stripped):
+                final = _convert_value_num(original)
 
-        else:
-            final = original
+            # 百分数 / 分数 / 比值 / 日期：一次 fullmatch，按命中的分组分派
+            else:
+                tail = _tail_value.fullmatch(original)
+                final = _TAIL_CONVERTERS[tail.lastgroup](original) if tail else original
 
         if head:
             final = head + final
@@ -627,17 +671,35 @@ class ChineseITN:
         if not text:
             return text
 
-        # 儿化移除 (在 ITN 之前)
-        if self.erhua_remove:
-            text = remove_erhua(text)
+        # 短句 (如 "好的"、重复的时间戳) 在实时字幕中反复出现，结果按 (文本, 配置) 缓存
+        if len(text) <= _CACHE_MAX_TEXT_LEN:
+            return _convert_cached(text, self.erhua_remove)
+        return _convert_text(text, self.erhua_remove)
+
+
+# 参与缓存的最大文本长度，长文本几乎不会重复
+_CACHE_MAX_TEXT_LEN = 512
+
+
+def _convert_text(text: str, erhua_remove: bool) -> str:
+    """ChineseITN.convert 的实现"""
+    # 儿化移除 (在 ITN 之前)
+    if erhua_remove:
+        text = remove_erhua(text)
+
+    # Meeting-friendly pre-normalization:
+    # - normalize 〇/○ zero circles in numeric contexts
+    # - convert common spoken time phrases (两点半/十点整/…)
+    text = _pre_normalize_zero_circles(text)
+    text = _pre_normalize_meeting_time_phrases(text)
+
+    # 成语只扫描一遍，所有匹配共用
+    idiom_starts = _idiom_starts(text)
+    return _pattern.sub(lambda m: _replace(m, idiom_starts), text)
 
-        # Meeting-friendly pre-normalization:
-        # - normalize 〇/○ zero circles in numeric contexts
-        # - convert common spoken time phrases (两点半/十点整/…)
-        text = _pre_normalize_zero_circles(text)
-        text = _pre_normalize_meeting_time_phrases(text)
 
-        return _pattern.sub(_replace, text)
+# 所有实例共用，chinese_to_num 每次新建的实例同样命中
+_convert_cached = lru_cache(maxsize=4096)(_convert_text)
 
 
 # 便捷函数
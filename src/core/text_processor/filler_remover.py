@@ -19,7 +19,8 @@
 __all__ = ['FillerRemover']
 
 import re
-from typing import List, Optional, Set
+from functools import lru_cache
+from typing import List, Optional, Pattern, Set, Tuple
 
 
 # 语气填充词 (单字)
@@ -45,6 +46,53 @@ SENTENCE_START_FILLERS = [
 ]
 
 
+# 结果清理用的正则
+_WHITESPACE_RUN = re.compile(r'\s+')
+_SPACE_BEFORE_PUNC = re.compile(r'\s+([，。？！；：,.?!;:])')
+
+
+@lru_cache(maxsize=8)
+def _compile_patterns(
+    aggressive: bool,
+    custom_fillers: Tuple[str, ...],
+) -> Tuple[Optional[Pattern], Pattern, Optional[Pattern]]:
+    """编译 (多字填充词, 句首语气词, 独立语气词) 正则，相同配置的实例共用"""
+    # 多字填充词 (按长度降序，优先匹配长词)
+    phrases = list(FILLER_PHRASES)
+    if aggressive:
+        phrases.extend(FILLER_REPETITIONS)
+    phrases.extend(custom_fillers)
+    phrases = sorted(set(phrases), key=len, reverse=True)
+
+    # 单字语气词
+    interjections = set(FILLER_INTERJECTIONS)
+
+    # 构建正则模式
+    # 多字填充词模式
+    if phrases:
+        phrase_pattern = '|'.join(re.escape(p) for p in phrases)
+        phrase_regex = re.compile(f'({phrase_pattern})')
+    else:
+        phrase_regex = None
+
+    # 句首单字语气词模式 (只在句首或标点后移除)
+    interjection_chars = ''.join(interjections)
+    # 匹配: 开头的语气词 或 标点后的语气词
+    start_filler_regex = re.compile(
+        rf'^[{re.escape(interjection_chars)}]+|(?<=[，。？！；：,.?!;:])[{re.escape(interjection_chars)}]+'
+    )
+
+    # 激进模式: 移除独立的单字语气词 (前后是标点或空格)
+    if aggressive:
+        standalone_filler_regex = re.compile(
+            rf'(?<=[，。？！；：,.?!;:\s])[{re.escape(interjection_chars)}](?=[，。？！；：,.?!;:\s])'
+        )
+    else:
+        standalone_filler_regex = None
+
+    return phrase_regex, start_filler_regex, standalone_filler_regex
+
+
 class FillerRemover:
     """口语填充词移除器
 
@@ -71,39 +119,12 @@ class FillerRemover:
         self._build_patterns()
 
     def _build_patterns(self):
-        """构建匹配模式"""
-        # 多字填充词 (按长度降序，优先匹配长词)
-        phrases = list(FILLER_PHRASES)
-        if self.aggressive:
-            phrases.extend(FILLER_REPETITIONS)
-        phrases.extend(self.custom_fillers)
-        phrases = sorted(set(phrases), key=len, reverse=True)
-
-        # 单字语气词
-        interjections = set(FILLER_INTERJECTIONS)
-
-        # 构建正则模式
-        # 多字填充词模式
-        if phrases:
-            phrase_pattern = '|'.join(re.escape(p) for p in phrases)
-            self._phrase_regex = re.compile(f'({phrase_pattern})')
-        else:
-            self._phrase_regex = None
-
-        # 句首单字语气词模式 (只在句首或标点后移除)
-        interjection_chars = ''.join(interjections)
-        # 匹配: 开头的语气词 或 标点后的语气词
-        self._start_filler_regex = re.compile(
-            rf'^[{re.escape(interjection_chars)}]+|(?<=[，。？！；：,.?!;:])[{re.escape(interjection_chars)}]+'
-        )
-
-        # 激进模式: 移除独立的单字语气词 (前后是标点或空格)
-        if self.aggressive:
-            self._standalone_filler_regex = re.compile(
-                rf'(?<=[，。？！；：,.?!;:\s])[{re.escape(interjection_chars)}](?=[，。？！；：,.?!;:\s])'
-            )
-        else:
-            self._standalone_filler_regex = None
+        """构建匹配模式 (按配置缓存编译结果)"""
+        (
+            self._phrase_regex,
+            self._start_filler_regex,
+            self._standalone_filler_regex,
+        ) = _compile_patterns(self.aggressive, tuple(sorted(set(self.custom_fillers))))
 
     def remove(self, text: str) -> str:
         """移除填充词
@@ -131,10 +152,10 @@ class FillerRemover:
             result = self._standalone_filler_regex.sub('', result)
 
         # 4. 清理多余空格
-        result = re.sub(r'\s+', ' ', result).strip()
+        result = _WHITESPACE_RUN.sub(' ', result).strip()
 
         # 5. 清理标点前的空格
-        result = re.sub(r'\s+([，。？！；：,.?!;:])', r'\1', result)
+        result = _SPACE_BEFORE_PUNC.sub(r'\1', result)
 
         return result
 
@@ -173,8 +194,13 @@ def remove_fillers(text: str, aggressive: bool = False) -> str:
     Returns:
         移除填充词后的文本
     """
-    remover = FillerRemover(aggressive=aggressive)
-    return remover.remove(text)
+    return _default_remover(aggressive).remove(text)
+
+
+@lru_cache(maxsize=2)
+def _default_remover(aggressive: bool) -> FillerRemover:
+    """remove_fillers 使用的共享实例 (移除器无可变状态)"""
+    return FillerRemover(aggressive=aggressive)
 
 
 if __name__ == "__main__":
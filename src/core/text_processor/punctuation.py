@@ -17,6 +17,8 @@ __all__ = [
 
 import re
 
+import numpy as np
+
 
 # 全角标点到半角标点的映射
 FULL_TO_HALF = {
@@ -40,6 +42,25 @@ FULL_TO_HALF = {
     ''': "'",
 }
 
+# add_space=False 时使用的映射 (去掉标点后的空格)，模块加载时生成一次
+_FULL_TO_HALF_NOSPACE = {k: v.strip() for k, v in FULL_TO_HALF.items()}
+
+
+def _split_mapping(mapping: dict):
+    """拆分为 (单字符 translate 表, 多字符键的 (正则, 映射))，无多字符键时后者为 None"""
+    single = {k: v for k, v in mapping.items() if len(k) == 1}
+    multi = {k: v for k, v in mapping.items() if len(k) != 1}
+    if not multi:
+        return str.maketrans(single), None
+    pattern = re.compile('|'.join(re.escape(k) for k in multi))
+    return str.maketrans(single), (pattern, multi)
+
+
+# 单字符键一次 str.translate 完成 (可输出多字符值；值不含其他键，与逐个 replace 等价)，
+# 多字符键互不重叠，再用一个预编译正则单遍替换
+_FULL_TO_HALF_TRANS, _FULL_TO_HALF_MULTI = _split_mapping(FULL_TO_HALF)
+_FULL_TO_HALF_NOSPACE_TRANS, _FULL_TO_HALF_NOSPACE_MULTI = _split_mapping(_FULL_TO_HALF_NOSPACE)
+
 # 半角标点到全角标点的映射（用于反向转换）
 HALF_TO_FULL = {
     ',': '，',
@@ -55,6 +76,8 @@ HALF_TO_FULL = {
     '"': '"',
     "'": '\u2018',  # Left single quotation mark '
 }
+# 值均不是其他键，单遍 str.translate 与逐个 replace 等价
+_HALF_TO_FULL_TRANS = str.maketrans(HALF_TO_FULL)
 
 # 全角 ASCII 字符映射表 (QJ2BJ)
 # 全角 ASCII: U+FF01 (！) 到 U+FF5E (~)，对应半角 0x21 到 0x7E
@@ -62,6 +85,61 @@ HALF_TO_FULL = {
 FULLWIDTH_ASCII = {chr(0xFF01 + i): chr(0x21 + i) for i in range(94)}
 FULLWIDTH_ASCII['\u3000'] = ' '  # 全角空格
 
+
+def _fullwidth_table(include_letters: bool, include_digits: bool, include_space: bool) -> dict:
+    """按开关生成全角 → 半角的 str.translate 表"""
+    table = {}
+    for full, half in FULLWIDTH_ASCII.items():
+        if full == '\u3000':
+            if include_space:
+                table[ord(full)] = half
+        elif half.isalpha():
+            if include_letters:
+                table[ord(full)] = half
+        elif half.isdigit():
+            if include_digits:
+                table[ord(full)] = half
+        else:
+            table[ord(full)] = half
+    return table
+
+
+# (include_letters, include_digits, include_space) -> 转换表，8 种组合预先生成
+_FULLWIDTH_TABLES = {
+    (letters, digits, space): _fullwidth_table(letters, digits, space)
+    for letters in (True, False)
+    for digits in (True, False)
+    for space in (True, False)
+}
+
+# 长文本改用 NumPy 按码点整体平移: 全角 ASCII 与半角相差固定偏移 0xFEE0。
+# 短文本编码/解码的开销大于收益，仍走 str.translate
+_NUMPY_MIN_LEN = 1024
+_FULLWIDTH_OFFSET = 0xFF01 - 0x21
+# (include_letters, include_digits) -> U+FF01..U+FF5E 中哪些需要转换
+_FULLWIDTH_NP_ALLOWED = {
+    (letters, digits): np.array(
+        [0xFF01 + i in _FULLWIDTH_TABLES[(letters, digits, False)] for i in range(94)]
+    )
+    for letters in (True, False)
+    for digits in (True, False)
+}
+
+
+def _normalize_fullwidth_np(text: str, include_letters: bool, include_digits: bool, include_space: bool) -> str:
+    """normalize_fullwidth 的向量化实现，结果与 str.translate 一致"""
+    # surrogatepass: 孤立代理码点 (如截断的 emoji) 原样往返，与 str.translate 一致
+    codes = np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype='<u4').copy()
+    # 无符号减法使范围外码点回绕为大数，一次比较即可得到 U+FF01..U+FF5E 掩码
+    index = codes - 0xFF01
+    mask = index < 94
+    if not (include_letters and include_digits):
+        mask[mask] = _FULLWIDTH_NP_ALLOWED[(include_letters, include_digits)][index[mask]]
+    codes[mask] -= _FULLWIDTH_OFFSET
+    if include_space:
+        codes[codes == 0x3000] = 0x20
+    return codes.tobytes().decode('utf-32-le', 'surrogatepass')
+
 # 中文标点集合
 CHINESE_PUNCTUATION = set('，。？！：；、''""（）【】《》')
 # 英文标点集合
@@ -73,6 +151,9 @@ ALL_PUNCTUATION = CHINESE_PUNCTUATION | ENGLISH_PUNCTUATION | {' '}
 _DUPLICATE_PUNC_PATTERN = re.compile(r'([，。？！,\.?!])\1+')
 # 混合标点模式 (如 "。." 或 ",，")
 _MIXED_PUNC_PATTERN = re.compile(r'([，。？！])([,\.?!])|([,\.?!])([，。？！])')
+# 单遍扫描: 连续两个以上的标点 (去重与混合合并只发生在其中) 或多余空格。
+# 标点连串合并后至少保留一个字符，不会让两侧空格相连，因此可与空格合并同遍处理
+_PUNC_RUN_OR_SPACES = re.compile(r'(?P<run>[，。？！,\.?!]{2,})|(?P<spaces> {2,})')
 
 
 def merge_punctuation(text: str, prefer_chinese: bool = True) -> str:
@@ -94,9 +175,6 @@ def merge_punctuation(text: str, prefer_chinese: bool = True) -> str:
     if not text:
         return text
 
-    # 移除重复标点
-    text = _DUPLICATE_PUNC_PATTERN.sub(r'\1', text)
-
     # 处理混合标点
     def _merge_mixed(match):
         groups = match.groups()
@@ -109,12 +187,15 @@ def merge_punctuation(text: str, prefer_chinese: bool = True) -> str:
             return groups[3] if prefer_chinese else groups[2]
         return match.group(0)
 
-    text = _MIXED_PUNC_PATTERN.sub(_merge_mixed, text)
-
-    # 移除多余空格
-    text = re.sub(r' {2,}', ' ', text)
+    def _merge(match):
+        if match.lastgroup == 'spaces':
+            # 移除多余空格
+            return ' '
+        # 标点连串: 先移除重复标点，再处理混合标点
+        run = _DUPLICATE_PUNC_PATTERN.sub(r'\1', match.group())
+        return _MIXED_PUNC_PATTERN.sub(_merge_mixed, run)
 
-    return text
+    return _PUNC_RUN_OR_SPACES.sub(_merge, text)
 
 
 def convert_full_to_half(text: str, add_space: bool = True) -> str:
@@ -131,13 +212,14 @@ def convert_full_to_half(text: str, add_space: bool = True) -> str:
     if not text:
         return text
 
-    mapping = FULL_TO_HALF if add_space else {
-        k: v.strip() for k, v in FULL_TO_HALF.items()
-    }
-
-    result = text
-    for full, half in mapping.items():
-        result = result.replace(full, half)
+    if add_space:
+        table, multi = _FULL_TO_HALF_TRANS, _FULL_TO_HALF_MULTI
+    else:
+        table, multi = _FULL_TO_HALF_NOSPACE_TRANS, _FULL_TO_HALF_NOSPACE_MULTI
+    result = text.translate(table)
+    if multi is not None:
+        pattern, mapping = multi
+        result = pattern.sub(lambda m: mapping[m.group()], result)
     return result
 
 
@@ -154,10 +236,7 @@ def convert_half_to_full(text: str) -> str:
     if not text:
         return text
 
-    result = text
-    for half, full in HALF_TO_FULL.items():
-        result = result.replace(half, full)
-    return result
+    return text.translate(_HALF_TO_FULL_TRANS)
 
 
 def normalize_fullwidth(
@@ -181,34 +260,10 @@ def normalize_fullwidth(
     if not text:
         return text
 
-    result = []
-    for char in text:
-        code = ord(char)
-
-        # 全角空格
-        if char == '\u3000':
-            if include_space:
-                result.append(' ')
-            else:
-                result.append(char)
-            continue
-
-        # 全角 ASCII 范围: U+FF01 到 U+FF5E
-        if 0xFF01 <= code <= 0xFF5E:
-            half_code = code - 0xFF01 + 0x21
-            half_char = chr(half_code)
-
-            # 检查是否需要转换
-            if half_char.isalpha() and not include_letters:
-                result.append(char)
-            elif half_char.isdigit() and not include_digits:
-                result.append(char)
-            else:
-                result.append(half_char)
-        else:
-            result.append(char)
-
-    return ''.join(result)
+    key = (bool(include_letters), bool(include_digits), bool(include_space))
+    if len(text) >= _NUMPY_MIN_LEN:
+        return _normalize_fullwidth_np(text, *key)
+    return text.translate(_FULLWIDTH_TABLES[key])
 
 
 class PunctuationConverter:
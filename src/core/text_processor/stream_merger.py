@@ -8,7 +8,7 @@
 算法参考 CapsWriter-Offline text_merge.py
 """
 
-from typing import Tuple, Optional
+from typing import List, Tuple, Optional
 
 __all__ = ['StreamTextMerger']
 
@@ -34,6 +34,26 @@ def levenshtein_distance(s1: str, s2: str) -> int:
     return prev_row[-1]
 
 
+def longest_suffix_prefix(old_text: str, new_text: str, limit: int) -> int:
+    """old_text 的后缀与 new_text 的前缀的最长重合长度 (不超过 limit)
+
+    对 new[:limit] + 分隔符 + old[-limit:] 计算 KMP 前缀函数，末位即所求，
+    单次线性扫描，代价 O(limit) 与累计文本长度无关。
+    """
+    if limit <= 0:
+        return 0
+    s = new_text[:limit] + "\x00" + old_text[-limit:]
+    pi = [0] * len(s)
+    for i in range(1, len(s)):
+        k = pi[i - 1]
+        while k and s[i] != s[k]:
+            k = pi[k - 1]
+        if s[i] == s[k]:
+            k += 1
+        pi[i] = k
+    return pi[-1]
+
+
 class StreamTextMerger:
     """
     流式文本合并器
@@ -71,7 +91,28 @@ class StreamTextMerger:
         self.overlap_chars = overlap_chars
         self.error_tolerance = error_tolerance
         self.max_overlap_check = max_overlap_check
-        self.buffer = ""
+        # 已输出文本按片段保存，避免每次追加都复制整段缓冲；
+        # 重叠检测只需要末尾 max_overlap_check 个字符
+        self._tail_len = max(max_overlap_check, overlap_chars)
+        self._parts: List[str] = []
+        self._tail = ""
+
+    @property
+    def buffer(self) -> str:
+        """完整合并文本 (按需拼接)"""
+        if len(self._parts) > 1:
+            self._parts = ["".join(self._parts)]
+        return self._parts[0] if self._parts else ""
+
+    @buffer.setter
+    def buffer(self, text: str):
+        self._parts = [text] if text else []
+        self._tail = text[-self._tail_len:]
+
+    def _append(self, text: str):
+        if text:
+            self._parts.append(text)
+            self._tail = (self._tail + text)[-self._tail_len:]
 
     def reset(self):
         """重置缓冲区"""
@@ -94,21 +135,21 @@ class StreamTextMerger:
         if not new_text:
             return ""
 
-        if not self.buffer:
+        if not self._parts:
             self.buffer = new_text
             return new_text
 
-        # 查找重叠
-        overlap_len, is_exact = self._find_overlap(self.buffer, new_text)
+        # 查找重叠 (只看缓冲末尾)
+        overlap_len, is_exact = self._find_overlap(self._tail, new_text)
 
         if overlap_len > 0:
             # 有重叠，只追加新的部分
             delta = new_text[overlap_len:]
-            self.buffer += delta
+            self._append(delta)
             return delta
         else:
             # 无重叠，完整追加
-            self.buffer += new_text
+            self._append(new_text)
             return new_text
 
     def _find_overlap(self, old_text: str, new_text: str) -> Tuple[int, bool]:
@@ -131,12 +172,10 @@ class StreamTextMerger:
         if max_check < 2:
             return 0, False
 
-        # Phase 1: 精确匹配
-        for overlap in range(min(max_check, self.overlap_chars), 0, -1):
-            old_suffix = old_text[-overlap:]
-            new_prefix = new_text[:overlap]
-            if old_suffix == new_prefix:
-                return overlap, True
+        # Phase 1: 精确匹配 (单次 KMP 扫描)
+        overlap = longest_suffix_prefix(old_text, new_text, min(max_check, self.overlap_chars))
+        if overlap > 0:
+            return overlap, True
 
         # Phase 2: 模糊匹配 (允许容差)
         if self.error_tolerance > 0:
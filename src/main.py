@@ -1,4 +1,5 @@
 """TingWu Speech Service 主入口"""
+import asyncio
 import logging
 from pathlib import Path
 from contextlib import asynccontextmanager
@@ -23,6 +24,8 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     """应用生命周期管理"""
     logger.info(f"Starting {settings.app_name} v{settings.version}")
+    # uvicorn[standard] 自带 uvloop，loop="auto" 时会优先使用
+    logger.info(f"Event loop: {type(asyncio.get_running_loop()).__module__}")
 
     # 加载所有热词相关文件
     from src.core.engine import transcription_engine
@@ -166,6 +169,12 @@ if __name__ == "__main__":
     parser.add_argument("--host", default=str(settings.host), help="Bind host (default: settings.host)")
     parser.add_argument("--port", type=int, default=int(settings.port), help="Bind port (default: settings.port)")
     parser.add_argument("--reload", action="store_true", help="Enable auto-reload (dev only)")
+    parser.add_argument(
+        "--loop",
+        choices=["auto", "uvloop", "asyncio"],
+        default="auto",
+        help="Event loop implementation (default: auto, uses uvloop when installed)",
+    )
     args = parser.parse_args()
 
     uvicorn.run(
@@ -173,4 +182,5 @@ if __name__ == "__main__":
         host=str(args.host),
         port=int(args.port),
         reload=bool(args.reload),
+        loop=args.loop,
     )
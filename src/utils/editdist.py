@@ -0,0 +1,142 @@
+"""
+Numba 加速的编辑距离
+
+将字符/词序列编码为 int32 数组后，在 JIT 内核中执行两行滚动的
+对角带 DP (Ukkonen)，供批量评估 (CER/WER) 使用。
+"""
+
+from typing import Dict, List, Sequence
+
+import numpy as np
+from numba import njit
+
+__all__ = [
+    'encode_chars',
+    'encode_tokens',
+    'bounded_levenshtein',
+    'levenshtein_codes',
+]
+
+# 对角带初始宽度，未命中时逐次翻倍
+_INITIAL_BAND = 8
+
+
+@njit(cache=True, boundscheck=False)
+def _banded_levenshtein(a, b, k):
+    """带宽为 k 的 Levenshtein 距离 (Ukkonen 对角带)
+
+    只计算 |i - j| <= k 的单元格；距离超过 k 时返回 k + 1。
+    """
+    # 以较短序列作为行，内存 O(min(m, n))
+    if len(a) < len(b):
+        a, b = b, a
+    m, n = len(a), len(b)
+    big = k + 1
+    if m - n > k:
+        return big
+    if n == 0:
+        return m
+
+    prev = np.full(n + 1, big, dtype=np.int32)
+    curr = np.full(n + 1, big, dtype=np.int32)
+    for j in range(min(n, k) + 1):
+        prev[j] = j
+
+    for i in range(1, m + 1):
+        lo = max(1, i - k)
+        hi = min(n, i + k)
+        if lo == 1:
+            curr[0] = i if i <= k else big
+        else:
+            curr[lo - 1] = big
+        row_min = curr[lo - 1]
+
+        ai = a[i - 1]
+        for j in range(lo, hi + 1):
+            if ai == b[j - 1]:
+                v = prev[j - 1]
+            else:
+                v = prev[j]
+                if curr[j - 1] < v:
+                    v = curr[j - 1]
+                if prev[j - 1] < v:
+                    v = prev[j - 1]
+                v += 1
+                if v > big:
+                    v = big
+            curr[j] = v
+            if v < row_min:
+                row_min = v
+        if hi < n:
+            curr[hi + 1] = big
+
+        # 路径上的代价单调不减，整行都超过 k 即可提前放弃
+        if row_min > k:
+            return big
+        prev, curr = curr, prev
+
+    return prev[n]
+
+
+def encode_chars(text: str) -> np.ndarray:
+    """将字符串编码为 Unicode 码点数组
+
+    按内容选择最窄的类型: ASCII 用 uint8，BMP (含常用汉字) 用 uint16，
+    其余用 int32，以减少 DP 内核的内存带宽。
+    """
+    if text.isascii():
+        return np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+    data = text.encode('utf-16-le', 'surrogatepass')
+    if len(data) == 2 * len(text):
+        # 无代理对: UTF-16 码元即码点
+        return np.frombuffer(data, dtype=np.uint16)
+    return np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype=np.int32)
+
+
+def _common_dtype(a: np.ndarray, b: np.ndarray):
+    """统一两个序列的类型，避免为每种类型组合单独编译内核"""
+    if a.dtype != b.dtype:
+        dtype = np.promote_types(a.dtype, b.dtype)
+        a, b = a.astype(dtype), b.astype(dtype)
+    return a, b
+
+
+def encode_tokens(*sequences: Sequence[str]) -> List[np.ndarray]:
+    """将若干词序列按共享词表编码为 int32 数组"""
+    vocab: Dict[str, int] = {}
+    encoded = []
+    for seq in sequences:
+        ids = [vocab.setdefault(tok, len(vocab)) for tok in seq]
+        encoded.append(np.array(ids, dtype=np.int32))
+    return encoded
+
+
+def bounded_levenshtein(a: np.ndarray, b: np.ndarray, max_k: int) -> int:
+    """
+    计算编辑距离，上限为 max_k
+
+    从较窄的对角带开始，每次失败后带宽翻倍；对近似相同的序列
+    (ASR 评估中 CER 通常 < 10%) 只需计算 O(k·n) 个单元格。
+
+    Returns:
+        距离 (<= max_k)；超过 max_k 时返回 max_k + 1
+    """
+    a, b = _common_dtype(a, b)
+    k = max(_INITIAL_BAND, abs(len(a) - len(b)))
+    while k < max_k:
+        dist = _banded_levenshtein(a, b, k)
+        if dist <= k:
+            return int(dist)
+        k *= 2
+    return int(_banded_levenshtein(a, b, max_k))
+
+
+def levenshtein_codes(a: np.ndarray, b: np.ndarray) -> int:
+    """计算两个 int32 编码序列的编辑距离 (精确值)"""
+    return bounded_levenshtein(a, b, max(len(a), len(b)))
+
+
+# 预热: 导入时为各编码类型触发编译 (cache=True 时后续进程直接读缓存)
+for _dtype in (np.uint8, np.uint16, np.int32):
+    _banded_levenshtein(np.zeros(1, dtype=_dtype), np.zeros(1, dtype=_dtype), 1)
+del _dtype
@@ -25,6 +25,25 @@ class TestLcsLength:
     def test_no_match(self):
         assert lcs_length("abc", "xyz") == 0
 
+    def test_long_strings(self):
+        # 超过 64 个字符时位掩码跨多个机器字
+        s1 = "ab" * 50
+        s2 = "ba" * 50 + "c"
+        assert lcs_length(s1, s2) == 99
+        assert lcs_length(s2, s1) == 99
+
+
+class TestPhoneme:
+    def test_frozen_with_cached_info(self):
+        import dataclasses
+
+        p = Phoneme("3", "zh", is_word_end=True)
+        assert p.is_tone
+        assert p.info == ("3", "zh", False, True, True, 0, 0)
+        assert hash(p) == hash(Phoneme("3", "zh", is_word_end=True))
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            p.value = "4"
+
 
 class TestGetPhonemeCost:
     def test_identical_phonemes(self):
@@ -88,6 +107,16 @@ class TestFuzzySubstringScore:
         score = fuzzy_substring_score(hw, inp)
         assert score > 0.6
 
+    def test_distance_cutoff(self):
+        from src.core.hotword.algo_calc import fuzzy_substring_distance
+
+        hw = [p.info for p in get_phoneme_info("麦当劳")]
+        near = [p.info for p in get_phoneme_info("我想去买当劳")]
+        far = [p.info for p in get_phoneme_info("今天天气")]
+        exact = fuzzy_substring_distance(hw, near)
+        assert fuzzy_substring_distance(hw, near, max_dist=exact) == exact
+        assert fuzzy_substring_distance(hw, far, max_dist=1.0) == float('inf')
+
 
 class TestFuzzySubstringSearchConstrained:
     def test_find_match_with_boundary(self):
@@ -102,3 +131,32 @@ class TestFuzzySubstringSearchConstrained:
         inp = [p.info for p in get_phoneme_info("今天天气")]
         results = fuzzy_substring_search_constrained(hw, inp, threshold=0.8)
         assert len(results) == 0
+
+
+class TestEncodedPhonemes:
+    def test_encoded_inputs_match_tuple_inputs(self):
+        from src.core.hotword.algo_calc import encode_phonemes, fuzzy_substring_distance
+        hw = [p.info for p in get_phoneme_info("科大讯飞")]
+        inp = [p.info for p in get_phoneme_info("科大迅飞的 caps writer 识别")]
+        expected = fuzzy_substring_search_constrained(hw, inp, threshold=0.6)
+        encoded = fuzzy_substring_search_constrained(
+            encode_phonemes(hw), encode_phonemes(inp), threshold=0.6
+        )
+        assert encoded == expected
+        assert fuzzy_substring_distance(encode_phonemes(hw), inp) == fuzzy_substring_distance(hw, inp)
+
+    def test_batch_search_matches_per_hotword_search(self):
+        from src.core.hotword.algo_calc import fuzzy_substring_search_constrained_many
+        hws = [[p.info for p in get_phoneme_info(w)] for w in ("科大讯飞", "麦当劳", "caps")]
+        inp = [p.info for p in get_phoneme_info("科大迅飞和买当劳 caps")]
+        batched = fuzzy_substring_search_constrained_many(hws, inp, threshold=0.5)
+        assert batched == [fuzzy_substring_search_constrained(hw, inp, threshold=0.5) for hw in hws]
+        assert batched[0] and batched[1]
+
+    def test_english_words_use_lcs_cost(self):
+        hw = [p.info for p in get_phoneme_info("capswriter", split_char=False)]
+        inp = [p.info for p in get_phoneme_info("use capwriter", split_char=False)]
+        exact = fuzzy_substring_score(hw, [p.info for p in get_phoneme_info("use capswriter", split_char=False)])
+        partial = fuzzy_substring_score(hw, inp)
+        assert exact == 1.0
+        assert 0.0 < partial < 1.0
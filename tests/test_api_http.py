@@ -56,6 +56,19 @@ def test_backend_info_endpoint(client):
 
     assert data["speaker_unsupported_behavior"] in {"error", "fallback", "ignore"}
 
+def test_backend_info_capabilities_cached_until_invalidated(client):
+    from src.api.routes.backend import invalidate_backend_capabilities
+    import src.core.engine as engine_mod
+
+    backend = engine_mod.model_manager.backend
+    assert client.get("/api/v1/backend").json()["capabilities"]["supports_streaming"] is False
+
+    backend.supports_streaming = True
+    assert client.get("/api/v1/backend").json()["capabilities"]["supports_streaming"] is False
+
+    invalidate_backend_capabilities()
+    assert client.get("/api/v1/backend").json()["capabilities"]["supports_streaming"] is True
+
 def test_transcribe_endpoint(client):
     """测试转写接口"""
     # Route uses `await transcription_engine.transcribe_auto_async(...)`, so patch that
@@ -45,11 +45,14 @@ def test_connection_state_reset():
     state = ConnectionState()
     state.is_speaking = True
     state.asr_cache = {"key": "value"}
+    state.frames.extend(b"\x01\x00")
+    state.online_offset = 2
 
     state.reset()
 
     assert state.is_speaking == False
     assert state.asr_cache == {}
+    assert not state.frames and state.online_offset == 0
 
 def test_connection_state_defaults():
     """测试默认值"""
@@ -60,3 +63,307 @@ def test_connection_state_defaults():
     assert state.mode == "2pass"
     assert state.chunk_interval == 10
     assert state.hotwords is None
+    assert state.online_chunks_since_flush == 0
+    assert state.frames == bytearray() and state.online_offset == 0
+
+
+def _make_realtime_client(monkeypatch, online_text="你好", offline_text="你好世界"):
+    """构造仅挂载 /ws/realtime 的测试客户端，ASR 模型全部使用 Mock"""
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    import src.api.routes.websocket as ws_route
+
+    online_model = MagicMock()
+    online_model.generate.return_value = [{"text": online_text, "cache": {}}]
+    offline_model = MagicMock()
+    offline_model.generate.return_value = [{"text": offline_text}]
+
+    mock_mm = MagicMock()
+    mock_mm.backend.supports_streaming = True
+    mock_mm.backend.get_info.return_value = {"name": "MockBackend", "type": "pytorch"}
+    mock_mm.loader.asr_model_online = online_model
+    mock_mm.loader.asr_model = offline_model
+
+    monkeypatch.setattr(ws_route, "model_manager", mock_mm)
+    monkeypatch.setattr(ws_route.settings, "ws_heartbeat_interval", 0)
+    monkeypatch.setattr(ws_route.settings, "stream_dedup_enable", False)
+
+    app = FastAPI()
+    app.include_router(ws_route.router)
+    return TestClient(app), online_model, offline_model
+
+
+def test_ws_realtime_online_then_offline(monkeypatch):
+    """测试在线分块识别与说话结束后的离线识别"""
+    import json
+
+    client, online_model, offline_model = _make_realtime_client(monkeypatch)
+
+    with client.websocket_connect("/ws/realtime") as ws:
+        assert ws.receive_json()["type"] == "connected"
+
+        ws.send_text(json.dumps({"is_speaking": True, "mode": "2pass", "chunk_interval": 2}))
+        ws.send_bytes(b"\x01\x00" * 8)
+        ws.send_bytes(b"\x02\x00" * 8)
+
+        msg = ws.receive_json()
+        assert msg == {"mode": "2pass-online", "text": "你好", "is_final": False}
+        assert online_model.generate.call_args.kwargs["input"] == b"\x01\x00" * 8 + b"\x02\x00" * 8
+
+        ws.send_text(json.dumps({"is_speaking": False}))
+        ws.send_bytes(b"\x03\x00" * 8)
+
+        msg = ws.receive_json()
+        assert msg == {"mode": "2pass-offline", "text": "你好世界", "is_final": True}
+        assert offline_model.generate.call_args.kwargs["input"] == [
+            b"\x01\x00" * 8 + b"\x02\x00" * 8 + b"\x03\x00" * 8
+        ]
+
+
+def test_ws_realtime_final_text_corrected_off_event_loop(monkeypatch):
+    """最终文本的热词纠错在后处理线程中执行"""
+    import json
+    import threading
+    import src.api.routes.websocket as ws_route
+
+    client, _, _ = _make_realtime_client(monkeypatch, offline_text="你好世界")
+
+    correct_threads = []
+
+    def fake_correct(text):
+        correct_threads.append(threading.current_thread().name)
+        return MagicMock(text=text + "!")
+
+    engine = MagicMock(_hotwords_loaded=True)
+    engine.corrector.correct.side_effect = fake_correct
+    monkeypatch.setattr(ws_route, "transcription_engine", engine)
+
+    with client.websocket_connect("/ws/realtime") as ws:
+        assert ws.receive_json()["type"] == "connected"
+        ws.send_text(json.dumps({"is_speaking": False, "mode": "offline"}))
+        ws.send_bytes(b"\x01\x00" * 8)
+
+        msg = ws.receive_json()
+        assert msg == {"mode": "offline", "text": "你好世界!", "is_final": True}
+
+    assert correct_threads and correct_threads[0].startswith("postprocess_")
+
+
+def test_ws_realtime_streams_llm_polish_after_offline_result(monkeypatch):
+    """开启 llm_polish 后，离线结果之后逐段下发润色增量并以完整文本结束"""
+    import json
+    import src.api.routes.websocket as ws_route
+
+    client, _, _ = _make_realtime_client(monkeypatch, offline_text="你好世界")
+    monkeypatch.setattr(ws_route.settings, "llm_enable", True)
+
+    async def fake_polish_stream(text, role="default", similarity_candidates=None, cancel_token=None):
+        for delta in ("你好，", "世界。"):
+            yield delta
+
+    engine = MagicMock(_hotwords_loaded=False)
+    engine._apply_llm_polish_stream = fake_polish_stream
+    monkeypatch.setattr(ws_route, "transcription_engine", engine)
+
+    with client.websocket_connect("/ws/realtime") as ws:
+        assert ws.receive_json()["type"] == "connected"
+        ws.send_text(json.dumps({"is_speaking": False, "mode": "offline", "llm_polish": True}))
+        ws.send_bytes(b"\x01\x00" * 8)
+
+        assert ws.receive_json() == {"mode": "offline", "text": "你好世界", "is_final": True}
+        assert ws.receive_json() == {"mode": "offline-polish", "delta": "你好，", "is_final": False}
+        assert ws.receive_json() == {"mode": "offline-polish", "delta": "世界。", "is_final": False}
+        assert ws.receive_json() == {"mode": "offline-polish", "text": "你好，世界。", "is_final": True}
+
+
+def test_ws_realtime_polish_does_not_block_next_utterance(monkeypatch):
+    """润色进行中仍识别后续语音，cancel_llm 可取消进行中与排队的润色"""
+    import asyncio
+    import json
+    import src.api.routes.websocket as ws_route
+
+    client, _, _ = _make_realtime_client(monkeypatch, offline_text="你好世界")
+    monkeypatch.setattr(ws_route.settings, "llm_enable", True)
+
+    async def slow_polish_stream(text, role="default", similarity_candidates=None, cancel_token=None):
+        if cancel_token.is_cancelled:
+            return
+        yield "你好，"
+        while not cancel_token.is_cancelled:
+            await asyncio.sleep(0.01)
+
+    engine = MagicMock(_hotwords_loaded=False)
+    engine._apply_llm_polish_stream = slow_polish_stream
+    monkeypatch.setattr(ws_route, "transcription_engine", engine)
+
+    with client.websocket_connect("/ws/realtime") as ws:
+        assert ws.receive_json()["type"] == "connected"
+        ws.send_text(json.dumps({"is_speaking": False, "mode": "offline", "llm_polish": True}))
+        ws.send_bytes(b"\x01\x00" * 8)
+        assert ws.receive_json() == {"mode": "offline", "text": "你好世界", "is_final": True}
+        assert ws.receive_json() == {"mode": "offline-polish", "delta": "你好，", "is_final": False}
+
+        # 第一段润色未结束，第二段语音照常识别
+        ws.send_bytes(b"\x02\x00" * 8)
+        assert ws.receive_json() == {"mode": "offline", "text": "你好世界", "is_final": True}
+
+        ws.send_text(json.dumps({"type": "cancel_llm"}))
+        assert ws.receive_json() == {"mode": "offline-polish", "text": "你好世界", "is_final": True}
+        assert ws.receive_json() == {"mode": "offline-polish", "text": "你好世界", "is_final": True}
+
+
+def test_result_writer_coalesces_partials_and_keeps_order():
+    """窗口内的在线增量合并为一条，最终结果与其他消息按序发送"""
+    import asyncio
+    import json
+    import src.api.routes.websocket as ws_route
+
+    sent = []
+    websocket = MagicMock()
+
+    async def send_text(data):
+        sent.append(json.loads(data))
+
+    websocket.send_text = send_text
+
+    async def run():
+        results = asyncio.Queue()
+        for item in (
+            ("2pass-online", "你好", False),
+            ("2pass-online", "世界", False),
+            ("2pass-offline", "你好世界", True),
+            ws_route.dumps_json({"mode": "2pass-offline-polish", "delta": "x", "is_final": False}),
+            ("2pass-online", "再见", False),
+        ):
+            results.put_nowait(item)
+        writer = asyncio.create_task(ws_route._result_writer(websocket, results))
+        await asyncio.sleep(ws_route._PARTIAL_COALESCE_S * 3)
+        writer.cancel()
+
+    asyncio.run(run())
+
+    assert sent == [
+        {"mode": "2pass-online", "text": "你好世界", "is_final": False},
+        {"mode": "2pass-offline", "text": "你好世界", "is_final": True},
+        {"mode": "2pass-offline-polish", "delta": "x", "is_final": False},
+        {"mode": "2pass-online", "text": "再见", "is_final": False},
+    ]
+
+
+def test_ws_realtime_non_streaming_backend_warns_and_uses_transcribe(monkeypatch):
+    """不支持流式的后端: 连接时发送警告，离线识别走 backend.transcribe"""
+    import json
+    import src.api.routes.websocket as ws_route
+
+    client, _, offline_model = _make_realtime_client(monkeypatch)
+    backend = ws_route.model_manager.backend
+    backend.supports_streaming = False
+    backend.get_info.return_value = {"name": "Remote", "type": "qwen3"}
+    backend.transcribe.return_value = {"text": "远程结果"}
+
+    for _ in range(2):
+        with client.websocket_connect("/ws/realtime") as ws:
+            warning = ws.receive_json()
+            assert warning["backend"] == "Remote"
+            assert ws.receive_json()["type"] == "connected"
+
+            ws.send_text(json.dumps({"is_speaking": False, "mode": "offline"}))
+            ws.send_bytes(b"\x01\x00" * 8)
+            assert ws.receive_json()["text"] == "远程结果"
+
+    # 能力探测按后端实例缓存
+    assert backend.get_info.call_count == 1
+    offline_model.generate.assert_not_called()
+
+
+def test_asr_online_reuses_cache_dict(monkeypatch):
+    """在线识别跨分块复用同一个 asr_cache，reset 原地清空"""
+    import asyncio
+    import src.api.routes.websocket as ws_route
+    from src.api.ws_manager import ConnectionState
+
+    seen = []
+
+    def fake_generate(input, cache, is_final, hotword):
+        seen.append(cache)
+        cache["step"] = cache.get("step", 0) + 1  # FunASR 原地更新
+        return [{"text": "x"}]
+
+    mock_mm = MagicMock()
+    mock_mm.loader.asr_model_online.generate.side_effect = fake_generate
+    monkeypatch.setattr(ws_route, "model_manager", mock_mm)
+
+    state = ConnectionState(is_speaking=True)
+    cache = state.asr_cache
+    asyncio.run(ws_route._asr_online(b"\x00\x00", state))
+    asyncio.run(ws_route._asr_online(b"\x00\x00", state))
+
+    assert seen[0] is seen[1] is cache
+    assert state.asr_cache == {"step": 2}
+
+    state.reset()
+    assert state.asr_cache is cache and cache == {}
+
+
+def test_asr_online_serializes_generate_across_sessions(monkeypatch):
+    """不同连接的在线识别共用同一模型时，generate 串行执行"""
+    import asyncio
+    import threading
+    import time
+    import src.api.routes.websocket as ws_route
+    from src.api.ws_manager import ConnectionState
+
+    active, overlaps = [0], []
+    guard = threading.Lock()
+
+    def fake_generate(input, cache, is_final, hotword):
+        with guard:
+            active[0] += 1
+            overlaps.append(active[0])
+        time.sleep(0.01)
+        with guard:
+            active[0] -= 1
+        return [{"text": hotword}]
+
+    mock_mm = MagicMock()
+    mock_mm.loader.asr_model_online.generate.side_effect = fake_generate
+    monkeypatch.setattr(ws_route, "model_manager", mock_mm)
+
+    states = [ConnectionState(is_speaking=True, hotwords=str(i)) for i in range(4)]
+
+    async def run():
+        return await asyncio.gather(*(ws_route._asr_online(b"\x00\x00", s) for s in states))
+
+    results = asyncio.run(run())
+    assert [r["text"] for r in results] == ["0", "1", "2", "3"]
+    assert max(overlaps) == 1
+
+
+def test_dumps_json_matches_stdlib_compact_output(monkeypatch):
+    import json
+
+    from src.api import ws_manager as ws_manager_mod
+
+    payload = {"mode": "2pass-offline", "text": "你好世界", "is_final": True}
+    expected = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+    assert ws_manager_mod.dumps_json(payload) == expected
+
+    assert ws_manager_mod.encode_result("2pass-offline", "你好世界", True) == expected
+
+    monkeypatch.setattr(ws_manager_mod, "ORJSON_AVAILABLE", False)
+    assert ws_manager_mod.dumps_json(payload) == expected
+    assert ws_manager_mod.encode_result("2pass-offline", "你好世界", True) == expected
+
+
+def test_hotwords_config_is_normalized_and_shared():
+    from src.api.routes import websocket as ws_route
+    from src.api.ws_manager import ConnectionState
+
+    a, b = ConnectionState(), ConnectionState()
+    ws_route._handle_config(a, {"hotwords": ["阿里巴巴", " 通义 ", ""]})
+    ws_route._handle_config(b, {"hotwords": ["阿里巴巴", " 通义 ", ""]})
+    assert a.hotwords == "阿里巴巴 通义"
+    assert a.hotwords is b.hotwords
+
+    ws_route._handle_config(a, {"hotwords": "  "})
+    assert a.hotwords is None
@@ -0,0 +1,59 @@
+import asyncio
+
+from src.core.asr_batcher import AsrBatcher
+
+
+def test_concurrent_requests_share_one_batch():
+    calls = []
+
+    def batch_fn(audios, hotwords):
+        calls.append((list(audios), hotwords))
+        return [{"text": a.decode()} for a in audios]
+
+    batcher = AsrBatcher(batch_fn, max_batch=8, window_s=0.05)
+
+    async def main():
+        return await asyncio.gather(
+            batcher.submit(b"a", "hw"),
+            batcher.submit(b"b", "hw"),
+            batcher.submit(b"c", "hw"),
+        )
+
+    results = asyncio.run(main())
+    assert [r["text"] for r in results] == ["a", "b", "c"]
+    assert calls == [([b"a", b"b", b"c"], "hw")]
+
+
+def test_requests_grouped_by_hotwords_and_capped_by_max_batch():
+    calls = []
+
+    def batch_fn(audios, hotwords):
+        calls.append((len(audios), hotwords))
+        return [hotwords] * len(audios)
+
+    batcher = AsrBatcher(batch_fn, max_batch=2, window_s=0.05)
+
+    async def main():
+        return await asyncio.gather(
+            batcher.submit(b"1", "x"),
+            batcher.submit(b"2", None),
+            batcher.submit(b"3", "x"),
+        )
+
+    assert asyncio.run(main()) == ["x", None, "x"]
+    assert calls == [(1, "x"), (1, None), (1, "x")]
+
+
+def test_batch_error_propagates_to_every_request():
+    def batch_fn(audios, hotwords):
+        return []  # 结果数量不匹配
+
+    batcher = AsrBatcher(batch_fn, window_s=0.01)
+
+    async def main():
+        return await asyncio.gather(
+            batcher.submit(b"a"), batcher.submit(b"b"), return_exceptions=True
+        )
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, RuntimeError) for r in results)
@@ -107,6 +107,90 @@ class TestTaskManager:
         assert manager.get_result(task_id) is None
         manager.stop()
 
+    def test_cleanup_expires_and_caps_results(self):
+        """测试清理只移除过期结果，并按提交顺序淘汰超出容量的结果"""
+        from datetime import datetime, timedelta
+        from src.core.task_manager import TaskItem, TaskManager, TaskStatus
+
+        manager = TaskManager(max_results=10, result_ttl=60)
+        manager.register_handler("test", lambda payload: payload)
+        done = manager.submit("test", {})
+        manager._process_task(TaskItem(done, "test", {}))
+        pending = manager.submit("test", {})
+
+        manager._cleanup_old_results()
+        assert manager._results[done].status == TaskStatus.COMPLETED
+
+        manager._expiry_heap[0] = (datetime.now() - timedelta(seconds=1), done)
+        manager._cleanup_old_results()
+        assert list(manager._results) == [pending]
+
+        capped = TaskManager(max_results=2)
+        task_ids = [capped.submit("test", {}) for _ in range(3)]
+        capped._cleanup_old_results()
+        assert list(capped._results) == task_ids[1:]
+
+    def test_tasks_run_concurrently(self):
+        """测试多个工作线程并发处理任务"""
+        import threading
+        from src.core.task_manager import TaskManager, TaskStatus
+
+        barrier = threading.Barrier(2, timeout=5)
+        manager = TaskManager(max_workers=2)
+        manager.register_handler("wait", lambda payload: {"ok": barrier.wait() >= 0})
+        manager.start()
+        try:
+            task_ids = [manager.submit("wait", {}) for _ in range(2)]
+            for _ in range(50):
+                if all(manager.get_status(t) == TaskStatus.COMPLETED for t in task_ids):
+                    break
+                time.sleep(0.1)
+            assert all(manager.get_result(t).result == {"ok": True} for t in task_ids)
+        finally:
+            manager.stop()
+
+    def test_cleanup_runs_on_interval_or_over_capacity(self, monkeypatch):
+        """测试清理按时间间隔触发，超出容量时立即触发"""
+        from src.core.task_manager import TaskManager
+
+        manager = TaskManager(max_results=2)
+        calls = []
+        monkeypatch.setattr(manager, "_cleanup_old_results", lambda: calls.append(1))
+
+        manager._maybe_cleanup()
+        manager._maybe_cleanup()
+        assert len(calls) == 1
+
+        for _ in range(3):
+            manager.submit("test", {})
+        manager._maybe_cleanup()
+        assert len(calls) == 2
+
+    def test_get_result_does_not_wait_for_worker_lock(self):
+        """测试查询结果不依赖工作线程持有的锁"""
+        from src.core.task_manager import TaskManager, TaskStatus
+
+        manager = TaskManager()
+        task_id = manager.submit("test", {})
+        with manager._lock:
+            assert manager.get_status(task_id) == TaskStatus.PENDING
+            assert manager.get_result(task_id).task_id == task_id
+
+    def test_stop_wakes_idle_workers(self):
+        """测试 stop() 通过哨兵立即唤醒空闲的工作线程"""
+        import time
+        from src.core.task_manager import TaskManager
+
+        manager = TaskManager(max_workers=2)
+        manager.start()
+        # stop() 会清空 _worker_threads，先保留线程引用再断言
+        workers = list(manager._worker_threads)
+        assert len(workers) == 2
+        started = time.monotonic()
+        manager.stop()
+        assert time.monotonic() - started < 1.0
+        assert not any(t.is_alive() for t in workers)
+
 
 class TestAsyncTranscribeHelpers:
     """异步转写辅助函数测试"""
@@ -0,0 +1,98 @@
+import math
+
+from scripts.benchmark_corrections import calculate_cer, calculate_wer
+
+
+def test_cer_zero_for_equal_text():
+    assert calculate_cer("你好世界", "你好世界") == 0.0
+
+
+def test_cer_ignores_spaces():
+    assert calculate_cer("你 好", "你好") == 0.0
+
+
+def test_cer_one_substitution():
+    assert math.isclose(calculate_cer("你好世届", "你好世界"), 1 / 4, abs_tol=1e-9)
+
+
+def test_cer_hypothesis_longer_than_reference():
+    # ref length=3, two insertions -> distance=2 => CER=2/3
+    assert math.isclose(calculate_cer("abxcy", "abc"), 2 / 3, abs_tol=1e-9)
+
+
+def test_cer_repeated_calls_reuse_buffers():
+    assert math.isclose(calculate_cer("a" * 50, "b" * 50), 1.0, abs_tol=1e-9)
+    assert math.isclose(calculate_cer("ab", "abc"), 1 / 3, abs_tol=1e-9)
+
+
+def test_wer_simple_deletion():
+    assert math.isclose(calculate_wer("hello", "hello world"), 0.5, abs_tol=1e-9)
+
+
+def test_empty_reference():
+    assert calculate_cer("", "") == 0.0
+    assert calculate_cer("abc", "") == 1.0
+    assert calculate_wer("", "") == 0.0
+
+
+def test_numba_fallback_matches_when_rapidfuzz_missing(monkeypatch):
+    from scripts import benchmark_corrections
+
+    monkeypatch.setattr(benchmark_corrections, "RAPIDFUZZ_AVAILABLE", False)
+    assert math.isclose(calculate_cer("你好世届", "你好世界"), 1 / 4, abs_tol=1e-9)
+    assert math.isclose(calculate_wer("hello", "hello world"), 0.5, abs_tol=1e-9)
+
+
+def test_benchmark_pipeline_serial_keeps_file_order(tmp_path, monkeypatch):
+    from scripts import benchmark_corrections
+
+    for name in ("b", "a", "c"):
+        (tmp_path / f"{name}.wav").write_bytes(b"")
+
+    from src.config import settings
+
+    built = []
+
+    class FakeEngine:
+        def __init__(self):
+            built.append(settings.correction_pipeline)
+
+        def transcribe(self, audio_path, **kwargs):
+            if audio_path.endswith("c.wav"):
+                raise RuntimeError("boom")
+            return {"text": "你好"}
+
+    monkeypatch.setattr(benchmark_corrections, "_build_engine", FakeEngine)
+    original_pipeline = settings.correction_pipeline
+
+    config = benchmark_corrections.PipelineConfig(name="t", correction_pipeline="post_process")
+    references = {"a": "你好", "b": "你们", "c": "你好"}
+    (tmp_path / "notes.txt").write_text("x")
+    (tmp_path / ".hidden.wav").write_bytes(b"")
+    audio_files = benchmark_corrections.list_audio_files(tmp_path)
+    assert [p.name for p in audio_files] == ["a.wav", "b.wav", "c.wav"]
+
+    result = benchmark_corrections.benchmark_pipeline(audio_files, references, config)
+
+    assert result.total_samples == 2
+    assert [d["file"] for d in result.details] == ["a", "b"]
+    assert math.isclose(result.avg_cer, 0.25, abs_tol=1e-9)
+    # One engine per pipeline, built under the pipeline settings, then restored.
+    assert built == ["post_process"]
+    assert settings.correction_pipeline == original_pipeline
+
+
+def test_load_reference_from_file_and_directory(tmp_path):
+    from scripts.benchmark_corrections import load_reference
+
+    ref_file = tmp_path / "refs.txt"
+    ref_file.write_text("a|你好\nno separator\nb|x|y\n", encoding="utf-8")
+    assert load_reference(ref_file) == {"a": "你好", "b": "x|y"}
+
+    ref_dir = tmp_path / "refs"
+    ref_dir.mkdir()
+    for i in range(40):
+        (ref_dir / f"{i}.txt").write_text(f" 文本{i}\n", encoding="utf-8")
+    refs = load_reference(ref_dir)
+    assert len(refs) == 40
+    assert refs["7"] == "文本7"
@@ -0,0 +1,52 @@
+import random
+
+import numpy as np
+
+from scripts.eval.metrics import edit_distance
+from src.utils.editdist import (
+    bounded_levenshtein,
+    encode_chars,
+    encode_tokens,
+    levenshtein_codes,
+)
+
+
+def test_levenshtein_codes_matches_reference_dp():
+    rng = random.Random(0)
+    for _ in range(200):
+        a = "".join(rng.choice("abc") for _ in range(rng.randint(0, 40)))
+        b = "".join(rng.choice("abc") for _ in range(rng.randint(0, 40)))
+        assert levenshtein_codes(encode_chars(a), encode_chars(b)) == edit_distance(a, b)
+
+
+def test_levenshtein_codes_long_near_identical_text():
+    ref = "今天天气很好我们去公园散步" * 40
+    hyp = ref[:100] + "汽" + ref[101:300] + ref[302:]
+    assert levenshtein_codes(encode_chars(ref), encode_chars(hyp)) == 3
+
+
+def test_bounded_levenshtein_caps_at_max_k():
+    a = encode_chars("a" * 30)
+    b = encode_chars("b" * 30)
+    assert bounded_levenshtein(a, b, 5) == 6
+    assert bounded_levenshtein(a, b, 30) == 30
+
+
+def test_encode_tokens_shares_vocabulary():
+    ref_ids, hyp_ids = encode_tokens(["hello", "world"], ["hello", "word"])
+    assert ref_ids[0] == hyp_ids[0]
+    assert ref_ids[1] != hyp_ids[1]
+    assert levenshtein_codes(ref_ids, hyp_ids) == 1
+
+
+def test_encode_chars_picks_narrowest_dtype():
+    assert encode_chars("hello").dtype == np.uint8
+    assert encode_chars("你好").dtype == np.uint16
+    assert encode_chars("你好😀").dtype == np.int32
+    assert encode_chars("你好😀").tolist() == [ord(c) for c in "你好😀"]
+
+
+def test_levenshtein_codes_mixed_dtypes():
+    pairs = [("abc", "abd"), ("abc", "a你c"), ("你好😀", "你好"), ("x😀", "abc")]
+    for a, b in pairs:
+        assert levenshtein_codes(encode_chars(a), encode_chars(b)) == edit_distance(a, b)
@@ -387,3 +387,40 @@ def test_transcribe_long_audio_post_process_runs_after_merge_itn_regression(mock
 
     assert out["raw_text"] == "一百零一"
     assert out["text"] == "101"
+
+
+def test_apply_corrections_batch_matches_per_text(mock_model_manager):
+    from src.core.engine import TranscriptionEngine
+
+    engine = TranscriptionEngine()
+    engine.update_hotwords(["麦当劳"])
+
+    texts = ["买当劳很好吃", "", "今天天气不错"]
+    batched, _ = engine._apply_corrections_batch(texts)
+    single = [engine._apply_corrections(t)[0] for t in texts]
+
+    assert batched == single
+    assert "麦当劳" in batched[0]
+
+    sentences = [{"text": t} for t in texts]
+    engine._correct_sentences(sentences)
+    assert [s["text"] for s in sentences] == batched
+
+
+def test_run_coroutine_sync_reuses_background_loop(mock_model_manager):
+    from src.core.engine import TranscriptionEngine
+
+    engine = TranscriptionEngine()
+
+    async def current_loop():
+        return asyncio.get_running_loop()
+
+    first = engine._run_coroutine_sync(current_loop())
+    second = engine._run_coroutine_sync(current_loop())
+    assert first is second
+
+    # Also usable from code that already runs inside an event loop.
+    async def nested():
+        return engine._run_coroutine_sync(current_loop())
+
+    assert asyncio.run(nested()) is first
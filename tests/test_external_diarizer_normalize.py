@@ -43,3 +43,55 @@ def test_normalize_segments_overflow_values_do_not_raise_and_are_dropped():
     raw = [{"spk": 0, "start": math.inf, "end": 20}]
     segs = normalize_segments(raw, duration_ms=None)
     assert segs == []
+
+
+def test_normalize_segments_array_path_matches_row_path(monkeypatch):
+    import random
+
+    from src.core.speaker import external_diarizer_normalize as mod
+
+    rng = random.Random(0)
+    raw = [
+        {"spk": rng.randint(0, 3), "start": rng.randint(-50, 5000), "end": rng.randint(-50, 5000)}
+        for _ in range(600)
+    ]
+
+    fast = normalize_segments(raw, duration_ms=4000)
+    monkeypatch.setattr(mod, "_VECTORIZE_MIN_SEGMENTS", 10**9)
+    slow = normalize_segments(raw, duration_ms=4000)
+    assert fast == slow
+    assert all(type(v) is int for seg in fast for v in seg.values())
+
+    # Values beyond int64 fall back to the per-row path instead of raising.
+    monkeypatch.setattr(mod, "_VECTORIZE_MIN_SEGMENTS", 1)
+    assert normalize_segments([{"spk": 0, "start": 0, "end": 2**70}], duration_ms=None) == [
+        {"spk": 0, "start": 0, "end": 2**70}
+    ]
+
+
+def test_normalize_segments_sorted_input_keeps_order_both_paths(monkeypatch):
+    from src.core.speaker import external_diarizer_normalize as mod
+
+    raw = [{"spk": i % 2, "start": i * 10, "end": i * 10 + 5} for i in range(300)]
+    raw[5], raw[6] = raw[6], raw[5]
+    expected = sorted(raw, key=lambda s: (s["start"], s["end"], s["spk"]))
+
+    assert normalize_segments(raw, duration_ms=None) == expected
+    monkeypatch.setattr(mod, "_VECTORIZE_MIN_SEGMENTS", 10**9)
+    assert normalize_segments(raw, duration_ms=None) == expected
+    assert normalize_segments(expected, duration_ms=None) == expected
+
+
+def test_normalize_segments_coerces_mixed_field_types():
+    from decimal import Decimal
+
+    raw = [
+        {"spk": "1", "start": 1.9, "end": Decimal("30")},
+        {"spk": 0, "start": math.nan, "end": 5},
+        {"spk": 0, "start": "x", "end": 5},
+        {"spk": True, "start": 0, "end": 3},
+    ]
+    assert normalize_segments(raw, duration_ms=None) == [
+        {"spk": 1, "start": 0, "end": 3},
+        {"spk": 1, "start": 1, "end": 30},
+    ]
@@ -0,0 +1,16 @@
+from scripts.hotwords.extract_context_hotwords import main
+
+
+def test_append_only_appends_new_phrases_and_falls_back(tmp_path):
+    src = tmp_path / "notes.txt"
+    out = tmp_path / "hotwords.txt"
+    out.write_text("# header\n\n张三\n", encoding="utf-8")
+
+    src.write_text("张三，李四\n", encoding="utf-8")
+    assert main([str(src), "-o", str(out), "--append-only"]) == 0
+    assert out.read_text(encoding="utf-8") == "# header\n\n张三\n李四\n"
+
+    # 已有词条被移除时回退到完整重写 (保留头部，重新排序)
+    src.write_text("王五\n", encoding="utf-8")
+    assert main([str(src), "-o", str(out), "--append-only"]) == 0
+    assert out.read_text(encoding="utf-8") == "# header\n\n王五\n"
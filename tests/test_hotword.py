@@ -50,3 +50,32 @@ def test_empty_input(corrector):
     """测试空输入"""
     result = corrector.correct("")
     assert result.text == ""
+
+def test_fast_rag_index_stores_ids_once():
+    """FastRAG 倒排索引只存热词 id，编码每个热词一份"""
+    import numpy as np
+    from src.core.hotword.phoneme import get_phoneme_info
+    from src.core.hotword.rag import FastRAG
+
+    rag = FastRAG(threshold=0.5)
+    rag.add_hotwords({hw: get_phoneme_info(hw) for hw in ("麦当劳", "肯德基")})
+    assert rag.hw_names == ["麦当劳", "肯德基"] and len(rag.hw_codes) == 2
+    assert all(ids.dtype == np.int32 for ids in rag.index.values())
+
+    results = rag.search(get_phoneme_info("我想去买当劳"))
+    assert [hw for hw, _ in results] == ["麦当劳"]
+
+
+def test_result_cache_is_lru_and_respects_top_k():
+    """结果缓存按 LRU 淘汰，命中时仍按 top_k 截断相似列表"""
+    c = PhonemeCorrector(threshold=0.8, similar_threshold=0.5, cache_size=2)
+    c.update_hotwords("麦当劳\n肯德基")
+
+    full = c.correct("我想去吃买当劳")
+    assert c.correct("我想去吃买当劳", top_k=0).similars == []
+    assert c.correct("我想去吃买当劳") == full
+
+    c.correct("肯得鸡")
+    c.correct("我想去吃买当劳")  # 刷新为最近使用
+    c.correct("今天天气不错")
+    assert [text for text, _ in c._cache] == ["我想去吃买当劳", "今天天气不错"]
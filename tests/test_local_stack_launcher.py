@@ -29,6 +29,26 @@ def test_is_port_open_true_for_bound_socket():
         server.close()
 
 
+def test_probe_ports_checks_several_ports_at_once():
+    from scripts import local_stack
+
+    listening = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listening.bind(("127.0.0.1", 0))
+    listening.listen(1)
+
+    closed = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    closed.bind(("127.0.0.1", 0))
+    closed_addr = closed.getsockname()
+    closed.close()
+
+    try:
+        open_addr = listening.getsockname()
+        result = local_stack.probe_ports([open_addr, closed_addr, open_addr])
+        assert result == {open_addr: True, closed_addr: False}
+    finally:
+        listening.close()
+
+
 def test_ensure_run_dir_creates_local_stack_dir(tmp_path: Path):
     from scripts import local_stack
 
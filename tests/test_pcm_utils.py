@@ -56,3 +56,49 @@ def test_wav_bytes_detection_and_decode():
     assert audio[1] > 0
     assert audio[2] < 0
 
+
+
+def test_kernel_path_matches_numpy_path(monkeypatch):
+    from src.core.audio import pcm
+
+    rng = np.random.default_rng(0)
+    audio = (rng.standard_normal(4096) * 0.8).astype(np.float32)
+    audio[:4] = [1.0, -1.0, 2.0, -3.0]
+
+    expected_bytes = pcm.float32_to_pcm16le_bytes(audio)
+    expected_audio = pcm.pcm16le_bytes_to_float32(expected_bytes)
+
+    monkeypatch.setattr(pcm, "_KERNEL_MIN_SAMPLES", 1)
+    assert pcm.float32_to_pcm16le_bytes(audio) == expected_bytes
+    assert np.array_equal(pcm.pcm16le_bytes_to_float32(expected_bytes), expected_audio)
+
+
+def test_wav_decode_skips_extra_chunks_and_rejects_non_mono():
+    import struct
+
+    _, _, _, wav_bytes_to_float32 = _pcm()
+
+    frames = np.array([0, 1000, -1000], dtype=np.int16).tobytes()
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(16000)
+        wf.writeframes(frames)
+    wav = buf.getvalue()
+
+    # Odd-sized LIST chunk before data (padded to an even boundary).
+    i = wav.index(b"data")
+    wav_with_list = wav[:i] + b"LIST" + struct.pack("<I", 3) + b"abc\x00" + wav[i:]
+    audio, sr = wav_bytes_to_float32(wav_with_list)
+    assert sr == 16000
+    assert np.array_equal(audio, np.frombuffer(frames, dtype=np.int16) / np.float32(32768.0))
+
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wf:
+        wf.setnchannels(2)
+        wf.setsampwidth(2)
+        wf.setframerate(16000)
+        wf.writeframes(frames + frames[:2])
+    with pytest.raises(ValueError):
+        wav_bytes_to_float32(buf.getvalue())
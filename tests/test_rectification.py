@@ -31,6 +31,12 @@ class TestWordBoundaries:
         bounds = _get_word_boundaries("我 love 你")
         assert len(bounds) == 3
 
+    def test_camel_case_boundaries(self):
+        """Test camelCase splitting and underscore separators"""
+        bounds = _get_word_boundaries("iPhone15Pro_max 中")
+        assert [b[2] for b in bounds] == ["i", "Phone15Pro", "max", "中"]
+        assert bounds[1][:2] == (1, 11)
+
 
 class TestExtractDiffFragments:
     def test_single_char_diff(self):
@@ -99,6 +105,25 @@ Claude Code 很好用
         # Should find the Claude Code correction
         assert len(results) > 0
 
+    def test_repeated_search_reuses_encoded_input(self, temp_rectify_file, monkeypatch):
+        """Repeated queries for the same text skip phoneme extraction"""
+        from src.core.hotword import rectification
+
+        rag = RectificationRAG(str(temp_rectify_file), threshold=0.4)
+        rag.load_history()
+        first = rag.search("Cloud Code 真不错")
+
+        calls = []
+        original = rectification.get_phoneme_info
+        monkeypatch.setattr(
+            rectification, "get_phoneme_info",
+            lambda *a, **k: calls.append(a) or original(*a, **k),
+        )
+        assert rag.search("Cloud Code 真不错") == first
+        assert calls == []
+        rag.search("另一句话")
+        assert len(calls) == 1
+
     def test_search_no_match(self, temp_rectify_file):
         """Test searching with no match"""
         rag = RectificationRAG(str(temp_rectify_file), threshold=0.9)
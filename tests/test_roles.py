@@ -62,6 +62,43 @@ class TestRoleSystem:
         assert "translator" in roles
         assert "code" in roles
 
+    def test_role_requires_system_prompt(self):
+        """测试未定义系统提示词的角色在定义时即报错"""
+        from src.core.llm.roles import Role
+
+        with pytest.raises(TypeError):
+            class NoPromptRole(Role):
+                name = "_test_no_prompt"
+
+    def test_concurrent_get_creates_single_instance(self):
+        """测试并发首次获取角色只实例化一次"""
+        import threading
+        from src.core.llm.roles import Role, RoleRegistry
+
+        created = []
+
+        class SlowRole(Role):
+            name = "_test_slow"
+            system_prompt = ""
+
+            def __init__(self):
+                created.append(self)
+                threading.Event().wait(0.05)
+
+        RoleRegistry.register(SlowRole)
+        try:
+            got = []
+            threads = [threading.Thread(target=lambda: got.append(RoleRegistry.get("_test_slow"))) for _ in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            assert len(created) == 1
+            assert all(role is created[0] for role in got)
+        finally:
+            RoleRegistry._roles.pop("_test_slow", None)
+            RoleRegistry._instances.pop("_test_slow", None)
+
     def test_role_format_user_input(self):
         """测试角色格式化用户输入"""
         from src.core.llm.roles import get_role
@@ -77,6 +77,14 @@ class TestRuleCorrector:
         assert replacements[0][0] == "毫安时"
         assert replacements[0][1] == "mAh"
 
+    def test_substitute_with_info_expands_groups(self):
+        """Replacement info expands backreferences from each match"""
+        c = RuleCorrector()
+        c.update_rules(r"(\d+)\s*度 = \1°")
+        text, replacements = c.substitute_with_info("从10 度升到25度")
+        assert text == "从10°升到25°"
+        assert replacements == [("10 度", "10°", r"(\d+)\s*度"), ("25度", "25°", r"(\d+)\s*度")]
+
     def test_load_rules_file(self):
         """Test loading rules from file"""
         with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False, encoding='utf-8') as f:
@@ -95,6 +103,24 @@ class TestRuleCorrector:
         finally:
             temp_path.unlink()
 
+    def test_load_rules_file_shares_compiled_rules(self, tmp_path):
+        """Unchanged files reuse the compiled rule set; edits are picked up"""
+        import os
+
+        rules_file = tmp_path / "rules.txt"
+        rules_file.write_text("伏特 = V\n", encoding="utf-8")
+
+        a, b = RuleCorrector(), RuleCorrector()
+        assert a.load_rules_file(str(rules_file)) == 1
+        assert b.load_rules_file(str(rules_file)) == 1
+        assert a._rules is b._rules
+
+        rules_file.write_text("伏特 = V\n赫兹 = Hz\n", encoding="utf-8")
+        st = rules_file.stat()
+        os.utime(rules_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        assert b.load_rules_file(str(rules_file)) == 2
+        assert b.substitute("50赫兹") == "50Hz"
+
     def test_load_nonexistent_file(self):
         """Test loading from nonexistent file"""
         c = RuleCorrector()
@@ -108,3 +134,78 @@ class TestRuleCorrector:
         # Should not raise, just skip the invalid pattern
         result = c.substitute("some text")
         assert result == "some text"
+
+    def test_rules_keep_file_order_and_duplicates(self):
+        """Rules apply in file order; a repeated pattern is not collapsed"""
+        c = RuleCorrector()
+        count = c.update_rules("a = b\nb = c\na = d")
+        assert count == 3
+        assert c.substitute("a") == "c"
+
+    def test_literal_rules_fused_into_one_pass(self, corrector):
+        """Independent literal rules are applied by a single fused pattern"""
+        assert len(corrector._steps) == 1
+        text, replacements = corrector.substitute_with_info("12伏特，50赫兹")
+        assert text == "12V，50Hz"
+        assert [r[2] for r in replacements] == ["伏特", "赫兹"]
+
+    def test_hyperscan_literals_match_regex_path(self, monkeypatch):
+        """The hyperscan fast path gives the same output as the fused regex"""
+        from src.core.hotword import rule_corrector
+
+        if not rule_corrector.HYPERSCAN_AVAILABLE:
+            pytest.skip("hyperscan not installed")
+        rules = "毫安时 = mAh\n伏特 = V\naa = b"
+        text = "5000毫安时，12伏特，aaa"
+
+        fast = RuleCorrector()
+        fast.update_rules(rules)
+        assert isinstance(fast._steps[0][0], rule_corrector._HyperscanLiterals)
+
+        monkeypatch.setattr(rule_corrector, "HYPERSCAN_AVAILABLE", False)
+        slow = RuleCorrector()
+        slow.update_rules(rules)
+        assert fast.substitute_with_info(text) == slow.substitute_with_info(text)
+
+    def test_chained_literal_rules_not_fused(self):
+        """Rules whose output feeds a later rule keep sequential semantics"""
+        c = RuleCorrector()
+        c.update_rules("毫安 = mA\n毫安时 = mAh\nmA = 毫安")
+        assert len(c._steps) == 3
+        assert c.substitute("5000毫安时") == "5000毫安时"
+
+    def test_disjoint_regex_rules_fused_into_one_pass(self):
+        """Regex rules over disjoint characters share one alternation pass"""
+        c = RuleCorrector()
+        c.update_rules("(公斤|千克) = kg\n[一二三]号线 = 地铁线\n\\w+ = x")
+        assert len(c._steps) == 2
+        text, replacements = c.substitute_with_info("坐二号线买三千克")
+        assert text == "x"
+        assert [r[2] for r in replacements] == ["[一二三]号线", "(公斤|千克)", "\\w+"]
+
+        chained = RuleCorrector()
+        chained.update_rules("[ab]+ = c\nc+ = d")
+        assert len(chained._steps) == 2
+        assert chained.substitute("abc") == "d"
+
+    def test_trigger_chars_skip_unmatchable_text(self, monkeypatch):
+        """Text sharing no trigger char with the rules skips every rule pass"""
+        c = RuleCorrector()
+        c.update_rules("毫安时 = mAh\n[一二三]号线 = 地铁线")
+        assert c._triggers == frozenset("毫一二三号线")
+        monkeypatch.setattr(c, "_steps", ((None, None, None),))
+        assert c.substitute("今天天气很好") == "今天天气很好"
+        assert c.substitute_with_info("今天天气很好") == ("今天天气很好", [])
+
+        unbounded = RuleCorrector()
+        unbounded.update_rules("伏特 = V\n\\d+V = xV")
+        assert unbounded._triggers is None
+        assert unbounded.substitute("12伏特") == "xV"
+
+    def test_invalid_regex_filtered_at_load(self):
+        """Invalid patterns are dropped when rules are loaded"""
+        c = RuleCorrector()
+        count = c.update_rules("[invalid = x\n伏特 = V")
+        assert count == 1
+        assert list(c.patterns) == ["伏特"]
+        assert c.substitute("12伏特") == "12V"
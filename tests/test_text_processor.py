@@ -98,6 +98,36 @@ class TestChineseITN:
 
         assert itn.convert("十六十七千米每小时") == "16 17km/h"
 
+    def test_convert_cached_per_config(self):
+        """测试短句结果按 (文本, 儿化配置) 缓存"""
+        from src.core.text_processor import ChineseITN
+        from src.core.text_processor.chinese_itn import _convert_cached
+
+        hits = _convert_cached.cache_info().hits
+        assert ChineseITN().convert("那边儿有三百五十人") == "那边儿有350人"
+        assert ChineseITN().convert("那边儿有三百五十人") == "那边儿有350人"
+        assert _convert_cached.cache_info().hits == hits + 1
+        assert ChineseITN(erhua_remove=True).convert("那边儿有三百五十人") == "那边有350人"
+
+    def test_digitless_candidates_unchanged(self):
+        """测试只有数位/单位字、没有数字字的片段原样保留"""
+        from src.core.text_processor import ChineseITN
+
+        itn = ChineseITN()
+        assert itn.convert("千比百") == "千比百"
+        assert itn.convert("万万没想到") == "万万没想到"
+        assert itn.convert("三比二") == "3:2"
+
+    def test_remove_erhua(self):
+        """测试儿化移除与白名单保护"""
+        from src.core.text_processor import remove_erhua
+
+        assert remove_erhua("那边儿有一点儿") == "那边有一点"
+        assert remove_erhua("女儿和儿童") == "女儿和儿童"
+        # "那儿童" 中的 "儿" 属于白名单词 "儿童"，不按儿化处理
+        assert remove_erhua("去那儿童装店") == "去那儿童装店"
+        assert remove_erhua("这儿那儿") == "这那"
+
     def test_idiom_blacklist(self):
         """测试成语黑名单（不转换）"""
         from src.core.text_processor import ChineseITN
@@ -106,6 +136,8 @@ class TestChineseITN:
         # 成语不应被转换
         assert "七" in itn.convert("乱七八糟")
         assert "八" in itn.convert("乱七八糟")
+        # 重复出现的成语同样不转换
+        assert itn.convert("乱七八糟，乱七八糟") == "乱七八糟，乱七八糟"
 
     def test_mixed_text(self):
         """测试混合文本"""
@@ -227,6 +259,24 @@ class TestPunctuationConverter:
         assert "," in convert_full_to_half("你好，世界")
         assert "，" in convert_half_to_full("Hello, World")
 
+    def test_normalize_fullwidth_long_text(self):
+        """测试长文本走向量化路径时与短文本结果一致"""
+        from src.core.text_processor.punctuation import FullwidthNormalizer, _NUMPY_MIN_LEN
+
+        short = "ＡＰＩ　１２３，ｏｋ！"
+        long_text = short * (_NUMPY_MIN_LEN // len(short) + 1)
+        for kwargs in ({}, {"include_letters": False}, {"include_digits": False, "include_space": False}):
+            normalizer = FullwidthNormalizer(**kwargs)
+            assert normalizer.normalize(long_text) == normalizer.normalize(short) * (_NUMPY_MIN_LEN // len(short) + 1)
+        assert FullwidthNormalizer().normalize(short) == "API 123,ok!"
+
+    def test_normalize_fullwidth_long_text_lone_surrogate(self):
+        """测试长文本含孤立代理码点时不报错，与短文本路径一致"""
+        from src.core.text_processor.punctuation import normalize_fullwidth, _NUMPY_MIN_LEN
+
+        text = "ａ\ud800" + "x" * (_NUMPY_MIN_LEN + 1000)
+        assert normalize_fullwidth(text) == "a\ud800" + "x" * (_NUMPY_MIN_LEN + 1000)
+
 
 class TestTextPostProcessor:
     """统一后处理器测试"""
@@ -326,6 +376,46 @@ class TestTextPostProcessor:
         assert processor.itn is not None  # ITN 默认启用
 
 
+class TestStreamTextMerger:
+    """流式文本去重测试"""
+
+    def test_merge_exact_overlap(self):
+        """测试精确重叠"""
+        from src.core.text_processor import StreamTextMerger
+        merger = StreamTextMerger(overlap_chars=5, error_tolerance=1)
+
+        assert merger.merge("今天天气") == "今天天气"
+        assert merger.merge("天气很好") == "很好"
+        assert merger.merge("很好明天见") == "明天见"
+        assert merger.get_full_text() == "今天天气很好明天见"
+
+    def test_merge_fuzzy_and_no_overlap(self):
+        """测试模糊重叠与无重叠"""
+        from src.core.text_processor import StreamTextMerger
+        merger = StreamTextMerger(overlap_chars=5, error_tolerance=1)
+
+        merger.merge("人工智能")
+        assert merger.merge("智慧很厉害") == "很厉害"
+
+        merger.reset()
+        merger.merge("你好")
+        assert merger.merge("世界") == "世界"
+        assert merger.get_full_text() == "你好世界"
+
+    def test_long_stream_only_checks_tail(self):
+        """测试长会话: 重叠只与末尾比较"""
+        from src.core.text_processor import StreamTextMerger
+        merger = StreamTextMerger(overlap_chars=5, error_tolerance=0)
+
+        expected = ""
+        for i in range(200):
+            chunk = f"第{i}句。"
+            merger.merge(chunk)
+            expected += chunk
+        assert merger.get_full_text() == expected
+        assert merger.merge_final(expected + "完") == expected + "完"
+
+
 class TestIntegration:
     """集成测试"""
 